@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Automatic Repair of Rejected University Payloads
+Turns express-validator 400 responses into field errors and applies the
+repair rules registered for those fields, so uploaders can fix rejected
+records and send them again in the same run instead of someone reading
+the logs and writing another fixer script. Rules reuse the fixers from
+final_fix.py and fix_images.py; records that still fail are reported.
+"""
+
+import json
+import logging
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from university_validation import ARRAY_FIELDS, BOOLEAN_FIELDS, NUMERIC_FIELDS, STRING_FIELDS, validate_university
+
+logger = logging.getLogger(__name__)
+
+# (record, error) -> True when the record was changed
+RepairRule = Callable[[Dict, Dict], bool]
+
+# field -> rules tried in order until one changes the record
+REPAIR_RULES: Dict[str, List[RepairRule]] = {}
+
+NUMBER_IN_TEXT = re.compile(r'[-+]?\d[\d,]*(?:\.\d+)?|[-+]?\.\d+')
+TRUE_WORDS = {'true', 'yes', 'y', '1', 'required', 'available'}
+FALSE_WORDS = {'false', 'no', 'n', '0', '', 'none', 'not required', 'not available', 'n/a'}
+
+def repair_rule(*fields: str):
+    """Register a repair rule for one or more payload fields"""
+    def register(func: RepairRule) -> RepairRule:
+        for field in fields:
+            REPAIR_RULES.setdefault(field, []).append(func)
+        return func
+    return register
+
+def parse_validation_errors(body) -> List[Dict]:
+    """Field errors ({'field', 'msg', 'value'}) of a 400 response body; [] if it has none"""
+    if isinstance(body, (str, bytes)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return []
+    if not isinstance(body, dict) or not isinstance(body.get('errors'), list):
+        return []
+    errors = []
+    for error in body['errors']:
+        if not isinstance(error, dict):
+            continue
+        # express-validator 7 names the field "path", older versions "param"
+        field = error.get('path') or error.get('param')
+        if field:
+            errors.append({'field': field, 'msg': error.get('msg', 'Invalid value'), 'value': error.get('value')})
+    return errors
+
+def _number_from_text(value) -> Optional[float]:
+    match = NUMBER_IN_TEXT.search(str(value)) if value is not None else None
+    if not match:
+        return None
+    number = float(match.group().replace(',', ''))
+    return int(number) if number.is_integer() else number
+
+def _drop(record: Dict, field: str) -> bool:
+    """Optional fields are only validated when present, so a value that cannot be saved is left out"""
+    if field not in record:
+        return False
+    del record[field]
+    return True
+
+@repair_rule('website')
+def repair_website(record: Dict, error: Dict) -> bool:
+    from final_fix import generate_website_url
+
+    record['website'] = generate_website_url(record.get('name') or 'university')
+    return True
+
+@repair_rule('image')
+def repair_image(record: Dict, error: Dict) -> bool:
+    from fix_images import generate_image_url
+
+    record['image'] = generate_image_url()
+    return True
+
+@repair_rule('min_gpa_required')
+def repair_gpa(record: Dict, error: Dict) -> bool:
+    from final_fix import fix_gpa_value
+
+    record['min_gpa_required'] = min(max(fix_gpa_value(record.get('min_gpa_required')), 0.0), 4.0)
+    return True
+
+@repair_rule('acceptance_rate')
+def repair_acceptance_rate(record: Dict, error: Dict) -> bool:
+    rate = _number_from_text(record.get('acceptance_rate'))
+    if rate is None:
+        return _drop(record, 'acceptance_rate')
+    record['acceptance_rate'] = min(max(rate, 0), 100)
+    return True
+
+@repair_rule('description')
+def repair_description(record: Dict, error: Dict) -> bool:
+    # The converter's default description
+    if not record.get('name'):
+        return False
+    record['description'] = f"{record['name']} is a prestigious institution of higher education."
+    return True
+
+@repair_rule('name')
+def repair_name(record: Dict, error: Dict) -> bool:
+    name = ' '.join(str(record.get('name') or '').split())[:200].rstrip()
+    if len(name) < 2 or name == record.get('name'):
+        return False
+    record['name'] = name
+    return True
+
+@repair_rule('country')
+def repair_country(record: Dict, error: Dict) -> bool:
+    from gazetteer import infer_location
+
+    location = infer_location(record.get('name') or '')
+    if location is None:
+        return False
+    record['country'] = location.country
+    if not record.get('city') and location.city:
+        record['city'] = location.city
+    return True
+
+@repair_rule('city')
+def repair_city(record: Dict, error: Dict) -> bool:
+    city = record.get('city')
+    record['city'] = str(city) if city is not None else "Main Campus"
+    return True
+
+@repair_rule(*(field for field, _ in NUMERIC_FIELDS))
+def repair_number(record: Dict, error: Dict) -> bool:
+    number = _number_from_text(record.get(error['field']))
+    if number is None:
+        return _drop(record, error['field'])
+    record[error['field']] = number
+    return True
+
+@repair_rule(*(field for field, _ in STRING_FIELDS))
+def repair_string(record: Dict, error: Dict) -> bool:
+    value = record.get(error['field'])
+    if value is None:
+        return _drop(record, error['field'])
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    record[error['field']] = str(value)
+    return True
+
+@repair_rule(*(field for field, _ in BOOLEAN_FIELDS))
+def repair_boolean(record: Dict, error: Dict) -> bool:
+    word = str(record.get(error['field'])).strip().lower()
+    if word in TRUE_WORDS:
+        record[error['field']] = True
+    elif word in FALSE_WORDS or record.get(error['field']) is None:
+        record[error['field']] = False
+    else:
+        return _drop(record, error['field'])
+    return True
+
+@repair_rule(*(field for field, _ in ARRAY_FIELDS))
+def repair_array(record: Dict, error: Dict) -> bool:
+    value = record.get(error['field'])
+    if value is None:
+        record[error['field']] = []
+    elif isinstance(value, str):
+        record[error['field']] = [item.strip() for item in value.split(',') if item.strip()]
+    else:
+        record[error['field']] = [value]
+    return True
+
+def repair_record(record: Dict, errors: List[Dict],
+                  validate: Callable[[Dict], List[Dict]] = validate_university) -> Tuple[List[str], List[Dict]]:
+    """Apply the rules for each rejected field in place.
+
+    Returns the repaired fields and the errors left afterwards: fields no
+    rule could fix plus whatever the local validator still rejects.
+    """
+    repaired = []
+    unrepaired = []
+    for field in dict.fromkeys(error['field'] for error in errors):
+        error = next(e for e in errors if e['field'] == field)
+        if any(rule(record, error) for rule in REPAIR_RULES.get(field, [])):
+            repaired.append(field)
+        else:
+            unrepaired.append(error)
+    remaining = {(e['field'], e['msg']) for e in unrepaired}
+    for error in parse_validation_errors({'errors': validate(record)}):
+        if (error['field'], error['msg']) not in remaining:
+            unrepaired.append(error)
+    return repaired, unrepaired
+
+def repair_batch(rejected: List[Tuple[Dict, List[Dict]]],
+                 validate: Callable[[Dict], List[Dict]] = validate_university) -> Tuple[List[Dict], List[Dict]]:
+    """Repair (record, errors) pairs; returns the records to send again and report entries for the rest"""
+    requeue = []
+    unrepairable = []
+    for record, errors in rejected:
+        repaired, unrepaired = repair_record(record, errors, validate)
+        if repaired and not unrepaired:
+            logger.info(f"🔧 Repaired {record.get('name') or record.get('title')}: {', '.join(repaired)}")
+            requeue.append(record)
+        else:
+            unrepairable.append({'name': record.get('name') or record.get('title'), 'repaired': repaired,
+                                 'errors': unrepaired or errors})
+    return requeue, unrepairable
+
+def write_report(path: str, unrepairable: List[Dict]):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(unrepairable, f, indent=2, ensure_ascii=False)
+    logger.info(f"📝 {len(unrepairable)} unrepairable records written to {path}")
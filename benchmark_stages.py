@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Offline Stage Benchmark
+Times the CPU-bound conversion and fixing stages (build_university_record
+from convert_excel_to_json, clean_text, fix_gpa_value, is_valid_url,
+generate_website_url and the JSON write/read steps) over seeded synthetic
+datasets of 1k, 100k and 1M records, with a separate tracemalloc pass for
+peak memory. Results are stored per commit in
+benchmark_results/offline_stages.jsonl; the exit status is 1 when a stage
+got slower or hungrier than the last other commit by more than --threshold.
+
+Datasets are generated and processed in chunks of generate_synthetic's
+BATCH_SIZE records, so a 1M run never holds more than one chunk. Peak
+memory is the largest of any chunk, and the JSON stages write and read one
+chunk file at a time rather than one whole-dataset file; stored results
+record the chunk size and, for the JSON stages, the number of chunk files.
+
+    ./benchmark_stages.py
+    ./benchmark_stages.py --sizes 1k,100k --stages clean_text,is_valid_url --threshold 10
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import benchmark_store
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SUITE = "offline_stages"
+
+class StageContext:
+    """What stages share within a run: the converter and a scratch directory for the JSON files"""
+
+    def __init__(self, scratch_dir: str):
+        self.scratch_dir = scratch_dir
+        self.chunk_file = os.path.join(scratch_dir, 'chunk.json')
+        # The current chunk as workbook cells: lists become the comma-separated text of the sheet
+        self.workbook_columns: List[Dict] = []
+        self._uploader = None
+
+    @property
+    def uploader(self):
+        if self._uploader is None:
+            from university_uploader_fixed import UniversityUploaderFixed
+
+            self._uploader = UniversityUploaderFixed()
+        return self._uploader
+
+# name -> function(records, context); each call processes one chunk
+STAGES: Dict[str, Callable[[List[Dict], StageContext], object]] = {}
+
+# Stages that handle one chunk file per call instead of one whole-dataset file
+CHUNKED_FILE_STAGES = {'json_write', 'json_read'}
+
+def stage(name: str):
+    """Register a stage so it is picked up by the benchmark"""
+    def register(func: Callable[[List[Dict], StageContext], object]):
+        STAGES[name] = func
+        return func
+    return register
+
+@stage('convert')
+def run_convert(records: List[Dict], context: StageContext):
+    # The per-column work of convert_excel_to_json
+    build = context.uploader.build_university_record
+    return [build(column, col_idx) for col_idx, column in enumerate(context.workbook_columns, 1)]
+
+@stage('clean_text')
+def run_clean_text(records: List[Dict], context: StageContext):
+    clean_text = context.uploader.clean_text
+    return [clean_text(record[field]) for record in records
+            for field in ('name', 'description', 'city', 'address')]
+
+@stage('fix_gpa_value')
+def run_fix_gpa_value(records: List[Dict], context: StageContext):
+    from final_fix import fix_gpa_value
+
+    return [fix_gpa_value(record['min_gpa_required']) for record in records]
+
+@stage('is_valid_url')
+def run_is_valid_url(records: List[Dict], context: StageContext):
+    from final_fix import is_valid_url
+
+    return [is_valid_url(record[field]) for record in records for field in ('website', 'image', 'logo')]
+
+@stage('generate_website_url')
+def run_generate_website_url(records: List[Dict], context: StageContext):
+    from final_fix import generate_website_url
+
+    return [generate_website_url(record['name']) for record in records]
+
+@stage('json_write')
+def run_json_write(records: List[Dict], context: StageContext):
+    # Same settings as convert_excel_to_json
+    with open(context.chunk_file, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+
+@stage('json_read')
+def run_json_read(records: List[Dict], context: StageContext):
+    # run_size writes the chunk file before timing
+    with open(context.chunk_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def parse_size(text: str) -> int:
+    """1000, 1k or 1M"""
+    text = text.strip().lower()
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+def size_label(size: int) -> str:
+    if size % 1_000_000 == 0:
+        return f"{size // 1_000_000}M"
+    if size % 1_000 == 0:
+        return f"{size // 1_000}k"
+    return str(size)
+
+def time_stage(func: Callable, records: List[Dict], context: StageContext, repeat: int) -> float:
+    """Best of repeat runs over one chunk, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(records, context)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory_mb(func: Callable, records: List[Dict], context: StageContext) -> float:
+    """Peak memory allocated by the stage itself; the chunk is allocated before tracing starts"""
+    tracemalloc.start()
+    try:
+        func(records, context)
+        return tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+def run_size(size: int, stages: List[str], context: StageContext, seed: int, repeat: int) -> List[Dict]:
+    """Time every stage over size records and measure its peak memory on every chunk"""
+    from generate_synthetic import BATCH_SIZE, SyntheticGenerator
+
+    generator = SyntheticGenerator(seed=seed)
+    seconds = {name: 0.0 for name in stages}
+    peak_mb = {name: 0.0 for name in stages}
+    generate_seconds = 0.0
+    chunks = 0
+
+    batches = generator.batches(size)
+    while True:
+        start = time.perf_counter()
+        batch = next(batches, None)
+        if batch is None:
+            break
+        records = [json.loads(text) for text in batch]
+        generate_seconds += time.perf_counter() - start
+        chunks += 1
+        # build_university_record draws random defaults
+        random.seed(seed)
+        # Inputs some stages expect, prepared outside the timed runs
+        if 'convert' in stages:
+            context.workbook_columns = [
+                {field: ', '.join(value) if isinstance(value, list) else value for field, value in record.items()}
+                for record in records
+            ]
+        if 'json_read' in stages:
+            run_json_write(records, context)
+        for name in stages:
+            seconds[name] += time_stage(STAGES[name], records, context, repeat)
+        for name in stages:
+            peak_mb[name] = max(peak_mb[name], peak_memory_mb(STAGES[name], records, context))
+        del records, batch
+
+    logger.info(f"🧪 Generated {size_label(size)} records in {generate_seconds:.1f}s")
+    results = []
+    for name in stages:
+        result = {
+            'stage': name,
+            'records': size,
+            'seed': seed,
+            'seconds': round(seconds[name], 4),
+            'records_per_second': round(size / seconds[name], 1) if seconds[name] > 0 else 0.0,
+            'peak_mb': round(peak_mb[name], 2),
+            'chunk_records': min(size, BATCH_SIZE),
+        }
+        if name in CHUNKED_FILE_STAGES:
+            result['chunk_files'] = chunks
+        results.append(result)
+    return results
+
+def check_regression(result: Dict, baseline: Optional[Dict], threshold: float, min_seconds: float,
+                     min_mb: float) -> List[str]:
+    """Reasons the result regressed against the baseline beyond the threshold; small absolute changes are noise"""
+    if not baseline:
+        return []
+    reasons = []
+    change = benchmark_store.percent_change(baseline['seconds'], result['seconds'])
+    if change > threshold and result['seconds'] - baseline['seconds'] > min_seconds:
+        reasons.append(f"time {baseline['seconds']:.3f}s -> {result['seconds']:.3f}s ({change:+.1f}%)")
+    change = benchmark_store.percent_change(baseline['peak_mb'], result['peak_mb'])
+    if change > threshold and result['peak_mb'] - baseline['peak_mb'] > min_mb:
+        reasons.append(f"peak memory {baseline['peak_mb']:.1f} MB -> {result['peak_mb']:.1f} MB ({change:+.1f}%)")
+    return reasons
+
+def report(result: Dict, baseline: Optional[Dict], regressions: List[str]):
+    line = (f"📊 {result['stage']} @ {size_label(result['records'])}: {result['seconds']:.3f}s "
+            f"({result['records_per_second']:,.0f} records/s), peak {result['peak_mb']:.1f} MB")
+    if baseline:
+        change = benchmark_store.percent_change(baseline['seconds'], result['seconds'])
+        line += f" | vs {baseline['commit']}: {change:+.1f}%"
+    logger.info(line)
+    for reason in regressions:
+        logger.warning(f"   ⚠️ Regression: {reason}")
+
+def main():
+    """Benchmark the registered stages"""
+    parser = argparse.ArgumentParser(description="Benchmark the offline conversion and fixing stages")
+    parser.add_argument('--sizes', default='1k,100k,1M', help="comma-separated record counts, e.g. 1k,100k,1M")
+    parser.add_argument('--stages', default='all', help="comma-separated stages (default: all)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help="runs per chunk; the fastest counts")
+    parser.add_argument('--threshold', type=float, default=15.0,
+                        help="percent slowdown or memory growth that counts as a regression")
+    parser.add_argument('--min-seconds', type=float, default=0.02,
+                        help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument('--min-mb', type=float, default=1.0, help="ignore memory growth smaller than this")
+    parser.add_argument('--results-dir', default=benchmark_store.RESULTS_DIR)
+    parser.add_argument('--no-store', action='store_true', help="do not append results to the history")
+    args = parser.parse_args()
+
+    stages = list(STAGES) if args.stages == 'all' else [s.strip() for s in args.stages.split(',')]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)} (available: {', '.join(STAGES)})")
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(',')]
+    except ValueError:
+        parser.error(f"invalid --sizes: {args.sizes}")
+
+    # Per-record logging of the converter would dominate the measurement
+    logging.getLogger('records').setLevel(logging.WARNING)
+
+    history = benchmark_store.load_history(SUITE, args.results_dir)
+    regressed = []
+    with tempfile.TemporaryDirectory(prefix='benchmark_stages_') as scratch_dir:
+        context = StageContext(scratch_dir)
+        for size in sizes:
+            logger.info(f"📚 Benchmarking {len(stages)} stage(s) over {size_label(size)} records")
+            for result in run_size(size, stages, context, args.seed, args.repeat):
+                if not args.no_store:
+                    result = benchmark_store.append_result(SUITE, result, args.results_dir)
+                else:
+                    result['commit'] = benchmark_store.git_revision()
+                baseline = benchmark_store.find_baseline(history, result, ['stage', 'records', 'seed'])
+                regressions = check_regression(result, baseline, args.threshold, args.min_seconds, args.min_mb)
+                report(result, baseline, regressions)
+                if regressions:
+                    regressed.append(f"{result['stage']} @ {size_label(size)}")
+
+    if regressed:
+        logger.error(f"❌ {len(regressed)} regression(s) beyond {args.threshold:.0f}%: {', '.join(regressed)}")
+        return 1
+    logger.info("✅ No regressions")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
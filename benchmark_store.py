@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Benchmark Result Store
+Appends benchmark results to JSON Lines files tagged with the git commit,
+so throughput and timing regressions between versions stay visible.
+"""
+
+import json
+import math
+import os
+import subprocess
+import time
+from typing import Dict, List, Optional
+
+RESULTS_DIR = "benchmark_results"
+
+def git_revision() -> str:
+    """Return the short commit hash of the working tree (with a -dirty marker)"""
+    try:
+        revision = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        return f"{revision}-dirty" if dirty else revision
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+def latency_summary(latencies_ms: List[float]) -> Dict:
+    """Summarize request latencies in milliseconds"""
+    if not latencies_ms:
+        return {'count': 0, 'mean': 0.0, 'p50': 0.0, 'p90': 0.0, 'p99': 0.0, 'max': 0.0}
+    return {
+        'count': len(latencies_ms),
+        'mean': round(sum(latencies_ms) / len(latencies_ms), 3),
+        'p50': round(percentile(latencies_ms, 50), 3),
+        'p90': round(percentile(latencies_ms, 90), 3),
+        'p99': round(percentile(latencies_ms, 99), 3),
+        'max': round(max(latencies_ms), 3),
+    }
+
+def results_path(suite: str, results_dir: str = RESULTS_DIR) -> str:
+    return os.path.join(results_dir, f"{suite}.jsonl")
+
+def append_result(suite: str, result: Dict, results_dir: str = RESULTS_DIR) -> Dict:
+    """Tag a result with commit and timestamp and append it to the suite file"""
+    os.makedirs(results_dir, exist_ok=True)
+    record = {
+        'commit': git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        **result
+    }
+    with open(results_path(suite, results_dir), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+def load_history(suite: str, results_dir: str = RESULTS_DIR) -> List[Dict]:
+    """Load every stored result of a suite, oldest first"""
+    path = results_path(suite, results_dir)
+    if not os.path.exists(path):
+        return []
+    history = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                history.append(json.loads(line))
+    return history
+
+def find_baseline(history: List[Dict], current: Dict, match_keys: List[str]) -> Optional[Dict]:
+    """Most recent result from another commit with the same values for match_keys"""
+    for record in reversed(history):
+        if record.get('commit') == current.get('commit'):
+            continue
+        if all(record.get(key) == current.get(key) for key in match_keys):
+            return record
+    return None
+
+def percent_change(old: float, new: float) -> float:
+    if not old:
+        return 0.0
+    return (new - old) / old * 100.0
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Upload Throughput Benchmark
+Runs each upload mode against the local stub API and reports records/second
+and client-side tail latency. Results are stored per commit in
+benchmark_results/upload_throughput.jsonl so regressions stay visible.
+"""
+
+import argparse
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+import benchmark_store
+from stub_api_server import add_stub_arguments, config_from_args, start_stub_server
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SUITE = "upload_throughput"
+
+# name -> function(api_base_url, universities) -> results dict with 'successful'/'failed'
+UPLOAD_MODES: Dict[str, Callable[[str, List[Dict]], Dict]] = {}
+
+def upload_mode(name: str):
+    """Register an upload mode so it is picked up by the benchmark"""
+    def register(func: Callable[[str, List[Dict]], Dict]):
+        UPLOAD_MODES[name] = func
+        return func
+    return register
+
+@upload_mode('upload_universities')
+def run_simple_uploader(api_base_url: str, universities: List[Dict]) -> Dict:
+    """Sequential uploader from upload_universities.py, without its fixed delay"""
+    import upload_universities
+
+    results = {'successful': 0, 'failed': 0}
+    for university in universities:
+        if upload_universities.upload_university(api_base_url, university):
+            results['successful'] += 1
+        else:
+            results['failed'] += 1
+    return results
+
+@upload_mode('smart_upload')
+def run_smart_uploader(api_base_url: str, universities: List[Dict]) -> Dict:
+    """SmartUploader with retries, without its fixed delay"""
+    from smart_upload import SmartUploader
+
+    uploader = SmartUploader(api_base_url=api_base_url)
+    return uploader.smart_upload_all(universities, delay=0)
+
+@upload_mode('stream')
+def run_stream_pipeline(api_base_url: str, universities: List[Dict]) -> Dict:
+    """Streaming fix → validate → bounded queue → concurrent upload workers"""
+    from stream_pipeline import StreamPipeline
+
+    # Fixers mutate records, so the dataset shared between modes is copied
+    return StreamPipeline(api_base_url=api_base_url).run(dict(u) for u in universities)
+
+@upload_mode('bulk_loader')
+def run_bulk_loader(api_base_url: str, universities: List[Dict]) -> Dict:
+    """Entity-agnostic bulk loader: validate, then a pool of upload threads"""
+    from bulk_loader import ENTITIES, BulkLoader
+
+    results = BulkLoader(ENTITIES['universities'], api_base_url=api_base_url, checkpoint_dir=None).load(universities)
+    results['successful'] = results['created'] + results['skipped']
+    return results
+
+@contextmanager
+def record_request_latencies(latencies_ms: List[float]):
+    """Time every HTTP request sent through requests, whichever uploader sends it"""
+    import requests
+
+    original_send = requests.Session.send
+
+    def timed_send(session, request, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_send(session, request, **kwargs)
+        finally:
+            latencies_ms.append((time.perf_counter() - start) * 1000.0)
+
+    requests.Session.send = timed_send
+    try:
+        yield latencies_ms
+    finally:
+        requests.Session.send = original_send
+
+def build_dataset(dataset_file: str, records: int) -> List[Dict]:
+    """Load the dataset, repeating it with unique names if more records are requested"""
+    with open(dataset_file, 'r', encoding='utf-8') as f:
+        universities = json.load(f)
+    if not records or records == len(universities):
+        return universities
+    dataset = []
+    for i in range(records):
+        university = universities[i % len(universities)]
+        copy_number = i // len(universities)
+        if copy_number:
+            university = dict(university, name=f"{university['name']} #{copy_number}")
+        dataset.append(university)
+    return dataset
+
+def run_benchmark(mode: str, server, universities: List[Dict]) -> Dict:
+    """Run one upload mode against a freshly reset stub and summarize it"""
+    server.reset()
+    latencies_ms: List[float] = []
+    with record_request_latencies(latencies_ms):
+        start = time.perf_counter()
+        results = UPLOAD_MODES[mode](server.base_url, universities)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'records': len(universities),
+        'scenario': server.config.describe(),
+        'successful': results.get('successful', 0),
+        'failed': results.get('failed', 0),
+        'seconds': round(elapsed, 4),
+        'records_per_second': round(len(universities) / elapsed, 2) if elapsed > 0 else 0.0,
+        'latency_ms': benchmark_store.latency_summary(latencies_ms),
+        'server_status_counts': {str(k): v for k, v in server.stats.by_status.items()},
+    }
+
+def report(result: Dict, baseline: Dict = None):
+    latency = result['latency_ms']
+    logger.info(f"📊 {result['mode']}: {result['records_per_second']:.1f} records/s "
+                f"({result['successful']} ok, {result['failed']} failed in {result['seconds']:.2f}s)")
+    logger.info(f"   latency ms: p50={latency['p50']} p90={latency['p90']} "
+                f"p99={latency['p99']} max={latency['max']} over {latency['count']} requests")
+    if baseline:
+        change = benchmark_store.percent_change(baseline['records_per_second'], result['records_per_second'])
+        marker = "⚠️" if change < -10 else "✅"
+        logger.info(f"   {marker} vs {baseline['commit']}: {baseline['records_per_second']:.1f} records/s ({change:+.1f}%)")
+
+def main():
+    """Benchmark the registered upload modes"""
+    parser = argparse.ArgumentParser(description="Benchmark university uploaders against the stub API")
+    parser.add_argument('--dataset', default='universities_fixed.json')
+    parser.add_argument('--records', type=int, default=0, help="number of records to upload (default: whole dataset)")
+    parser.add_argument('--modes', default='all', help="comma-separated upload modes (default: all)")
+    parser.add_argument('--results-dir', default=benchmark_store.RESULTS_DIR)
+    parser.add_argument('--no-store', action='store_true', help="do not append results to the history")
+    parser.add_argument('--verbose', action='store_true', help="keep the uploaders' per-record logging")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    modes = list(UPLOAD_MODES) if args.modes == 'all' else [m.strip() for m in args.modes.split(',')]
+    unknown = [m for m in modes if m not in UPLOAD_MODES]
+    if unknown:
+        parser.error(f"unknown upload modes: {', '.join(unknown)} (available: {', '.join(UPLOAD_MODES)})")
+
+    if not args.verbose:
+        # Per-record console logging would dominate the measurement
+        logging.getLogger('smart_upload').setLevel(logging.WARNING)
+        logging.getLogger('upload_universities').setLevel(logging.WARNING)
+        logging.getLogger('records').setLevel(logging.WARNING)
+
+    universities = build_dataset(args.dataset, args.records)
+    logger.info(f"📚 Benchmarking {len(modes)} mode(s) with {len(universities)} universities")
+
+    server = start_stub_server(config_from_args(args))
+    history = benchmark_store.load_history(SUITE, args.results_dir)
+    try:
+        for mode in modes:
+            result = run_benchmark(mode, server, universities)
+            if not args.no_store:
+                result = benchmark_store.append_result(SUITE, result, args.results_dir)
+            else:
+                result['commit'] = benchmark_store.git_revision()
+            baseline = benchmark_store.find_baseline(history, result, ['mode', 'records', 'scenario'])
+            report(result, baseline)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
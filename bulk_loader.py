@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Bulk Loader for EduSmart Content
+Entity-agnostic version of SmartUploader's upload loop. Each endpoint is
+described by an EntityConfig (collection path, response keys, identity key,
+payload validation, success codes), and every entity shares the same
+machinery: records already in the API or in the resume checkpoint are
+skipped, payloads are validated before they are sent, uploads run on a pool
+of worker threads with one keep-alive session each, transient failures are
+retried with backoff, and a report is written at the end.
+
+    ./bulk_loader.py entities
+    ./bulk_loader.py load scholarships --input scholarships.json
+    ./bulk_loader.py seed --count 1000          # every entity, synthetic data
+    ./bulk_loader.py seed --count 1000 --stub   # against an in-process stub API
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+
+from auto_repair import parse_validation_errors
+from idempotency import idempotency_headers, still_in_progress
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "http://localhost:8000"
+CHECKPOINT_DIR = ".bulk_loader"
+
+# Statuses worth another attempt; anything else is final
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+@dataclass(frozen=True)
+class EntityConfig:
+    name: str
+    collection: str                            # path below the API base URL
+    list_key: str                              # records in a list response
+    item_key: str                              # created record in a create response
+    identity: Callable[[Dict], str]            # key that makes two payloads the same record
+    validate: Optional[Callable[[Dict], List[Dict]]] = None
+    # Fixes rejected fields in place and returns the errors it could not fix
+    repair: Optional[Callable[[Dict, List[Dict]], List[Dict]]] = None
+    success_codes: FrozenSet[int] = frozenset({201})
+    exists_codes: FrozenSet[int] = frozenset({409})  # answered when the record is already there
+    keyset: bool = False                       # listing pages with ?cursor= instead of ?page=
+    writable: bool = True
+    notes: str = ""
+
+# name -> config, in seeding order
+ENTITIES: Dict[str, EntityConfig] = {}
+
+def register_entity(config: EntityConfig) -> EntityConfig:
+    ENTITIES[config.name] = config
+    return config
+
+def field_identity(*fields: str) -> Callable[[Dict], str]:
+    """Identity from fields compared case- and whitespace-insensitively"""
+    def identity(record: Dict) -> str:
+        return '|'.join(' '.join(str(record.get(f) or '').lower().split()) for f in fields)
+    return identity
+
+def _university_identity(record: Dict) -> str:
+    from dedup_universities import identity_key
+
+    return identity_key(record.get('name', ''), record.get('country'))
+
+def _validate_university(record: Dict) -> List[Dict]:
+    from university_validation import validate_university
+
+    return validate_university(record)
+
+def _repair_university(record: Dict, errors: List[Dict]) -> List[Dict]:
+    from auto_repair import repair_record
+
+    return repair_record(record, errors)[1]
+
+def _content_validator(entity: str) -> Callable[[Dict], List[Dict]]:
+    def validate(record: Dict) -> List[Dict]:
+        from entity_validation import validate_entity
+
+        return validate_entity(entity, record)
+    return validate
+
+register_entity(EntityConfig(
+    name='universities', collection='/api/universities', list_key='universities', item_key='university',
+    identity=_university_identity, validate=_validate_university, repair=_repair_university, keyset=True))
+register_entity(EntityConfig(
+    name='scholarships', collection='/api/scholarships', list_key='scholarships', item_key='scholarship',
+    identity=field_identity('title', 'university'), validate=_content_validator('scholarships')))
+register_entity(EntityConfig(
+    name='blogs', collection='/api/blogs', list_key='blogs', item_key='blog',
+    identity=field_identity('title'), validate=_content_validator('blogs')))
+register_entity(EntityConfig(
+    name='case-studies', collection='/api/case-studies', list_key='caseStudies', item_key='caseStudy',
+    identity=field_identity('title', 'student_name'), validate=_content_validator('case-studies'),
+    notes="the listing only returns published case studies"))
+register_entity(EntityConfig(
+    name='courses', collection='/api/courses', list_key='courses', item_key='course',
+    identity=field_identity('title', 'instructor_name'), validate=_content_validator('courses'),
+    notes="created as drafts, which the listing hides; the checkpoint is what prevents repeats"))
+register_entity(EntityConfig(
+    name='featured', collection='/api/featured', list_key='', item_key='',
+    identity=field_identity('id'), writable=False,
+    notes="read-only aggregate of records created with featured: true"))
+
+class BulkLoader:
+    def __init__(self, entity: EntityConfig, api_base_url: str = API_BASE_URL, workers: int = 8,
+                 max_retries: int = 3, checkpoint_dir: Optional[str] = CHECKPOINT_DIR,
+                 admin_uid: Optional[str] = None, skip_existing: bool = True):
+        if not entity.writable:
+            raise ValueError(f"{entity.name} has no create endpoint ({entity.notes})")
+        self.entity = entity
+        self.api_base_url = api_base_url
+        self.workers = max(1, workers)
+        self.max_retries = max_retries
+        self.admin_uid = admin_uid
+        self.skip_existing = skip_existing
+        self.checkpoint_file = (os.path.join(checkpoint_dir, f"{entity.name}.done")
+                                if checkpoint_dir else None)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+
+    def session(self):
+        """Keep-alive session of the calling worker thread"""
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            import requests
+
+            session = self.local.session = requests.Session()
+            session.headers.update({'Content-Type': 'application/json', 'Accept': 'application/json'})
+        return session
+
+    def load_checkpoint(self) -> Set[str]:
+        if not self.checkpoint_file:
+            return set()
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                return {line.rstrip('\n') for line in f if line.strip()}
+        except FileNotFoundError:
+            return set()
+
+    def existing_keys(self, page_size: int = 1000) -> Set[str]:
+        """Identity keys of the records the listing endpoint returns"""
+        url = f"{self.api_base_url}{self.entity.collection}"
+        keys = set()
+        cursor, page = '', 1
+        while True:
+            params = ({'limit': page_size, 'cursor': cursor, 'count': 'none'} if self.entity.keyset
+                      else {'limit': page_size, 'page': page})
+            with profile_stage('fetch_existing'):
+                response = self.session().get(url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            keys.update(self.entity.identity(record) for record in data.get(self.entity.list_key, []))
+            pagination = data.get('pagination', {})
+            if self.entity.keyset:
+                cursor = pagination.get('nextCursor')
+                if cursor is None:
+                    return keys
+            else:
+                if page >= (pagination.get('totalPages') or 0):
+                    return keys
+                page += 1
+
+    def upload(self, record: Dict, key: str) -> Dict:
+        """POST one record with retries; returns {'status', 'outcome', 'error'} and field 'errors' for a 400"""
+        url = f"{self.api_base_url}{self.entity.collection}"
+        # Every attempt sends the same key, so a retry after a timeout cannot create a duplicate
+        headers = idempotency_headers(key, record)
+        status, error = None, None
+        for attempt in range(self.max_retries):
+            if self.stop.is_set():
+                break
+            if attempt:
+                with profile_stage('backoff'):
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 8))
+            try:
+                with profile_stage('network'):
+                    response = self.session().post(url, json=record, headers=headers, timeout=30)
+            except Exception as e:
+                # requests' Timeout and ConnectionError are retried like 5xx answers
+                status, error = None, f"{type(e).__name__}: {e}"
+                continue
+            status = response.status_code
+            if still_in_progress(response):
+                # The first attempt is still running on the server; its result is replayed on retry
+                error = "earlier attempt still in progress"
+                continue
+            if status in self.entity.success_codes:
+                return {'status': status, 'outcome': 'created', 'error': None}
+            if status in self.entity.exists_codes:
+                return {'status': status, 'outcome': 'skipped', 'error': None}
+            error = response.text[:500]
+            if status == 400:
+                return {'status': status, 'outcome': 'invalid', 'error': error,
+                        'errors': parse_validation_errors(response.text)}
+            if status not in RETRY_STATUSES:
+                return {'status': status, 'outcome': 'failed', 'error': error}
+            retry_after = response.headers.get('Retry-After')
+            if status == 429 and retry_after and retry_after.isdigit():
+                time.sleep(min(int(retry_after), 30))
+        return {'status': status, 'outcome': 'failed', 'error': error}
+
+    def record_done(self, key: str, checkpoint):
+        if checkpoint is not None:
+            with self.lock:
+                checkpoint.write(key + '\n')
+                checkpoint.flush()
+
+    def load(self, records: Iterable[Dict]) -> Dict:
+        """Upload the records not already loaded and return counts, timings and errors"""
+        start = time.perf_counter()
+        results = {'entity': self.entity.name, 'total': 0, 'created': 0, 'skipped': 0, 'invalid': 0,
+                   'failed': 0, 'repaired': 0, 'errors': []}
+
+        done = self.load_checkpoint()
+        if self.skip_existing:
+            try:
+                done |= self.existing_keys()
+            except Exception as e:
+                logger.warning(f"⚠️ Could not list existing {self.entity.name} ({e}), relying on the checkpoint")
+
+        checkpoint = None
+        if self.checkpoint_file:
+            os.makedirs(os.path.dirname(self.checkpoint_file) or '.', exist_ok=True)
+            checkpoint = open(self.checkpoint_file, 'a', encoding='utf-8')
+
+        pending = {}
+        # (key, record, field errors) the server rejected, repaired once all records are sent
+        rejected = []
+
+        def drain(limit: int):
+            while len(pending) > limit:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key, record, repairable = pending.pop(future)
+                    outcome = future.result()
+                    if repairable and outcome.get('errors') and self.entity.repair:
+                        rejected.append((key, record, outcome['errors']))
+                    else:
+                        self.collect(key, outcome, results, checkpoint)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers,
+                                    thread_name_prefix=f"load-{self.entity.name}") as executor:
+                for record in records:
+                    if self.stop.is_set():
+                        break
+                    results['total'] += 1
+                    if self.admin_uid and not record.get('uid'):
+                        record = dict(record, uid=self.admin_uid)
+                    key = self.entity.identity(record)
+                    if key in done:
+                        results['skipped'] += 1
+                        continue
+                    # Repeats within the input are sent once
+                    done.add(key)
+
+                    errors = self.entity.validate(record) if self.entity.validate else []
+                    if errors and self.entity.repair:
+                        record = dict(record)
+                        with profile_stage('repair'):
+                            remaining = self.entity.repair(record, parse_validation_errors({'errors': errors}))
+                        if not remaining:
+                            results['repaired'] += 1
+                            errors = []
+                    if errors:
+                        results['invalid'] += 1
+                        results['errors'].append({'key': key, 'status': None,
+                                                  'error': ', '.join(e['msg'] for e in errors)})
+                        continue
+
+                    # Bounded in-flight work keeps memory flat for large generated inputs
+                    drain(self.workers * 4 - 1)
+                    pending[executor.submit(self.upload, record, key)] = (key, record, True)
+                drain(0)
+
+                # Repair what the server's validation rejected and send it again in this run
+                for key, record, errors in rejected:
+                    if self.stop.is_set():
+                        break
+                    record = dict(record)
+                    with profile_stage('repair'):
+                        remaining = self.entity.repair(record, errors)
+                    if remaining:
+                        results['invalid'] += 1
+                        results['errors'].append({'key': key, 'status': 400, 'unrepairable': True,
+                                                  'error': ', '.join(f"{e['field']}: {e['msg']}" for e in remaining)})
+                        continue
+                    results['repaired'] += 1
+                    drain(self.workers * 4 - 1)
+                    pending[executor.submit(self.upload, record, key)] = (key, record, False)
+                drain(0)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+
+        results['seconds'] = round(time.perf_counter() - start, 3)
+        results['records_per_second'] = round(results['created'] / results['seconds'], 1) if results['seconds'] else 0.0
+        return results
+
+    def collect(self, key: str, outcome: Dict, results: Dict, checkpoint):
+        results[outcome['outcome']] += 1
+        if outcome['outcome'] in ('created', 'skipped'):
+            self.record_done(key, checkpoint)
+        else:
+            results['errors'].append({'key': key, 'status': outcome['status'], 'error': outcome['error']})
+
+# Synthetic content for seeding, valid under the rules in entity_validation.py
+WORDS = ['global', 'future', 'research', 'leaders', 'women', 'engineering', 'science', 'merit', 'excellence',
+         'international', 'graduate', 'undergraduate', 'innovation', 'community', 'arts', 'medicine', 'data']
+COUNTRIES = ['United States', 'United Kingdom', 'Canada', 'Australia', 'Germany', 'Japan', 'Singapore',
+             'Netherlands', 'France', 'Hong Kong']
+PEOPLE = ['Alex Chen', 'Maria Garcia', 'Sam Okafor', 'Priya Patel', 'Lena Novak', 'Kenji Sato', 'Amara Diallo']
+COURSE_CATEGORIES = ['programming', 'data-science', 'business', 'design', 'marketing', 'language', 'test-prep',
+                     'academic']
+CASE_CATEGORIES = ['undergraduate', 'graduate', 'phd', 'scholarship', 'visa', 'career-change']
+CASE_OUTCOMES = ['accepted', 'scholarship', 'rejected', 'waitlisted', 'in-progress']
+LOREM = ("Students from every background are encouraged to apply. The programme covers tuition, "
+         "living costs and travel, and recipients join a mentoring network of past scholars. ")
+
+def _title(rng: random.Random, kind: str, i: int) -> str:
+    return f"{' '.join(rng.sample(WORDS, 2)).title()} {kind} {i + 1}"
+
+def synthetic_records(entity: str, count: int, uid: str, seed: int = 42,
+                      featured_rate: float = 0.05) -> Iterator[Dict]:
+    """Seeded, valid payloads for an entity; a share is featured so /api/featured has content"""
+    if entity == 'universities':
+        from generate_synthetic import SyntheticGenerator
+
+        for record in SyntheticGenerator(seed=seed, uid=uid).records(count):
+            yield record
+        return
+
+    rng = random.Random(f"{seed}:{entity}")
+    for i in range(count):
+        featured = rng.random() < featured_rate
+        if entity == 'scholarships':
+            yield {'uid': uid, 'title': _title(rng, 'Scholarship', i), 'description': LOREM,
+                   'amount': rng.randrange(1000, 50000, 500), 'eligibility': 'Open to all admitted students',
+                   'deadline': f"2027-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                   'university': f"University of {rng.choice(COUNTRIES)}", 'country': rng.choice(COUNTRIES),
+                   'application_link': f"https://scholarships.example.com/{i + 1}", 'featured': featured}
+        elif entity == 'blogs':
+            yield {'uid': uid, 'title': _title(rng, 'Guide', i), 'content': LOREM * 3,
+                   'excerpt': LOREM[:160], 'category': rng.choice(['admissions', 'visa', 'finance', 'study']),
+                   'tags': rng.sample(WORDS, 3), 'image': f"https://picsum.photos/800/600?random={i % 100}",
+                   'featured': featured}
+        elif entity == 'case-studies':
+            yield {'uid': uid, 'title': _title(rng, 'Success Story', i), 'description': LOREM[:120],
+                   'student_name': rng.choice(PEOPLE), 'story_content': LOREM * 2,
+                   'category': rng.choice(CASE_CATEGORIES), 'outcome': rng.choice(CASE_OUTCOMES),
+                   'target_country': rng.choice(COUNTRIES), 'application_year': rng.randint(2018, 2026),
+                   'tags': rng.sample(WORDS, 2), 'reading_time': rng.randint(3, 15), 'featured': featured}
+        elif entity == 'courses':
+            yield {'uid': uid, 'title': _title(rng, 'Course', i), 'description': LOREM,
+                   'category': rng.choice(COURSE_CATEGORIES),
+                   'level': rng.choice(['beginner', 'intermediate', 'advanced']),
+                   'instructor_name': rng.choice(PEOPLE), 'price': round(rng.uniform(0, 200), 2),
+                   'duration_hours': rng.randint(2, 60), 'tags': rng.sample(WORDS, 3), 'featured': featured}
+        else:
+            raise ValueError(f"No synthetic data for {entity}")
+
+def read_records(path: str) -> List[Dict]:
+    """Records from a JSON array or an NDJSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+def report(results: Dict):
+    logger.info(f"📊 {results['entity']}: {results['created']} created, {results['skipped']} already loaded, "
+                f"{results['repaired']} repaired, {results['invalid']} invalid, {results['failed']} failed of {results['total']} "
+                f"in {results['seconds']}s ({results['records_per_second']} records/s)")
+    for error in results['errors'][:5]:
+        logger.info(f"   ❌ {error['key']}: {error['status']} {error['error']}")
+    if len(results['errors']) > 5:
+        logger.info(f"   ... and {len(results['errors']) - 5} more in the report")
+
+def install_signal_handlers(loaders: List[BulkLoader]):
+    def signal_handler(signum, frame):
+        logger.info(f"\n⚠️ Received signal {signum}. Stopping after the uploads in progress...")
+        for loader in loaders:
+            loader.stop.set()
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+def run_loads(jobs: List[tuple], args: argparse.Namespace) -> int:
+    """Run (entity, records) jobs one entity after the other and write the report"""
+    api_base_url = args.api_base_url
+    server = None
+    if getattr(args, 'stub', False):
+        from stub_api_server import StubConfig, start_stub_server
+
+        server = start_stub_server(StubConfig(latency=args.stub_latency))
+        api_base_url = server.base_url
+
+    loaders = [BulkLoader(ENTITIES[name], api_base_url=api_base_url, workers=args.workers,
+                          max_retries=args.max_retries,
+                          checkpoint_dir=None if args.no_checkpoint or server else args.checkpoint_dir,
+                          admin_uid=args.admin_uid, skip_existing=not args.no_skip_existing)
+               for name, _ in jobs]
+    install_signal_handlers(loaders)
+
+    start = time.perf_counter()
+    all_results = []
+    try:
+        for loader, (_, records) in zip(loaders, jobs):
+            if loader.stop.is_set():
+                break
+            results = loader.load(records)
+            report(results)
+            all_results.append(results)
+    finally:
+        if server:
+            server.shutdown()
+
+    elapsed = time.perf_counter() - start
+    created = sum(r['created'] for r in all_results)
+    logger.info(f"✅ {created} records created across {len(all_results)} entities in {elapsed:.2f}s "
+                f"({created / elapsed if elapsed else 0:.0f} records/s)")
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({'api_base_url': api_base_url, 'seconds': round(elapsed, 3), 'entities': all_results},
+                      f, indent=2, ensure_ascii=False)
+        logger.info(f"💾 Report written to {args.report}")
+    return 1 if any(r['failed'] for r in all_results) else 0
+
+def cmd_entities(args: argparse.Namespace) -> int:
+    for config in ENTITIES.values():
+        mode = 'read-only' if not config.writable else f"POST {config.collection}"
+        logger.info(f"{config.name:<14} {mode:<26} {config.notes}")
+    return 0
+
+def cmd_load(args: argparse.Namespace) -> int:
+    if args.entity not in ENTITIES or not ENTITIES[args.entity].writable:
+        writable = [name for name, config in ENTITIES.items() if config.writable]
+        logger.error(f"❌ {args.entity} cannot be loaded; choose one of {', '.join(writable)}")
+        return 1
+    try:
+        records = read_records(args.input)
+    except FileNotFoundError:
+        logger.error(f"❌ File {args.input} not found")
+        return 1
+    logger.info(f"📚 Loaded {len(records)} {args.entity} from {args.input}")
+    return run_loads([(args.entity, records)], args)
+
+def cmd_seed(args: argparse.Namespace) -> int:
+    names = args.entities or [name for name, config in ENTITIES.items() if config.writable]
+    uid = args.admin_uid or 'admin_uid_placeholder'
+    jobs = [(name, synthetic_records(name, args.count, uid, seed=args.seed)) for name in names]
+    return run_loads(jobs, args)
+
+def add_loader_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--api-base-url', default=API_BASE_URL)
+    parser.add_argument('--workers', type=int, default=8, help="concurrent uploads")
+    parser.add_argument('--max-retries', type=int, default=3)
+    parser.add_argument('--admin-uid', default=os.environ.get('EDUSMART_ADMIN_UID'),
+                        help="uid added to records without one (default: $EDUSMART_ADMIN_UID)")
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR, help="where loaded keys are kept for resuming")
+    parser.add_argument('--no-checkpoint', action='store_true')
+    parser.add_argument('--no-skip-existing', action='store_true', help="do not list the API for existing records")
+    parser.add_argument('--report', help="write counts, timings and every error as JSON")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Concurrent, resumable bulk loader for EduSmart content")
+    add_profile_arguments(parser)
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    entities = commands.add_parser('entities', help="list the configured entities")
+    entities.set_defaults(handler=cmd_entities)
+
+    load = commands.add_parser('load', help="load one entity from a JSON or NDJSON file")
+    load.add_argument('entity')
+    load.add_argument('--input', required=True)
+    add_loader_arguments(load)
+    load.set_defaults(handler=cmd_load)
+
+    seed = commands.add_parser('seed', help="fill every entity with synthetic records")
+    seed.add_argument('--count', type=int, default=100, help="records per entity")
+    seed.add_argument('--seed', type=int, default=42)
+    seed.add_argument('--entities', nargs='+', choices=[n for n, c in ENTITIES.items() if c.writable])
+    seed.add_argument('--stub', action='store_true',
+                      help="seed an in-process stub API instead of --api-base-url, e.g. to benchmark the loader")
+    seed.add_argument('--stub-latency', default='none', help="stub latency distribution, e.g. fixed:20")
+    add_loader_arguments(seed)
+    seed.set_defaults(handler=cmd_seed)
+    return parser
+
+def main() -> int:
+    args = build_parser().parse_args()
+    profiler = configure_profiler(args)
+    try:
+        return args.handler(args)
+    finally:
+        profiler.finish()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,10 +4,14 @@ Simple Excel to JSON converter for university data
 """
 
 import pandas as pd
+import argparse
 import json
 import random
 import re
 
+from gazetteer import infer_location
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 def clean_text(text):
     """Clean and normalize text data"""
     if pd.isna(text) or text is None:
@@ -29,41 +33,16 @@ def generate_image_url():
     image_id = random.randint(1, 100)
     return f"https://picsum.photos/800/600?random={image_id}"
 
-def extract_country_from_name(university_name):
-    """Extract country from university name patterns"""
-    country_patterns = {
-        'MIT': 'United States',
-        'Harvard': 'United States', 
-        'Stanford': 'United States',
-        'Oxford': 'United Kingdom',
-        'Cambridge': 'United Kingdom',
-        'Imperial College': 'United Kingdom',
-        'ETH Zurich': 'Switzerland',
-        'NTU': 'Singapore',
-        'NUS': 'Singapore',
-        'University of Tokyo': 'Japan',
-        'Tsinghua': 'China',
-        'Peking University': 'China',
-        'University of Toronto': 'Canada',
-        'McGill': 'Canada',
-        'University of Melbourne': 'Australia',
-        'University of Sydney': 'Australia',
-    }
-    
-    for pattern, country in country_patterns.items():
-        if pattern.lower() in university_name.lower():
-            return country
-    
-    # Default fallback
-    return 'United States'
+def extract_location_from_name(university_name):
+    """Country and city inferred from the university name by the gazetteer"""
+    location = infer_location(university_name)
+    if location is None:
+        # Default fallback
+        return 'United States', "Main Campus"
+    return location.country, location.city or "Main Campus"
 
-def main():
-    print("Converting Excel to JSON...")
-    
-    # Read Excel file
-    df = pd.read_excel('2026 QS Ranking 1000.xlsx')
-    print(f"Loaded {len(df)} universities")
-    
+def convert_rows(df):
+    """Build a university record for every workbook row"""
     universities = []
     
     for index, row in df.iterrows():
@@ -77,13 +56,15 @@ def main():
         if len(row) > 1 and not pd.isna(row.iloc[1]):
             description = clean_text(row.iloc[1])
         
+        country, city = extract_location_from_name(university_name)
+        
         # Create university data
         university_data = {
             "uid": "admin_uid_placeholder",  # Replace with actual admin UID
             "name": university_name,
             "description": description or f"{university_name} is a prestigious institution of higher education.",
-            "country": extract_country_from_name(university_name),
-            "city": "Main Campus",
+            "country": country,
+            "city": city,
             "state": "",
             "address": f"{university_name} Campus",
             "website": f"https://www.{university_name.lower().replace(' ', '').replace('university', 'uni')[:20]}.edu",
@@ -133,13 +114,33 @@ def main():
         
         universities.append(university_data)
     
+    return universities
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert the QS ranking workbook to JSON")
+    add_profile_arguments(parser)
+    profiler = configure_profiler(parser.parse_args())
+
+    print("Converting Excel to JSON...")
+    
+    # Read Excel file
+    with profile_stage('read_excel'):
+        df = pd.read_excel('2026 QS Ranking 1000.xlsx')
+    print(f"Loaded {len(df)} universities")
+    
+    with profile_stage('convert_rows'):
+        universities = convert_rows(df)
+    
     # Save to JSON
-    with open('universities_converted.json', 'w', encoding='utf-8') as f:
-        json.dump(universities, f, indent=2, ensure_ascii=False)
+    with profile_stage('write_json'):
+        with open('universities_converted.json', 'w', encoding='utf-8') as f:
+            json.dump(universities, f, indent=2, ensure_ascii=False)
     
     print(f"✅ Converted {len(universities)} universities to universities_converted.json")
     print(f"First university: {universities[0]['name']}")
     print(f"Last university: {universities[-1]['name']}")
 
+    profiler.finish()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
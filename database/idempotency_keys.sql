@@ -0,0 +1,33 @@
+-- Idempotency keys for admin creates (src/middlewares/idempotency.js)
+-- A POST with an Idempotency-Key header claims (scope, key) here before it runs and stores
+-- its response when done, so a retried or duplicated request on any instance gets the
+-- original response instead of creating a second record
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    -- sha256 of the request body; reusing a key with another body is rejected
+    request_hash TEXT NOT NULL,
+    -- NULL while the claiming request is still running
+    status_code INTEGER,
+    response_body TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (scope, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created_at ON idempotency_keys(created_at);
+
+-- Only the service role (supabaseAdmin) reads and writes keys
+ALTER TABLE idempotency_keys ENABLE ROW LEVEL SECURITY;
+
+-- Keys are honoured for a day; run periodically (e.g. from pg_cron) to drop older ones
+CREATE OR REPLACE FUNCTION purge_idempotency_keys(max_age INTERVAL DEFAULT INTERVAL '24 hours')
+RETURNS INTEGER AS $$
+DECLARE
+    purged INTEGER;
+BEGIN
+    DELETE FROM idempotency_keys WHERE created_at < NOW() - max_age;
+    GET DIAGNOSTICS purged = ROW_COUNT;
+    RETURN purged;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
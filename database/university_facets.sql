@@ -0,0 +1,70 @@
+-- Precomputed filter facets for universities
+-- Per-value counts for country, type, campus_type and region, kept current by a trigger
+-- so GET /api/universities/facets and /countries read a few hundred rows instead of every university
+
+CREATE TABLE IF NOT EXISTS university_facets (
+    facet TEXT NOT NULL,
+    value TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (facet, value)
+);
+
+-- Add (delta = 1) or remove (delta = -1) one university's values from the facet counts
+CREATE OR REPLACE FUNCTION adjust_university_facets(
+    p_country TEXT, p_type TEXT, p_campus_type TEXT, p_region TEXT, p_delta INTEGER
+)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO university_facets AS f (facet, value, count)
+    SELECT v.facet, v.value, p_delta
+    FROM (VALUES ('country', p_country), ('type', p_type), ('campus_type', p_campus_type), ('region', p_region))
+        AS v(facet, value)
+    WHERE v.value IS NOT NULL AND v.value <> ''
+    ON CONFLICT (facet, value) DO UPDATE SET count = f.count + EXCLUDED.count;
+
+    DELETE FROM university_facets WHERE count <= 0;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+CREATE OR REPLACE FUNCTION update_university_facets()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM adjust_university_facets(OLD.country, OLD.type, OLD.campus_type, OLD.region, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM adjust_university_facets(NEW.country, NEW.type, NEW.campus_type, NEW.region, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS update_university_facets_trigger ON universities;
+CREATE TRIGGER update_university_facets_trigger
+    AFTER INSERT OR DELETE OR UPDATE OF country, type, campus_type, region ON universities
+    FOR EACH ROW EXECUTE FUNCTION update_university_facets();
+
+-- Rebuild the counts from scratch (initial backfill, or after bulk loads that bypass triggers)
+CREATE OR REPLACE FUNCTION refresh_university_facets()
+RETURNS VOID AS $$
+BEGIN
+    DELETE FROM university_facets;
+    INSERT INTO university_facets (facet, value, count)
+    SELECT v.facet, v.value, COUNT(*)
+    FROM universities u
+    CROSS JOIN LATERAL (
+        VALUES ('country', u.country), ('type', u.type), ('campus_type', u.campus_type), ('region', u.region)
+    ) AS v(facet, value)
+    WHERE v.value IS NOT NULL AND v.value <> ''
+    GROUP BY v.facet, v.value;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+SELECT refresh_university_facets();
+
+-- Facets are public, like the university listing itself
+ALTER TABLE university_facets ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Anyone can view university facets" ON university_facets;
+CREATE POLICY "Anyone can view university facets" ON university_facets
+    FOR SELECT USING (true);
@@ -0,0 +1,9 @@
+-- Indexes for keyset pagination of GET /api/universities?cursor=
+-- Pages are ordered by (ranking ASC NULLS LAST, id ASC), so each page is an index range scan
+
+CREATE INDEX IF NOT EXISTS idx_universities_ranking_id
+    ON universities(ranking ASC NULLS LAST, id ASC);
+
+-- Same ordering within a country, the most common listing filter
+CREATE INDEX IF NOT EXISTS idx_universities_country_ranking_id
+    ON universities(country, ranking ASC NULLS LAST, id ASC);
@@ -0,0 +1,60 @@
+-- Indexed full-text and trigram search for universities
+-- Replaces sequential ilike scans in searchUniversities and the search filter of getAllUniversities
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Weighted document: name (A) > city (B) > description (C).
+-- Kept in one IMMUTABLE function so the index and the queries use the same expression.
+CREATE OR REPLACE FUNCTION university_search_vector(name TEXT, city TEXT, description TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A') ||
+           setweight(to_tsvector('simple'::regconfig, coalesce(city, '')), 'B') ||
+           setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'C');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Create indexes for search performance
+CREATE INDEX IF NOT EXISTS idx_universities_search_vector
+    ON universities USING GIN (university_search_vector(name, city, description));
+
+-- Trigram indexes serve substring matches (ILIKE '%q%') and similarity ranking
+CREATE INDEX IF NOT EXISTS idx_universities_name_trgm ON universities USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_universities_city_trgm ON universities USING GIN (city gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_universities_description_trgm ON universities USING GIN (description gin_trgm_ops);
+
+-- Array containment used by the programs_offered.cs filter
+CREATE INDEX IF NOT EXISTS idx_universities_programs_offered ON universities USING GIN (programs_offered);
+
+-- Ranked search used by GET /api/universities/search/:query
+CREATE OR REPLACE FUNCTION search_universities(
+    search_query TEXT,
+    filter_country TEXT DEFAULT NULL,
+    max_ranking INTEGER DEFAULT NULL,
+    max_tuition NUMERIC DEFAULT NULL,
+    result_limit INTEGER DEFAULT 1000,
+    result_offset INTEGER DEFAULT 0
+)
+RETURNS SETOF universities AS $$
+    WITH query AS (
+        SELECT websearch_to_tsquery('simple'::regconfig, search_query) AS ts,
+               '%' || replace(replace(replace(search_query, '\', '\\'), '%', '\%'), '_', '\_') || '%' AS pattern
+    )
+    SELECT u.*
+    FROM universities u, query
+    WHERE (
+            university_search_vector(u.name, u.city, u.description) @@ query.ts
+            OR u.name ILIKE query.pattern
+            OR u.city ILIKE query.pattern
+            OR u.description ILIKE query.pattern
+          )
+      AND (filter_country IS NULL OR u.country = filter_country)
+      AND (max_ranking IS NULL OR u.ranking <= max_ranking)
+      AND (max_tuition IS NULL OR u.tuition_fee <= max_tuition)
+    ORDER BY
+        ts_rank_cd(university_search_vector(u.name, u.city, u.description), query.ts)
+            + similarity(u.name, search_query) DESC,
+        u.ranking ASC NULLS LAST
+    LIMIT result_limit
+    OFFSET result_offset;
+$$ LANGUAGE sql STABLE;
+
+GRANT EXECUTE ON FUNCTION search_universities(TEXT, TEXT, INTEGER, NUMERIC, INTEGER, INTEGER) TO anon, authenticated;
@@ -0,0 +1,20 @@
+-- Enforce unique university slugs so concurrent creates cannot end up sharing one.
+-- createUniversity retries with a fresh slug when this index rejects an insert.
+
+-- Rename any existing duplicates before building the unique index. The row id
+-- suffix is unique, so a renamed slug cannot collide with another row's slug.
+WITH ranked AS (
+    SELECT id, slug, ROW_NUMBER() OVER (PARTITION BY slug ORDER BY created_at, id) AS duplicate_number
+    FROM universities
+    WHERE slug IS NOT NULL
+)
+UPDATE universities
+SET slug = ranked.slug || '-' || ranked.id
+FROM ranked
+WHERE universities.id = ranked.id
+  AND ranked.duplicate_number > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_universities_slug_unique ON universities(slug);
+
+-- Pattern index so the anchored slug regex used for slug allocation is an index range scan
+CREATE INDEX IF NOT EXISTS idx_universities_slug_pattern ON universities(slug text_pattern_ops);
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Duplicate and Near-duplicate University Detection
+Normalizes names (case, accents, punctuation, parenthetical acronyms, word
+order, "Universidad" vs "University"), groups candidates into blocks by their
+rarest name tokens and scores pairs only within blocks, so large datasets are
+handled without comparing every pair. Writes merge suggestions as JSON.
+"""
+
+import argparse
+import json
+import logging
+import math
+import re
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from gazetteer import canonical_country
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+STOPWORDS = {'the', 'of', 'at', 'and', 'in', 'for', 'de', 'del', 'da', 'do', 'dos', 'das', 'des', 'di',
+             'la', 'le', 'les', 'el', 'y', 'e', 'et', 'und', 'fur', 'der', 'van', 'von'}
+
+# Spelling variants folded onto one token
+SYNONYMS = {
+    'univ': 'university', 'universidad': 'university', 'universidade': 'university',
+    'universite': 'university', 'universitat': 'university', 'universita': 'university',
+    'universiteit': 'university', 'universitas': 'university', 'universiti': 'university',
+    'uniwersytet': 'university', 'universitet': 'university', 'inst': 'institute',
+    'instituto': 'institute', 'institut': 'institute', 'tech': 'technology',
+    'technological': 'technology', 'st': 'saint', 'intl': 'international',
+}
+
+# Records sharing a token more common than this are not compared through it
+MAX_BLOCK_SIZE = 200
+
+PARENTHETICAL = re.compile(r'\(([^)]*)\)')
+
+class NormalizedName:
+    __slots__ = ('tokens', 'key', 'acronym', 'initials', 'text')
+
+    def __init__(self, tokens: List[str], acronym: Optional[str]):
+        self.tokens = tokens
+        self.key = ' '.join(sorted(tokens))
+        self.acronym = acronym
+        self.initials = ''.join(t[0] for t in tokens)
+        self.text = ' '.join(tokens)
+
+def _fold(text: str) -> str:
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+def normalize_name(name: str) -> NormalizedName:
+    """Tokens of a name with case, accents, punctuation and stopwords removed"""
+    acronym = None
+    for inner in PARENTHETICAL.findall(name or ''):
+        # "(MIT)", "(U.C.L.)", "(UoM)": short, alphabetic and mostly capitals
+        letters = re.sub(r'[.&]', '', _fold(inner.strip()))
+        if 2 <= len(letters) <= 10 and letters.isalpha() and sum(c.isupper() for c in letters) >= len(letters) - 1:
+            acronym = letters.lower()
+    text = _fold(PARENTHETICAL.sub(' ', name or '')).lower().replace('&', ' and ')
+    text = re.sub(r"'s\b", '', text)
+    tokens = []
+    for token in re.findall(r'[a-z0-9]+', text):
+        token = SYNONYMS.get(token, token)
+        if token not in STOPWORDS:
+            tokens.append(token)
+    return NormalizedName(tokens, acronym)
+
+def _country_key(country: str) -> str:
+    # "China (Mainland)" and "China", "USA" and "United States" are one country
+    return _fold(canonical_country(country)).lower()
+
+def dedup_key(name: str, country: Optional[str] = None) -> str:
+    """Order-insensitive normalized key; equal keys are treated as the same university"""
+    key = normalize_name(name).key
+    return f"{key}|{_country_key(country)}" if country else key
+
+def identity_key(name: str, country: Optional[str] = None) -> str:
+    """Order-preserving normalized key; equal keys are the same university spelled differently.
+
+    Unlike dedup_key, "Miami University" and "University of Miami" stay apart.
+    """
+    key = normalize_name(name).text
+    return f"{key}|{_country_key(country)}" if country else key
+
+class UploadKeys:
+    """Identity keys of stored and queued universities.
+
+    Records with a new identity but the same token set as another are still
+    uploaded; they are collected in near_duplicates for the merge suggestion
+    report rather than dropped.
+    """
+
+    def __init__(self):
+        self.identities = set()
+        self.token_keys: Dict[str, str] = {}
+        self.near_duplicates: List[Dict] = []
+
+    def __len__(self) -> int:
+        return len(self.identities)
+
+    def add(self, name: str, country: Optional[str] = None, report: bool = True) -> bool:
+        """Record a university; False when its identity is already present"""
+        identity = identity_key(name, country)
+        if identity in self.identities:
+            return False
+        self.identities.add(identity)
+        token_key = dedup_key(name, country)
+        other = self.token_keys.get(token_key)
+        if other is None:
+            self.token_keys[token_key] = name
+        elif report:
+            self.near_duplicates.append({'name': name, 'country': country, 'matches': other})
+        return True
+
+    def log_near_duplicates(self, limit: int = 10):
+        if not self.near_duplicates:
+            return
+        logger.warning(f"🔎 {len(self.near_duplicates)} universities use the same words as another in a "
+                       f"different order and were uploaded anyway; review them with dedup_universities.py")
+        for match in self.near_duplicates[:limit]:
+            logger.warning(f"   {match['name']} ~ {match['matches']} ({match['country']})")
+
+class _DisjointSet:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int):
+        self.parent[self.find(a)] = self.find(b)
+
+class DuplicateFinder:
+    """Blocks records by rare name tokens and scores candidate pairs within blocks"""
+
+    def __init__(self, universities: List[Dict], threshold: float = 0.8):
+        self.universities = universities
+        self.threshold = threshold
+        self.names = [normalize_name(u.get('name', '')) for u in universities]
+        document_frequency = Counter(t for n in self.names for t in set(n.tokens))
+        total = max(1, len(universities))
+        self.idf = {t: math.log(1 + total / df) for t, df in document_frequency.items()}
+        self.countries = [_country_key(u['country']) if u.get('country') else '' for u in universities]
+        self.cities = [_fold(u.get('city') or '').lower() for u in universities]
+        self.token_sets = [frozenset(n.tokens) for n in self.names]
+        self.token_weights = [sum(self.idf[t] for t in tokens) for tokens in self.token_sets]
+        # Weighted Jaccard a pair needs to reach the threshold without an acronym match
+        self.min_overlap = max(0.0, (threshold - 0.35) / 0.7)
+
+    def blocking_keys(self, i: int) -> set:
+        """Prefix tokens of a record, plus its acronym.
+
+        Tokens are taken rarest first (a global order) until the rest weigh less
+        than the overlap a match needs, so any pair that can reach the
+        threshold shares at least one prefix token (prefix filtering).
+        """
+        name = self.names[i]
+        keys = set()
+        remaining = self.token_weights[i]
+        for token in sorted(self.token_sets[i], key=lambda t: (-self.idf[t], t)):
+            if remaining < self.min_overlap * self.token_weights[i]:
+                break
+            keys.add(f"t:{token}")
+            remaining -= self.idf[token]
+        if name.acronym:
+            keys.add(f"a:{name.acronym}")
+        return keys
+
+    def score(self, i: int, j: int, cutoff: float = 0.0) -> float:
+        """Similarity in 0-1; returns 0 as soon as the pair provably scores below cutoff"""
+        # Same-named institutions in different countries are usually distinct
+        different_country = bool(self.countries[i] and self.countries[j] and self.countries[i] != self.countries[j])
+        factor = 0.6 if different_country else 1.0
+        bonus = 0.05 if not different_country and self.cities[i] and self.cities[i] == self.cities[j] else 0.0
+        if factor + bonus < cutoff:
+            return 0.0
+
+        a, b = self.names[i], self.names[j]
+        if a.key == b.key:
+            return min(1.0, factor + bonus)
+
+        shared = sum(self.idf[t] for t in self.token_sets[i] & self.token_sets[j])
+        weighted = shared / ((self.token_weights[i] + self.token_weights[j] - shared) or 1)
+        # "Massachusetts Institute of Technology" matches "... (MIT)"; two
+        # different acronyms ("IITK", "IITKGP") point to different institutions
+        if a.acronym and b.acronym:
+            acronym_match = a.acronym == b.acronym
+        else:
+            acronym_match = bool(a.acronym and a.acronym == b.initials or b.acronym and b.acronym == a.initials)
+        if not acronym_match:
+            # Spelling similarity the pair needs; the length ratio bounds ratio() from above
+            needed = ((cutoff - bonus) / factor - 0.7 * weighted) / 0.3
+            if needed > 2.0 * min(len(a.text), len(b.text)) / ((len(a.text) + len(b.text)) or 1):
+                return 0.0
+        matcher = SequenceMatcher(None, a.text, b.text)
+        if not acronym_match and matcher.quick_ratio() < needed:
+            return 0.0
+
+        score = 0.7 * weighted + 0.3 * matcher.ratio()
+        if acronym_match:
+            score = max(score, 0.9)
+        return min(1.0, score * factor + bonus)
+
+    def find_pairs(self) -> Tuple[List[Tuple[int, int, float]], Dict[str, int]]:
+        # A pair from different countries scores at most 0.6, so above that
+        # threshold blocks are split by country and such pairs never meet
+        split_by_country = self.threshold > 0.6
+        keys = []
+        for i in range(len(self.names)):
+            record_keys = self.blocking_keys(i)
+            if split_by_country:
+                record_keys = {f"{self.countries[i]}|{key}" for key in record_keys}
+            keys.append(record_keys)
+
+        blocks: Dict[str, List[int]] = defaultdict(list)
+        for i, record_keys in enumerate(keys):
+            for key in record_keys:
+                blocks[key].append(i)
+        oversized = {key for key, members in blocks.items() if len(members) > MAX_BLOCK_SIZE}
+
+        # Records without an acronym by their initials, probed by records with one
+        by_initials: Dict[str, List[int]] = defaultdict(list)
+        for i, name in enumerate(self.names):
+            if not name.acronym and len(name.initials) > 1:
+                country = self.countries[i] if split_by_country else ''
+                by_initials[f"{country}|{name.initials}"].append(i)
+
+        pairs = []
+        stats = {'blocks': sum(1 for m in blocks.values() if len(m) > 1) - len(oversized),
+                 'oversized_blocks': len(oversized), 'comparisons': 0}
+        for i, record_keys in enumerate(keys):
+            # Union of the record's blocks, so pairs sharing several keys are scored once
+            candidates = set()
+            for key in record_keys:
+                if key not in oversized:
+                    candidates.update(blocks[key])
+            to_score = [j for j in candidates if j > i]
+            acronym = self.names[i].acronym
+            if acronym:
+                # The other side has no acronym and never probes, so these pairs
+                # are seen only here unless they also share a block
+                country = self.countries[i] if split_by_country else ''
+                to_score.extend(j for j in by_initials.get(f"{country}|{acronym}", ()) if j not in candidates)
+            for j in to_score:
+                stats['comparisons'] += 1
+                score = self.score(i, j, self.threshold)
+                if score >= self.threshold:
+                    pairs.append((min(i, j), max(i, j), score))
+        return pairs, stats
+
+    def _completeness(self, i: int) -> tuple:
+        university = self.universities[i]
+        filled = sum(1 for v in university.values() if v not in (None, '', [], False))
+        ranking = university.get('ranking')
+        return (filled, -(ranking if isinstance(ranking, (int, float)) else math.inf))
+
+    def suggestions(self, pairs: List[Tuple[int, int, float]]) -> List[Dict]:
+        """Cluster matching pairs and pick the most complete record of each cluster to keep"""
+        groups = _DisjointSet(len(self.universities))
+        best_score: Dict[int, float] = {}
+        for i, j, score in pairs:
+            groups.union(i, j)
+            best_score[i] = max(best_score.get(i, 0.0), score)
+            best_score[j] = max(best_score.get(j, 0.0), score)
+
+        clusters: Dict[int, List[int]] = defaultdict(list)
+        for i in best_score:
+            clusters[groups.find(i)].append(i)
+
+        suggestions = []
+        for members in clusters.values():
+            keep = max(members, key=self._completeness)
+            suggestions.append({
+                'keep': {'index': keep, 'name': self.universities[keep].get('name'),
+                         'country': self.universities[keep].get('country')},
+                'merge': [{'index': i, 'name': self.universities[i].get('name'),
+                           'country': self.universities[i].get('country'),
+                           'score': round(self.score(keep, i), 3)}
+                          for i in sorted(members) if i != keep]
+            })
+        suggestions.sort(key=lambda s: s['keep']['index'])
+        return suggestions
+
+def main():
+    """Find likely duplicate universities and write merge suggestions"""
+    parser = argparse.ArgumentParser(description="Detect duplicate and near-duplicate universities")
+    parser.add_argument('--dataset', default='universities_fixed.json')
+    parser.add_argument('--output', default='merge_suggestions.json')
+    parser.add_argument('--threshold', type=float, default=0.8, help="minimum pair score (0-1)")
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        universities = json.load(f)
+    logger.info(f"📚 Loaded {len(universities)} universities from {args.dataset}")
+
+    start = time.perf_counter()
+    finder = DuplicateFinder(universities, threshold=args.threshold)
+    pairs, stats = finder.find_pairs()
+    suggestions = finder.suggestions(pairs)
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(suggestions, f, indent=2, ensure_ascii=False)
+
+    logger.info(f"🔎 {stats['comparisons']} comparisons in {stats['blocks']} blocks "
+                f"({stats['oversized_blocks']} oversized blocks skipped) in {elapsed:.2f}s")
+    logger.info(f"✅ {len(suggestions)} merge suggestions covering "
+                f"{sum(len(s['merge']) for s in suggestions)} duplicates written to {args.output}")
+    for suggestion in suggestions[:10]:
+        merged = ', '.join(f"{m['name']} ({m['score']})" for m in suggestion['merge'])
+        logger.info(f"   keep {suggestion['keep']['name']} <- {merged}")
+
+if __name__ == "__main__":
+    main()
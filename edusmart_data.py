@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+EduSmart Data Command Line
+One entry point for the university data pipeline: convert, fix, upload,
+stream (workbook straight to the API) and diff. Each subcommand imports the
+modules it needs inside its handler, so commands that never read the
+workbook do not pay for importing pandas and only those talking to the API
+import requests.
+
+Usage: ./edusmart_data.py <command> [options]   (see --help of each command)
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import Dict, Iterable, List
+
+from fast_logging import add_logging_arguments, configure_logging
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+EXCEL_FILE = "2026 QS Ranking 1000.xlsx"
+JSON_FILE = "universities_fixed.json"
+API_BASE_URL = "http://localhost:8000"
+
+# Server-managed fields that never count as a difference
+DIFF_IGNORED_FIELDS = {'id', 'uid', 'created_at', 'updated_at', 'slug'}
+
+def read_json(path: str) -> List[Dict]:
+    with profile_stage('read_json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+def write_json(path: str, universities: List[Dict]):
+    with profile_stage('write_json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(universities, f, indent=2, ensure_ascii=False)
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    """Convert the QS ranking workbook to JSON"""
+    if args.schema == 'simple':
+        # One university per row, names and descriptions only
+        import pandas as pd
+        from convert_data import convert_rows
+
+        output = args.output or 'universities_converted.json'
+        with profile_stage('read_excel'):
+            df = pd.read_excel(args.excel)
+        with profile_stage('convert_rows'):
+            universities = convert_rows(df)
+        write_json(output, universities)
+    else:
+        # One university per column with every field of the workbook
+        from university_uploader_fixed import UniversityUploaderFixed
+
+        output = args.output or JSON_FILE
+        with profile_stage('convert'):
+            universities = UniversityUploaderFixed().convert_excel_to_json(args.excel, output)
+
+    if not universities:
+        logger.error(f"❌ No universities found in {args.excel}")
+        return 1
+    logger.info(f"✅ Converted {len(universities)} universities to {output}")
+    return 0
+
+def cmd_fix(args: argparse.Namespace) -> int:
+    """Repair URLs, GPA, contact and media fields, then report remaining validation errors"""
+    from final_fix import fix_university_fields
+    from fix_images import fix_university_media
+    from university_validation import validate_university
+
+    universities = read_json(args.input)
+    field_fixes = 0
+    media_fixes = 0
+    with profile_stage('fix_records'):
+        for uni in universities:
+            if fix_university_fields(uni):
+                field_fixes += 1
+            if fix_university_media(uni):
+                media_fixes += 1
+
+    with profile_stage('validate'):
+        invalid = {uni.get('name', '?'): errors for uni in universities
+                   for errors in [validate_university(uni)] if errors}
+
+    output = args.output or args.input
+    if not args.dry_run:
+        write_json(output, universities)
+
+    logger.info(f"🔧 Fixed fields in {field_fixes} and media in {media_fixes} of {len(universities)} universities"
+                + (" (dry run, nothing written)" if args.dry_run else f", written to {output}"))
+    if invalid:
+        logger.warning(f"⚠️ {len(invalid)} universities still fail validation")
+        for name, errors in list(invalid.items())[:10]:
+            logger.warning(f"   {name}: {', '.join(e['msg'] for e in errors)}")
+        return 1
+    logger.info("✅ All universities pass validation")
+    return 0
+
+def cmd_upload(args: argparse.Namespace) -> int:
+    """Upload universities not yet in the database, with retries"""
+    from smart_upload import SmartUploader
+
+    try:
+        universities = read_json(args.input)
+    except FileNotFoundError:
+        logger.error(f"❌ File {args.input} not found! Run the convert command first.")
+        return 1
+    logger.info(f"📚 Loaded {len(universities)} universities from {args.input}")
+
+    uploader = SmartUploader(api_base_url=args.api_base_url, repair_rounds=args.repair_rounds,
+                             repair_report=args.repair_report)
+    if not uploader.test_api_connection():
+        return 1
+
+    with profile_stage('upload'):
+        results = uploader.smart_upload_all(universities, delay=args.delay)
+    if results['errors'] and args.retry_failed and not uploader.should_stop:
+        logger.info(f"🔄 Retrying {len(results['errors'])} failed uploads...")
+        failed = set(results['errors'])
+        with profile_stage('upload'):
+            retry_results = uploader.smart_upload_all([u for u in universities if u['name'] in failed],
+                                                      delay=args.delay)
+        results['successful'] += retry_results['successful'] - retry_results['skipped']
+        results['failed'] = retry_results['failed']
+        results['errors'] = retry_results['errors']
+
+    logger.info(f"📊 Uploaded or already present: {results['successful']}, "
+                f"skipped: {results['skipped']}, failed: {results['failed']}")
+    if results['repaired'] or results['unrepairable']:
+        logger.info(f"🔧 Repaired and uploaded: {results['repaired']}, "
+                    f"unrepairable: {len(results['unrepairable'])} (see {args.repair_report})")
+    if results['errors']:
+        logger.info(f"❌ Failed universities: {', '.join(results['errors'][:10])}")
+    return 1 if results['failed'] else 0
+
+def cmd_stream(args: argparse.Namespace) -> int:
+    """Convert, fix, validate and upload the workbook record by record"""
+    from stream_pipeline import run_from_args
+
+    return run_from_args(args)
+
+def fetch_api_universities(api_base_url: str, page_size: int = 1000) -> List[Dict]:
+    """Every university the API returns, walking its keyset pages"""
+    import requests
+
+    universities = []
+    cursor = ''
+    with requests.Session() as session:
+        while cursor is not None:
+            with profile_stage('fetch_existing'):
+                response = session.get(f"{api_base_url}/api/universities",
+                                       params={'limit': page_size, 'cursor': cursor, 'count': 'none'}, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            universities.extend(data['universities'])
+            cursor = data.get('pagination', {}).get('nextCursor')
+    return universities
+
+def diff_universities(old: Iterable[Dict], new: Iterable[Dict]) -> Dict:
+    """Added, removed and changed universities, matched by normalized name and country"""
+    from dedup_universities import identity_key
+
+    old_by_key = {identity_key(u.get('name', ''), u.get('country')): u for u in old}
+    new_by_key = {identity_key(u.get('name', ''), u.get('country')): u for u in new}
+
+    changed = []
+    for key in old_by_key.keys() & new_by_key.keys():
+        before, after = old_by_key[key], new_by_key[key]
+        # Only fields both sides carry, so a partial record is not reported as blanked
+        fields = sorted(f for f in before.keys() & after.keys()
+                        if f not in DIFF_IGNORED_FIELDS and before[f] != after[f])
+        if fields:
+            changed.append({'name': after.get('name'),
+                            'changes': {f: {'old': before[f], 'new': after[f]} for f in fields}})
+
+    return {
+        'added': sorted(new_by_key[k].get('name', '') for k in new_by_key.keys() - old_by_key.keys()),
+        'removed': sorted(old_by_key[k].get('name', '') for k in old_by_key.keys() - new_by_key.keys()),
+        'changed': sorted(changed, key=lambda c: c['name'] or ''),
+    }
+
+def cmd_diff(args: argparse.Namespace) -> int:
+    """Compare a JSON file with another file or with the API"""
+    if args.old:
+        old = read_json(args.old)
+        source = args.old
+    else:
+        old = fetch_api_universities(args.api_base_url)
+        source = args.api_base_url
+    new = read_json(args.new)
+
+    with profile_stage('diff'):
+        diff = diff_universities(old, new)
+
+    logger.info(f"📊 {args.new} against {source}: {len(diff['added'])} added, "
+                f"{len(diff['removed'])} removed, {len(diff['changed'])} changed")
+    for name in diff['added'][:args.show]:
+        logger.info(f"   + {name}")
+    for name in diff['removed'][:args.show]:
+        logger.info(f"   - {name}")
+    for change in diff['changed'][:args.show]:
+        logger.info(f"   ~ {change['name']}: {', '.join(change['changes'])}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(diff, f, indent=2, ensure_ascii=False)
+        logger.info(f"💾 Diff written to {args.output}")
+    return 1 if args.exit_code and any(diff.values()) else 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="EduSmart university data pipeline")
+    add_profile_arguments(parser)
+    add_logging_arguments(parser)
+    commands = parser.add_subparsers(dest='command', metavar='command', required=True)
+
+    convert = commands.add_parser('convert', help="convert the QS ranking workbook to JSON")
+    convert.add_argument('--excel', default=EXCEL_FILE)
+    convert.add_argument('--output', help="JSON file to write (default: depends on --schema)")
+    convert.add_argument('--schema', choices=('full', 'simple'), default='full',
+                         help="full: every workbook field, one university per column "
+                              "(universities_fixed.json); simple: one per row (universities_converted.json)")
+    convert.set_defaults(handler=cmd_convert)
+
+    fix = commands.add_parser('fix', help="repair invalid fields and report validation errors")
+    fix.add_argument('--input', default=JSON_FILE)
+    fix.add_argument('--output', help="JSON file to write (default: overwrite --input)")
+    fix.add_argument('--dry-run', action='store_true', help="report without writing")
+    fix.set_defaults(handler=cmd_fix)
+
+    upload = commands.add_parser('upload', help="upload universities not yet in the database")
+    upload.add_argument('--input', default=JSON_FILE)
+    upload.add_argument('--api-base-url', default=API_BASE_URL)
+    upload.add_argument('--delay', type=float, default=0.3, help="seconds between uploads")
+    upload.add_argument('--retry-failed', action='store_true', help="retry failed uploads once more at the end")
+    upload.add_argument('--repair-rounds', type=int, default=2,
+                        help="rounds of repairing and re-sending universities the API rejects (0 = off)")
+    upload.add_argument('--repair-report', default='unrepairable_universities.json',
+                        help="where universities that could not be repaired are listed")
+    upload.set_defaults(handler=cmd_upload)
+
+    # stream_pipeline imports nothing heavy at module level
+    from stream_pipeline import add_stream_arguments
+
+    stream = commands.add_parser('stream', help="stream the workbook to the API record by record")
+    add_stream_arguments(stream)
+    stream.set_defaults(handler=cmd_stream)
+
+    diff = commands.add_parser('diff', help="compare a JSON file with another file or the API")
+    diff.add_argument('new', nargs='?', default=JSON_FILE, help="JSON file to compare")
+    diff.add_argument('--old', help="JSON file to compare against (default: the API)")
+    diff.add_argument('--api-base-url', default=API_BASE_URL)
+    diff.add_argument('--output', help="write the full diff as JSON")
+    diff.add_argument('--show', type=int, default=10, help="entries of each kind to print")
+    diff.add_argument('--exit-code', action='store_true', help="exit with 1 when there are differences")
+    diff.set_defaults(handler=cmd_diff)
+    return parser
+
+def main() -> int:
+    args = build_parser().parse_args()
+    profiler = configure_profiler(args)
+    configure_logging(args)
+    try:
+        return args.handler(args)
+    finally:
+        profiler.finish()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Content Entity Payload Validation
+Python mirror of blogValidationRules, courseValidationRules,
+scholarshipValidationRules and caseStudyValidationRules in
+src/middlewares/validators.js, in the style of university_validation.py.
+"""
+
+import re
+from typing import Callable, Dict, List
+
+from university_validation import BOOLEAN_VALUES, _as_string, _error, is_float_between, is_numeric, is_url
+
+ISO8601_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?)?$')
+UUID_PATTERN = re.compile(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', re.IGNORECASE)
+INT_PATTERN = re.compile(r'^[+-]?\d+$')
+
+def is_boolean(value) -> bool:
+    return _as_string(value).lower() in BOOLEAN_VALUES
+
+def is_int_between(value, minimum: int, maximum: float = float('inf')) -> bool:
+    """Equivalent of validator.isInt({ min, max })"""
+    text = _as_string(value)
+    return not isinstance(value, (list, dict)) and INT_PATTERN.match(text) is not None and minimum <= int(text) <= maximum
+
+def is_array(value) -> bool:
+    return isinstance(value, list)
+
+def is_string(value) -> bool:
+    return isinstance(value, str)
+
+def max_length(limit: int) -> Callable[[object], bool]:
+    return lambda value: isinstance(value, str) and len(value) <= limit
+
+def one_of(*choices: str) -> Callable[[object], bool]:
+    return lambda value: isinstance(value, str) and value.strip() in choices
+
+# (field, required message, min length, max length, length message) for
+# isString().trim().notEmpty().isLength() chains
+REQUIRED_TEXT = {
+    'blogs': [
+        ('title', 'Title is required', 5, 200, 'Title must be between 5 and 200 characters'),
+        ('content', 'Content is required', 50, None, 'Content must be at least 50 characters'),
+        ('excerpt', 'Excerpt is required', 0, 300, 'Excerpt must be at most 300 characters'),
+        ('category', 'Category is required', 0, None, None),
+    ],
+    'courses': [
+        ('title', 'Title is required', 5, 200, 'Title must be between 5 and 200 characters'),
+        ('description', 'Description is required', 50, None, 'Description must be at least 50 characters'),
+        ('category', 'Category is required', 0, None, None),
+        ('level', 'Level is required', 0, None, None),
+        ('instructor_name', 'Instructor name is required', 2, 100,
+         'Instructor name must be between 2 and 100 characters'),
+    ],
+    'scholarships': [
+        ('title', 'Title is required', 5, 200, 'Title must be between 5 and 200 characters'),
+        ('description', 'Description is required', 50, None, 'Description must be at least 50 characters'),
+    ],
+    'case-studies': [
+        ('title', 'Title is required', 5, 200, 'Title must be between 5 and 200 characters'),
+        ('description', 'Description is required', 10, None, 'Description must be at least 10 characters'),
+        ('student_name', 'Student name is required', 2, 100, 'Student name must be between 2 and 100 characters'),
+        ('story_content', 'Story content is required', 100, None, 'Story content must be at least 100 characters'),
+        ('category', 'Category is required', 0, None, None),
+        ('outcome', 'Outcome is required', 0, None, None),
+    ],
+}
+
+# (field, check, message, optional): optional fields are only checked when present
+FIELD_RULES = {
+    'blogs': [
+        ('tags', is_array, 'Tags must be an array', False),
+        ('image', is_url, 'Image must be a valid URL', True),
+        ('featured', is_boolean, 'Featured must be a boolean', True),
+    ],
+    'courses': [
+        ('category', one_of('programming', 'data-science', 'business', 'design', 'marketing', 'language',
+                            'test-prep', 'academic'),
+         'Category must be one of: programming, data-science, business, design, marketing, language, '
+         'test-prep, academic', False),
+        ('level', one_of('beginner', 'intermediate', 'advanced'),
+         'Level must be one of: beginner, intermediate, advanced', False),
+        ('subtitle', max_length(300), 'Subtitle must be at most 300 characters', True),
+        ('subcategory', max_length(50), 'Subcategory must be at most 50 characters', True),
+        ('language', max_length(20), 'Language must be at most 20 characters', True),
+        ('price', is_numeric, 'Price must be a number', True),
+        ('original_price', is_numeric, 'Original price must be a number', True),
+        ('currency', max_length(3), 'Currency must be at most 3 characters', True),
+        ('duration_hours', is_numeric, 'Duration hours must be a number', True),
+        ('total_lectures', lambda v: is_int_between(v, 0), 'Total lectures must be a non-negative integer', True),
+        ('total_sections', lambda v: is_int_between(v, 0), 'Total sections must be a non-negative integer', True),
+        ('thumbnail_image', is_url, 'Thumbnail image must be a valid URL', True),
+        ('preview_video_url', is_url, 'Preview video URL must be a valid URL', True),
+        ('instructor_id', lambda v: isinstance(v, str) and UUID_PATTERN.match(v) is not None,
+         'Instructor ID must be a valid UUID', True),
+        ('instructor_bio', is_string, 'Instructor bio must be a string', True),
+        ('instructor_image', is_url, 'Instructor image must be a valid URL', True),
+        ('what_you_will_learn', is_array, 'What you will learn must be an array', True),
+        ('prerequisites', is_array, 'Prerequisites must be an array', True),
+        ('target_audience', is_array, 'Target audience must be an array', True),
+        ('course_includes', is_array, 'Course includes must be an array', True),
+        ('tags', is_array, 'Tags must be an array', True),
+        ('keywords', is_array, 'Keywords must be an array', True),
+        ('meta_description', is_string, 'Meta description must be a string', True),
+        ('status', one_of('draft'), 'Status must be: draft', True),
+        ('featured', is_boolean, 'Featured must be a boolean', True),
+        ('bestseller', is_boolean, 'Bestseller must be a boolean', True),
+        ('new_course', is_boolean, 'New course must be a boolean', True),
+        ('rating', lambda v: is_float_between(v, 0, 5), 'Rating must be a number between 0 and 5', True),
+        ('total_reviews', lambda v: is_int_between(v, 0), 'Total reviews must be a non-negative integer', True),
+        ('total_students', lambda v: is_int_between(v, 0), 'Total students must be a non-negative integer', True),
+        ('certificate_available', is_boolean, 'Certificate available must be a boolean', True),
+        ('completion_certificate_template', is_string, 'Completion certificate template must be a string', True),
+    ],
+    'scholarships': [
+        ('amount', is_numeric, 'Amount must be a number', True),
+        ('eligibility', is_string, 'Eligibility criteria must be a string', True),
+        ('deadline', lambda v: isinstance(v, str) and ISO8601_PATTERN.match(v) is not None,
+         'Deadline must be a valid date', True),
+        ('university', is_string, 'University must be a string', True),
+        ('country', is_string, 'Country must be a string', True),
+        ('application_link', is_url, 'Application link must be a valid URL', True),
+        ('featured', is_boolean, 'Featured must be a boolean', True),
+    ],
+    'case-studies': [
+        ('category', one_of('undergraduate', 'graduate', 'phd', 'scholarship', 'visa', 'career-change'),
+         'Category must be one of: undergraduate, graduate, phd, scholarship, visa, career-change', False),
+        ('outcome', one_of('accepted', 'scholarship', 'rejected', 'waitlisted', 'in-progress'),
+         'Outcome must be one of: accepted, scholarship, rejected, waitlisted, in-progress', False),
+        ('student_image', is_url, 'Student image must be a valid URL', True),
+        ('scholarship_amount', is_numeric, 'Scholarship amount must be a number', True),
+        ('application_year', lambda v: is_int_between(v, 2000, 2030),
+         'Application year must be between 2000 and 2030', True),
+        ('challenges_faced', is_array, 'Challenges faced must be an array', True),
+        ('strategies_used', is_array, 'Strategies used must be an array', True),
+        ('advice_given', is_array, 'Advice given must be an array', True),
+        ('tags', is_array, 'Tags must be an array', True),
+        ('reading_time', lambda v: is_int_between(v, 1, 60), 'Reading time must be between 1 and 60 minutes', True),
+        ('featured', is_boolean, 'Featured must be a boolean', True),
+        ('status', one_of('draft', 'published', 'archived'), 'Status must be one of: draft, published, archived',
+         True),
+    ],
+}
+
+def validate_entity(entity: str, data: Dict) -> List[Dict]:
+    """Validate a payload for one of the content endpoints and return express-validator style errors"""
+    errors = []
+
+    uid = data.get('uid')
+    if not isinstance(uid, str):
+        errors.append(_error('uid', uid, 'User ID must be a string'))
+    elif not uid:
+        errors.append(_error('uid', uid, 'User ID is required'))
+
+    for field, required_msg, minimum, maximum, length_msg in REQUIRED_TEXT[entity]:
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip():
+            errors.append(_error(field, value, required_msg))
+        elif length_msg and not minimum <= len(value.strip()) <= (maximum or float('inf')):
+            errors.append(_error(field, value, length_msg))
+
+    for field, check, msg, optional in FIELD_RULES[entity]:
+        if optional and field not in data:
+            continue
+        if field not in data or not check(data[field]):
+            errors.append(_error(field, data.get(field), msg))
+
+    return errors
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+PostgreSQL COPY Export and Bulk Loader
+Turns universities_fixed.json into a COPY text file for the universities
+table, with the same column values createUniversity would insert (uuid
+ids, unique slugs, parseInt/parseFloat coercions, `|| []` and `|| false`
+defaults, status and audit columns), and streams it into PostgreSQL with
+psql in one transaction. A full reload is a single COPY instead of one
+HTTP request per university.
+
+    ./export_copy.py export --input universities_fixed.json --output universities.copy
+    ./export_copy.py load --input universities.copy --dsn postgresql://localhost/edusmart --truncate
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Columns in the order of the insert in createUniversity
+TEXT_COLUMNS = {'name', 'description', 'country', 'city', 'state', 'address', 'website', 'contact_email',
+                'contact_phone', 'type', 'image', 'logo', 'campus_size', 'campus_type', 'accreditation',
+                'region', 'ranking_type', 'sat_score_required', 'act_score_required', 'ielts_score_required',
+                'toefl_score_required', 'gre_score_required', 'gmat_score_required',
+                'application_deadline_fall', 'application_deadline_spring', 'application_deadline_summer'}
+INT_COLUMNS = {'established_year', 'ranking', 'student_population', 'faculty_count', 'ranking_year',
+               'tuition_fee_graduate'}
+FLOAT_COLUMNS = {'tuition_fee', 'application_fee', 'acceptance_rate', 'min_gpa_required'}
+ARRAY_COLUMNS = {'programs_offered', 'facilities', 'gallery', 'notable_alumni', 'keywords',
+                 'application_requirements'}
+BOOLEAN_COLUMNS = {'scholarship_available', 'financial_aid_available', 'admission_essay_required',
+                   'interview_required', 'work_experience_required', 'portfolio_required'}
+
+COLUMNS = [
+    'id', 'name', 'description', 'country', 'city', 'state', 'address', 'website', 'contact_email',
+    'contact_phone', 'established_year', 'type', 'ranking', 'tuition_fee', 'application_fee',
+    'acceptance_rate', 'student_population', 'faculty_count', 'programs_offered', 'facilities', 'image',
+    'logo', 'gallery', 'campus_size', 'campus_type', 'accreditation', 'notable_alumni', 'slug', 'keywords',
+    'region', 'ranking_type', 'ranking_year', 'min_gpa_required', 'sat_score_required',
+    'act_score_required', 'ielts_score_required', 'toefl_score_required', 'gre_score_required',
+    'gmat_score_required', 'application_deadline_fall', 'application_deadline_spring',
+    'application_deadline_summer', 'tuition_fee_graduate', 'scholarship_available',
+    'financial_aid_available', 'application_requirements', 'admission_essay_required',
+    'letters_of_recommendation_required', 'interview_required', 'work_experience_required',
+    'portfolio_required', 'status', 'featured', 'verified', 'created_by', 'created_at', 'updated_at',
+]
+
+NULL = r'\N'
+NEEDS_ESCAPE = re.compile(r'[\\\t\n\r]')
+PG_TRUE = {'t', 'true', 'y', 'yes', 'on', '1'}
+
+INT_PREFIX = re.compile(r'\s*([+-]?\d+)')
+FLOAT_PREFIX = re.compile(r'\s*([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+
+def slugify(name: str) -> str:
+    """Port of slugify() in universityController.js.
+
+    String.prototype.trim ignores its argument, so the JS `.trim('-')` only
+    trims whitespace and leading/trailing hyphens survive; kept for parity.
+    """
+    slug = name.lower()
+    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
+    slug = re.sub(r'\s+', '-', slug)
+    slug = re.sub(r'-+', '-', slug)
+    return slug.strip()
+
+def allocate_slugs(names: Iterable[str], taken: Iterable[str] = ()) -> List[str]:
+    """Unique slugs in the controller's base, base-1, base-2, ... sequence"""
+    used = set(taken)
+    # Next suffix to try per base, so repeated bases do not rescan from 1
+    counters: Dict[str, int] = {}
+    slugs = []
+    for name in names:
+        base = slugify(name or '') or 'university'
+        slug = base
+        if slug in used:
+            counter = counters.get(base, 1)
+            while f"{base}-{counter}" in used:
+                counter += 1
+            counters[base] = counter + 1
+            slug = f"{base}-{counter}"
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
+
+def _truthy(value) -> bool:
+    """JavaScript truthiness of a JSON value"""
+    if isinstance(value, float) and math.isnan(value):
+        return False
+    return value not in (None, False, 0, '')
+
+def _js_string(value) -> str:
+    if type(value) is str:
+        return value
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e21:
+        return str(int(value))
+    return str(value)
+
+def js_parse_int(value) -> Optional[int]:
+    """`value ? parseInt(value) : null`; NaN becomes null like it does in the JSON sent to the database"""
+    if not _truthy(value):
+        return None
+    match = INT_PREFIX.match(_js_string(value))
+    return int(match.group(1)) if match else None
+
+def js_parse_float(value) -> Optional[float]:
+    """`value ? parseFloat(value) : null`"""
+    if not _truthy(value):
+        return None
+    match = FLOAT_PREFIX.match(_js_string(value))
+    return float(match.group(1)) if match else None
+
+def _number(value) -> str:
+    if value is None:
+        return NULL
+    # JSON numbers carry no ".0", so integral floats also fit integer columns
+    return _js_string(value)
+
+def _escape(text: str) -> str:
+    """COPY text-format escaping of backslashes and line/field separators"""
+    if NEEDS_ESCAPE.search(text) is None:
+        return text
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+def _text(value) -> str:
+    if value is None:
+        return NULL
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False)
+    return _escape(_js_string(value))
+
+def _array_element(value) -> str:
+    if type(value) is str:
+        return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+    if value is None:
+        return 'NULL'
+    text = _js_string(value) if not isinstance(value, (list, dict)) else json.dumps(value, ensure_ascii=False)
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+def _array(value, json_arrays: bool) -> str:
+    items = value if _truthy(value) else []
+    if not isinstance(items, list):
+        items = [items]
+    if json_arrays:
+        return _escape(json.dumps(items, ensure_ascii=False))
+    return _escape('{' + ','.join([_array_element(item) for item in items]) + '}')
+
+def _boolean(value) -> str:
+    """`value || false`, as PostgreSQL reads the value that reaches it"""
+    if not _truthy(value):
+        return 'f'
+    if isinstance(value, str):
+        return 't' if value.strip().lower() in PG_TRUE else 'f'
+    return 't'
+
+def _encoder(column: str, json_arrays: bool) -> Callable[[Dict], str]:
+    """Function turning a university into the COPY field of one column"""
+    if column in TEXT_COLUMNS:
+        def text(u: Dict, search=NEEDS_ESCAPE.search) -> str:
+            # Most values are plain strings with nothing to escape
+            value = u.get(column)
+            if type(value) is str and search(value) is None:
+                return value
+            return _text(value)
+        return text
+    if column in INT_COLUMNS:
+        def integer(u: Dict) -> str:
+            value = u.get(column)
+            if type(value) is int and value:
+                return str(value)
+            return _number(js_parse_int(value))
+        return integer
+    if column in FLOAT_COLUMNS:
+        return lambda u: _number(js_parse_float(u.get(column)))
+    if column in ARRAY_COLUMNS:
+        return lambda u: _array(u.get(column), json_arrays)
+    if column in BOOLEAN_COLUMNS:
+        return lambda u: _boolean(u.get(column))
+    if column == 'letters_of_recommendation_required':
+        # parseInt(...) with 0 instead of null
+        return lambda u: _number(js_parse_int(u.get(column))) if _truthy(u.get(column)) else '0'
+    if column == 'status':
+        return lambda u: 'active'
+    if column in ('featured', 'verified'):
+        return lambda u: 'f'
+    if column == 'created_by':
+        return lambda u: _text(u.get('uid'))
+    # id, slug and timestamps are per-row placeholders filled by copy_row
+    return None
+
+def copy_row(university: Dict, row_id: str, slug: str, created_at: str, json_arrays: bool = False) -> str:
+    """One COPY text line with the values createUniversity would insert"""
+    encoders = _ENCODERS[json_arrays]
+    fields = [encoder(university) if encoder else None for encoder in encoders]
+    fields[_ID] = row_id
+    fields[_SLUG] = _escape(slug)
+    fields[_CREATED_AT] = fields[_UPDATED_AT] = created_at
+    return '\t'.join(fields) + '\n'
+
+_ENCODERS = {json_arrays: [_encoder(column, json_arrays) for column in COLUMNS] for json_arrays in (False, True)}
+_ID, _SLUG, _CREATED_AT, _UPDATED_AT = (COLUMNS.index(c) for c in ('id', 'slug', 'created_at', 'updated_at'))
+
+def export_copy(universities: List[Dict], output: str, json_arrays: bool = False,
+                taken_slugs: Iterable[str] = ()) -> int:
+    """Write universities as COPY text; returns the number of rows"""
+    slugs = allocate_slugs((u.get('name') for u in universities), taken_slugs)
+    created_at = datetime.now(timezone.utc).isoformat()
+    with open(output, 'w', encoding='utf-8', newline='\n') as f:
+        for university, slug in zip(universities, slugs):
+            f.write(copy_row(university, str(uuid.uuid4()), slug, created_at, json_arrays))
+    return len(universities)
+
+def copy_statement() -> str:
+    return f"COPY universities ({', '.join(COLUMNS)}) FROM STDIN"
+
+def load_copy(path: str, dsn: str, truncate: bool = False) -> float:
+    """Stream a COPY file into the universities table in one transaction; returns seconds taken.
+
+    The facet trigger is disabled during the load and the summary rebuilt
+    once afterwards, since TRUNCATE does not fire row triggers.
+    """
+    statements = []
+    if truncate:
+        statements.append("TRUNCATE universities")
+    statements.append("""DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_university_facets_trigger') THEN
+    ALTER TABLE universities DISABLE TRIGGER update_university_facets_trigger;
+  END IF;
+END $$""")
+    statements.append(copy_statement())
+    statements.append("""DO $$ BEGIN
+  IF EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = 'update_university_facets_trigger') THEN
+    ALTER TABLE universities ENABLE TRIGGER update_university_facets_trigger;
+    PERFORM refresh_university_facets();
+  END IF;
+END $$""")
+    statements.append("ANALYZE universities")
+
+    command = ['psql', dsn, '--no-psqlrc', '--quiet', '--single-transaction', '-v', 'ON_ERROR_STOP=1']
+    for statement in statements:
+        command += ['-c', statement]
+
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        # COPY ... FROM STDIN in a -c command reads psql's own stdin
+        result = subprocess.run(command, stdin=f, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"psql exited with {result.returncode}")
+    return time.perf_counter() - start
+
+def main():
+    """Export universities as COPY text or load a COPY file into PostgreSQL"""
+    parser = argparse.ArgumentParser(description="Bulk-load universities with PostgreSQL COPY")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="write a COPY text file for the universities table")
+    export.add_argument('--input', default='universities_fixed.json')
+    export.add_argument('--output', default='universities.copy')
+    export.add_argument('--json-arrays', action='store_true',
+                        help="encode list columns as JSON (jsonb columns) instead of text[] literals")
+    export.add_argument('--taken-slugs', metavar='FILE',
+                        help="file with one slug per line already in the table, for loads without --truncate")
+
+    load = commands.add_parser('load', help="stream a COPY file into PostgreSQL with psql")
+    load.add_argument('--input', default='universities.copy')
+    load.add_argument('--dsn', default=os.environ.get('DATABASE_URL', ''),
+                      help="connection string (default: $DATABASE_URL)")
+    load.add_argument('--truncate', action='store_true', help="empty the table first (full reload)")
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        with open(args.input, 'r', encoding='utf-8') as f:
+            universities = json.load(f)
+        taken = []
+        if args.taken_slugs:
+            with open(args.taken_slugs, 'r', encoding='utf-8') as f:
+                taken = [line.strip() for line in f if line.strip()]
+        start = time.perf_counter()
+        rows = export_copy(universities, args.output, json_arrays=args.json_arrays, taken_slugs=taken)
+        logger.info(f"✅ {rows} universities written to {args.output} in {time.perf_counter() - start:.2f}s")
+        logger.info(f"   load with: ./export_copy.py load --input {args.output} --dsn <postgres-url> [--truncate]")
+        return 0
+
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL is required")
+    try:
+        elapsed = load_copy(args.input, args.dsn, truncate=args.truncate)
+    except FileNotFoundError as e:
+        logger.error(f"❌ {e.filename} not found")
+        return 1
+    except RuntimeError as e:
+        logger.error(f"❌ Load failed, nothing was changed: {e}")
+        return 1
+    logger.info(f"✅ Loaded {args.input} into universities in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
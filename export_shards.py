@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Static University Read Shards
+Precomputes the common university reads (the ranked index, per-country
+lists, ranking buckets and filter facets) from universities_fixed.json as
+compact JSON files with gzip and, when the brotli package is installed,
+brotli variants. File names carry a content hash so a CDN can cache them
+forever; manifest.json maps each shard to its current file and is the only
+file that needs a short cache lifetime. The API then only serves the long
+tail of filtered and searched reads.
+
+    ./export_shards.py --input universities_fixed.json --output-dir shards
+    ./export_shards.py --bucket-size 50 --prune
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from export_copy import allocate_slugs
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Enough of a university for listing cards; the full record is in the country and ranking shards
+SUMMARY_FIELDS = ('slug', 'name', 'country', 'city', 'type', 'region', 'ranking', 'tuition_fee',
+                  'acceptance_rate', 'logo')
+# Same facets as getUniversityFacets
+FACETS = ('country', 'type', 'campus_type', 'region')
+# Payload fields that are not part of a university as the API returns it
+PRIVATE_FIELDS = {'uid'}
+
+HASH_LENGTH = 12
+MANIFEST_FILE = 'manifest.json'
+
+def encode(payload) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+def load_brotli(enabled: bool) -> Optional[Callable[[bytes], bytes]]:
+    """brotli.compress when wanted and installed; brotli is optional, gzip is always written"""
+    if not enabled:
+        return None
+    try:
+        import brotli
+    except ImportError:
+        logger.warning("⚠️ brotli is not installed (pip install brotli), writing gzip shards only")
+        return None
+    return lambda data: brotli.compress(data, quality=11)
+
+def _ranking_key(record: Dict) -> tuple:
+    # Ranked universities first, as ORDER BY ranking puts NULLs last
+    return (record.get('ranking') is None, record.get('ranking') or 0, record.get('name') or '')
+
+def prepare(universities: List[Dict]) -> List[Dict]:
+    """Records as the API returns them (with the slug createUniversity would assign), best ranked first"""
+    slugs = allocate_slugs(u.get('name') or '' for u in universities)
+    records = []
+    for university, slug in zip(universities, slugs):
+        record = {key: value for key, value in university.items() if key not in PRIVATE_FIELDS}
+        record['slug'] = slug
+        records.append(record)
+    records.sort(key=_ranking_key)
+    return records
+
+def summarize(record: Dict) -> Dict:
+    return {field: record.get(field) for field in SUMMARY_FIELDS}
+
+def ranking_bucket(ranking, bucket_size: int) -> str:
+    if not isinstance(ranking, int) or ranking < 1:
+        return 'unranked'
+    start = (ranking - 1) // bucket_size * bucket_size + 1
+    return f"{start}-{start + bucket_size - 1}"
+
+def country_shards(records: List[Dict]) -> Dict[str, str]:
+    """Shard name per country value; spellings such as "Hong Kong SAR" and "Hong Kong (SAR)" get distinct slugs"""
+    countries = sorted({r['country'] for r in records if r.get('country')})
+    return {country: f"country/{slug}" for country, slug in zip(countries, allocate_slugs(countries))}
+
+def build_shards(records: List[Dict], bucket_size: int) -> Iterable[Tuple[str, Dict]]:
+    """(shard name, payload) for every shard; records are ordered by ranking"""
+    yield 'index', {'total': len(records), 'universities': [summarize(r) for r in records]}
+
+    countries: Dict[str, List[Dict]] = {}
+    buckets: Dict[str, List[Dict]] = {}
+    for record in records:
+        if record.get('country'):
+            countries.setdefault(record['country'], []).append(record)
+        buckets.setdefault(ranking_bucket(record.get('ranking'), bucket_size), []).append(record)
+
+    # getUniversitiesByCountry matches the exact value and orders by name
+    for country, shard in country_shards(records).items():
+        members = countries[country]
+        yield shard, {
+            'country': country,
+            'universities': sorted(members, key=lambda r: r.get('name') or ''),
+        }
+    for bucket, members in buckets.items():
+        yield f"ranking/{bucket}", {'bucket': bucket, 'universities': members}
+
+    # Same shape as getUniversityFacets: most common value first
+    facets = {}
+    for facet in FACETS:
+        counts = Counter(r.get(facet) for r in records if r.get(facet))
+        facets[facet] = [{'value': value, 'count': count}
+                         for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+    yield 'facets', {'facets': facets}
+
+def write_once(path: str, data: bytes) -> bool:
+    """Write a content-addressed file unless it is already there; returns True if written"""
+    if os.path.exists(path):
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+def export_shards(records: List[Dict], output_dir: str, bucket_size: int = 100, gzip_level: int = 9,
+                  use_brotli: bool = True) -> Dict:
+    """Write every shard and its compressed variants, then the manifest; returns the manifest"""
+    compress_brotli = load_brotli(use_brotli)
+    manifest = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'total': len(records),
+        'encodings': ['gzip', 'br'] if compress_brotli else ['gzip'],
+        # The frontend looks up a country's shard here, then the file under shards
+        'countries': country_shards(records),
+        'shards': {},
+    }
+    written = 0
+
+    for name, payload in build_shards(records, bucket_size):
+        with profile_stage('encode'):
+            data = encode(payload)
+            digest = content_hash(data)
+        file_name = f"{name}.{digest}.json"
+        path = os.path.join(output_dir, file_name)
+        entry = {
+            'file': file_name,
+            'hash': digest,
+            'count': len(payload['universities']) if 'universities' in payload else None,
+            'bytes': len(data),
+        }
+
+        # Unchanged shards keep their names, so they are neither compressed nor written again
+        if not os.path.exists(f"{path}.gz"):
+            with profile_stage('gzip'):
+                # mtime=0 keeps the gzip bytes a function of the content alone
+                gzipped = gzip.compress(data, compresslevel=gzip_level, mtime=0)
+            with profile_stage('write'):
+                write_once(f"{path}.gz", gzipped)
+        if compress_brotli and not os.path.exists(f"{path}.br"):
+            with profile_stage('brotli'):
+                brotlied = compress_brotli(data)
+            with profile_stage('write'):
+                write_once(f"{path}.br", brotlied)
+        with profile_stage('write'):
+            # Plain file last: its presence means the variants exist
+            if write_once(path, data):
+                written += 1
+        entry['gzip_bytes'] = os.path.getsize(f"{path}.gz")
+        if compress_brotli:
+            entry['br_bytes'] = os.path.getsize(f"{path}.br")
+        manifest['shards'][name] = entry
+
+    with profile_stage('write'):
+        os.makedirs(output_dir, exist_ok=True)
+        tmp_path = os.path.join(output_dir, f"{MANIFEST_FILE}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, os.path.join(output_dir, MANIFEST_FILE))
+
+    logger.info(f"✅ {len(manifest['shards'])} shards in {output_dir} ({written} new or changed)")
+    return manifest
+
+def prune(output_dir: str, manifest: Dict) -> int:
+    """Delete shard files the manifest no longer references"""
+    current = set()
+    for entry in manifest['shards'].values():
+        current.update({entry['file'], f"{entry['file']}.gz", f"{entry['file']}.br"})
+    removed = 0
+    for root, _, files in os.walk(output_dir):
+        for file_name in files:
+            relative = os.path.relpath(os.path.join(root, file_name), output_dir).replace(os.sep, '/')
+            if relative != MANIFEST_FILE and relative not in current:
+                os.remove(os.path.join(root, file_name))
+                removed += 1
+    if removed:
+        logger.info(f"🧹 Removed {removed} stale shard files")
+    return removed
+
+def report(manifest: Dict):
+    shards = manifest['shards'].values()
+    plain = sum(entry['bytes'] for entry in shards)
+    gzipped = sum(entry['gzip_bytes'] for entry in shards)
+    logger.info(f"📦 {plain:,} bytes of JSON, {gzipped:,} gzipped ({gzipped / plain:.0%})" if plain else
+                "📦 No shards written")
+    if 'br' in manifest['encodings'] and plain:
+        brotlied = sum(entry.get('br_bytes', 0) for entry in shards)
+        logger.info(f"📦 {brotlied:,} bytes with brotli ({brotlied / plain:.0%})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute static, compressed university read shards")
+    parser.add_argument('--input', default='universities_fixed.json')
+    parser.add_argument('--output-dir', default='shards')
+    parser.add_argument('--bucket-size', type=int, default=100, help="universities per ranking shard")
+    parser.add_argument('--gzip-level', type=int, default=9)
+    parser.add_argument('--no-brotli', action='store_true', help="write gzip variants only")
+    parser.add_argument('--prune', action='store_true', help="delete shard files no longer in the manifest")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+
+    if args.bucket_size < 1:
+        logger.error("❌ --bucket-size must be at least 1")
+        return 1
+
+    try:
+        with profile_stage('read'):
+            with open(args.input, 'r', encoding='utf-8') as f:
+                universities = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"❌ Could not read {args.input}: {e}")
+        return 1
+
+    start = time.perf_counter()
+    with profile_stage('prepare'):
+        records = prepare(universities)
+    manifest = export_shards(records, args.output_dir, args.bucket_size, args.gzip_level, not args.no_brotli)
+    if args.prune:
+        prune(args.output_dir, manifest)
+    report(manifest)
+    logger.info(f"⏱️ Exported {len(records)} universities in {time.perf_counter() - start:.2f}s")
+
+    profiler.finish()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Low-Overhead Logging for High-Volume Runs
+Uploaders log their per-record lines ("Processing i/N", "Uploading",
+"Successfully uploaded") through RECORD_LOG with %-style arguments. By
+default they reach the console exactly as before. With --fast-logging:
+
+- handlers run on a background QueueListener thread, so the hot path only
+  enqueues the unformatted LogRecord;
+- per-record lines leave the console and go to a JSON Lines detail file
+  (or nowhere with --log-detail ''), formatted on the listener thread;
+- the console gets one progress summary per interval with counts, rate
+  and ETA, so its cost is constant per interval instead of per record.
+
+    add_logging_arguments(parser)
+    configure_logging(args)
+    progress = track(len(universities), 'universities')
+    for university in universities:
+        RECORD_LOG.info("Uploading: %s", university['name'])
+        progress.advance('successful' if upload(university) else 'failed')
+    progress.finish()
+"""
+
+import argparse
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Per-record lines of every uploader; a child of the root logger, so it prints like any other logger by default
+RECORD_LOG = logging.getLogger('records')
+
+DEFAULT_DETAIL_FILE = 'upload_details.jsonl'
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues the record untouched.
+
+    The stock prepare() formats the message in the calling thread, which is
+    the cost being moved off the hot path; here getMessage() runs on the
+    listener thread. Callers pass immutable %-arguments, so this is safe
+    in-process.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record; 'event' is the message template, so lines group by kind"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'event': str(record.msg),
+            'message': record.getMessage(),
+        }
+        if isinstance(record.args, tuple) and record.args:
+            entry['args'] = [arg if isinstance(arg, (str, int, float, bool, type(None))) else str(arg)
+                             for arg in record.args]
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class FastLogging:
+    """Active --fast-logging setup: queue handlers in front, listeners behind"""
+
+    def __init__(self, detail_file: Optional[str], interval: float):
+        self.detail_file = detail_file
+        self.interval = interval
+        self.listeners: List[logging.handlers.QueueListener] = []
+
+    def install(self):
+        root = logging.getLogger()
+        if not root.handlers:
+            logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        console_handlers = list(root.handlers)
+        root.handlers = [self._queue_to(console_handlers)]
+
+        RECORD_LOG.propagate = False
+        if self.detail_file:
+            detail = logging.FileHandler(self.detail_file, mode='w', encoding='utf-8')
+            detail.setFormatter(JsonLinesFormatter())
+            RECORD_LOG.handlers = [self._queue_to([detail])]
+            RECORD_LOG.setLevel(logging.DEBUG)
+        else:
+            # isEnabledFor() is False, so per-record calls return before building a record
+            RECORD_LOG.setLevel(logging.CRITICAL + 1)
+        atexit.register(self.stop)
+
+    def _queue_to(self, handlers: List[logging.Handler]) -> logging.Handler:
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        listener.start()
+        self.listeners.append(listener)
+        return DeferredQueueHandler(records)
+
+    def stop(self):
+        """Flush and stop the listener threads; safe to call twice"""
+        while self.listeners:
+            listener = self.listeners.pop()
+            listener.stop()
+            for handler in listener.handlers:
+                handler.flush()
+
+# The configured setup, or None when logging synchronously to the console
+_ACTIVE: Optional[FastLogging] = None
+
+class Progress:
+    """Per-record outcome counts, summarized on the console at most once per interval.
+
+    advance() is a counter update and a clock read; the summary line (done,
+    percentage, rate, ETA, outcome counts) is only formatted when an
+    interval has passed. Without --fast-logging it only counts.
+    """
+
+    def __init__(self, total: int, label: str = 'records', interval: Optional[float] = None):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.done = 0
+        self.outcomes: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.next_report = self.started + interval if interval else float('inf')
+
+    def advance(self, outcome: str = 'done', count: int = 1):
+        with self.lock:
+            self.done += count
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + count
+            now = time.monotonic()
+            if now < self.next_report:
+                return
+            self.next_report = now + self.interval
+            line = self.summary(now)
+        logger.info(line)
+
+    def summary(self, now: Optional[float] = None) -> str:
+        elapsed = (now or time.monotonic()) - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        line = f"📈 {self.done}/{self.total} {self.label}"
+        if self.total:
+            line += f" ({self.done / self.total:.0%})"
+        line += f", {rate:.1f}/s"
+        if rate and self.done < self.total:
+            line += f", ETA {(self.total - self.done) / rate:.0f}s"
+        if self.outcomes:
+            line += " - " + ", ".join(f"{name}: {count}" for name, count in sorted(self.outcomes.items()))
+        return line
+
+    def finish(self):
+        """Log the final summary when summaries are enabled"""
+        if self.interval:
+            logger.info(self.summary())
+            if _ACTIVE and _ACTIVE.detail_file:
+                logger.info(f"📝 Per-record detail in {_ACTIVE.detail_file}")
+
+def track(total: int, label: str = 'records') -> Progress:
+    """Progress for a loop over total records, summarizing only under --fast-logging"""
+    return Progress(total, label, _ACTIVE.interval if _ACTIVE else None)
+
+def add_logging_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group('logging')
+    group.add_argument('--fast-logging', action='store_true',
+                       help="log through a background queue and replace per-record console lines "
+                            "with periodic progress summaries")
+    group.add_argument('--log-detail', default=DEFAULT_DETAIL_FILE,
+                       help="JSON Lines file for per-record lines under --fast-logging ('' to drop them)")
+    group.add_argument('--progress-interval', type=float, default=5.0,
+                       help="seconds between progress summaries under --fast-logging")
+
+def configure_logging(args: argparse.Namespace) -> Optional[FastLogging]:
+    """Switch to queued logging if --fast-logging was given; call after logging.basicConfig"""
+    global _ACTIVE
+    if not args.fast_logging or _ACTIVE:
+        return _ACTIVE
+    _ACTIVE = FastLogging(args.log_detail or None, max(args.progress_interval, 0.1))
+    _ACTIVE.install()
+    return _ACTIVE
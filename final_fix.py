@@ -4,10 +4,13 @@ Final Fix for University Data
 Fixes website URLs and GPA validation issues
 """
 
+import argparse
 import json
 import re
 import random
 
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 def is_valid_url(url):
     """Check if URL is valid"""
     if not url or url.strip() == "":
@@ -69,57 +72,71 @@ def fix_gpa_value(gpa_value):
     except:
         return round(random.uniform(2.5, 4.0), 1)
 
+def fix_university_fields(uni):
+    """Fix website, GPA and contact fields in place; returns the names of fixed fields"""
+    fixed_fields = []
+    
+    # Fix website field
+    if not is_valid_url(uni.get('website', '')):
+        uni['website'] = generate_website_url(uni['name'])
+        fixed_fields.append('website')
+    
+    # Fix min_gpa_required field
+    if 'min_gpa_required' in uni:
+        original_gpa = uni['min_gpa_required']
+        fixed_gpa = fix_gpa_value(original_gpa)
+        if original_gpa != fixed_gpa:
+            uni['min_gpa_required'] = fixed_gpa
+            fixed_fields.append('min_gpa_required')
+    
+    # Also check for any other problematic fields
+    # Fix contact_email if empty
+    if not uni.get('contact_email') or uni['contact_email'].strip() == '':
+        domain = uni['website'].replace('https://www.', '').replace('http://www.', '').split('/')[0]
+        uni['contact_email'] = f"admissions@{domain}"
+        fixed_fields.append('contact_email')
+    
+    # Fix contact_phone if empty
+    if not uni.get('contact_phone') or uni['contact_phone'].strip() == '':
+        uni['contact_phone'] = f"+1-{random.randint(100,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}"
+        fixed_fields.append('contact_phone')
+    
+    return fixed_fields
+
 def main():
+    parser = argparse.ArgumentParser(description="Fix website URLs and GPA values in universities_fixed.json")
+    add_profile_arguments(parser)
+    profiler = configure_profiler(parser.parse_args())
+
     print("🔧 Fixing final validation issues...")
     
     # Read the JSON file
-    with open('universities_fixed.json', 'r', encoding='utf-8') as f:
-        universities = json.load(f)
+    with profile_stage('read_json'):
+        with open('universities_fixed.json', 'r', encoding='utf-8') as f:
+            universities = json.load(f)
     
     fixed_count = 0
     website_fixes = 0
     gpa_fixes = 0
     
-    for i, uni in enumerate(universities):
-        needs_fix = False
-        
-        # Fix website field
-        if not is_valid_url(uni.get('website', '')):
-            uni['website'] = generate_website_url(uni['name'])
-            website_fixes += 1
-            needs_fix = True
-        
-        # Fix min_gpa_required field
-        if 'min_gpa_required' in uni:
-            original_gpa = uni['min_gpa_required']
-            fixed_gpa = fix_gpa_value(original_gpa)
-            if original_gpa != fixed_gpa:
-                uni['min_gpa_required'] = fixed_gpa
+    with profile_stage('fix_records'):
+        for i, uni in enumerate(universities):
+            fixed_fields = fix_university_fields(uni)
+            if 'website' in fixed_fields:
+                website_fixes += 1
+            if 'min_gpa_required' in fixed_fields:
                 gpa_fixes += 1
-                needs_fix = True
-        
-        # Also check for any other problematic fields
-        # Fix contact_email if empty
-        if not uni.get('contact_email') or uni['contact_email'].strip() == '':
-            domain = uni['website'].replace('https://www.', '').replace('http://www.', '').split('/')[0]
-            uni['contact_email'] = f"admissions@{domain}"
-            needs_fix = True
-        
-        # Fix contact_phone if empty
-        if not uni.get('contact_phone') or uni['contact_phone'].strip() == '':
-            uni['contact_phone'] = f"+1-{random.randint(100,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}"
-            needs_fix = True
-        
-        if needs_fix:
-            fixed_count += 1
-        
-        # Progress indicator
-        if (i + 1) % 100 == 0:
-            print(f"  Processed {i + 1}/{len(universities)} universities...")
+            if fixed_fields:
+                fixed_count += 1
+            
+            # Progress indicator
+            if (i + 1) % 100 == 0:
+                print(f"  Processed {i + 1}/{len(universities)} universities...")
     
     # Save the fixed JSON
-    with open('universities_fixed.json', 'w', encoding='utf-8') as f:
-        json.dump(universities, f, indent=2, ensure_ascii=False)
+    with profile_stage('write_json'):
+        with open('universities_fixed.json', 'w', encoding='utf-8') as f:
+            json.dump(universities, f, indent=2, ensure_ascii=False)
     
     print(f"✅ Fixed validation issues in {fixed_count} universities")
     print(f"   - Website fixes: {website_fixes}")
@@ -134,5 +151,7 @@ def main():
     print(f"  GPA Required: {sample['min_gpa_required']}")
     print(f"  Contact Email: {sample['contact_email']}")
 
+    profiler.finish()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
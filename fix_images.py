@@ -3,9 +3,12 @@
 Fix empty image and logo URLs in the university JSON file
 """
 
+import argparse
 import json
 import random
 
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 def generate_logo_url(university_name):
     """Generate a logo URL using university initials"""
     words = university_name.split()
@@ -19,51 +22,62 @@ def generate_image_url():
     image_id = random.randint(1, 100)
     return f"https://picsum.photos/800/600?random={image_id}"
 
+def fix_university_media(uni):
+    """Replace empty image, logo and gallery entries; returns True if anything changed"""
+    needs_fix = False
+    
+    # Fix empty image field
+    if not uni.get('image') or uni['image'].strip() == '' or uni['image'] == '{}':
+        uni['image'] = generate_image_url()
+        needs_fix = True
+    
+    # Fix empty logo field
+    if not uni.get('logo') or uni['logo'].strip() == '' or uni['logo'] == '{}':
+        uni['logo'] = generate_logo_url(uni['name'])
+        needs_fix = True
+    
+    # Fix gallery field if it contains empty objects
+    if 'gallery' in uni:
+        if isinstance(uni['gallery'], list):
+            # Fix any empty or invalid gallery items
+            fixed_gallery = []
+            for item in uni['gallery']:
+                if item and item.strip() != '' and item != '{}':
+                    fixed_gallery.append(item)
+                else:
+                    fixed_gallery.append(generate_image_url())
+                    needs_fix = True
+            uni['gallery'] = fixed_gallery
+        else:
+            # If gallery is not a list, create a new one
+            uni['gallery'] = [generate_image_url(), generate_image_url(), generate_image_url()]
+            needs_fix = True
+    
+    return needs_fix
+
 def main():
+    parser = argparse.ArgumentParser(description="Fix empty image and logo URLs in universities_fixed.json")
+    add_profile_arguments(parser)
+    profiler = configure_profiler(parser.parse_args())
+
     print("Fixing image and logo URLs...")
     
     # Read the JSON file
-    with open('universities_fixed.json', 'r', encoding='utf-8') as f:
-        universities = json.load(f)
+    with profile_stage('read_json'):
+        with open('universities_fixed.json', 'r', encoding='utf-8') as f:
+            universities = json.load(f)
     
     fixed_count = 0
     
-    for uni in universities:
-        needs_fix = False
-        
-        # Fix empty image field
-        if not uni.get('image') or uni['image'].strip() == '' or uni['image'] == '{}':
-            uni['image'] = generate_image_url()
-            needs_fix = True
-        
-        # Fix empty logo field
-        if not uni.get('logo') or uni['logo'].strip() == '' or uni['logo'] == '{}':
-            uni['logo'] = generate_logo_url(uni['name'])
-            needs_fix = True
-        
-        # Fix gallery field if it contains empty objects
-        if 'gallery' in uni:
-            if isinstance(uni['gallery'], list):
-                # Fix any empty or invalid gallery items
-                fixed_gallery = []
-                for item in uni['gallery']:
-                    if item and item.strip() != '' and item != '{}':
-                        fixed_gallery.append(item)
-                    else:
-                        fixed_gallery.append(generate_image_url())
-                        needs_fix = True
-                uni['gallery'] = fixed_gallery
-            else:
-                # If gallery is not a list, create a new one
-                uni['gallery'] = [generate_image_url(), generate_image_url(), generate_image_url()]
-                needs_fix = True
-        
-        if needs_fix:
-            fixed_count += 1
+    with profile_stage('fix_records'):
+        for uni in universities:
+            if fix_university_media(uni):
+                fixed_count += 1
     
     # Save the fixed JSON
-    with open('universities_fixed.json', 'w', encoding='utf-8') as f:
-        json.dump(universities, f, indent=2, ensure_ascii=False)
+    with profile_stage('write_json'):
+        with open('universities_fixed.json', 'w', encoding='utf-8') as f:
+            json.dump(universities, f, indent=2, ensure_ascii=False)
     
     print(f"✅ Fixed {fixed_count} universities")
     print(f"Total universities: {len(universities)}")
@@ -75,5 +89,7 @@ def main():
     print(f"  Logo: {sample['logo']}")
     print(f"  Gallery: {sample['gallery']}")
 
+    profiler.finish()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Synthetic University Dataset Generator
+Produces N seeded, schema-valid university records for scale testing the
+converters, fixers, uploaders and API. Values are drawn a column at a
+time with numpy in batches, every string pool is JSON-encoded once, and
+each batch is rendered through a single record template and streamed to
+a JSON array or NDJSON file, so a million records take seconds.
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Fixed, so a seed always produces the same dataset
+BATCH_SIZE = 50_000
+
+# (city, state, country, region)
+LOCATIONS = [
+    ('Boston', 'Massachusetts', 'United States', 'North America'),
+    ('Chicago', 'Illinois', 'United States', 'North America'),
+    ('Austin', 'Texas', 'United States', 'North America'),
+    ('Seattle', 'Washington', 'United States', 'North America'),
+    ('Denver', 'Colorado', 'United States', 'North America'),
+    ('Atlanta', 'Georgia', 'United States', 'North America'),
+    ('Phoenix', 'Arizona', 'United States', 'North America'),
+    ('Toronto', 'Ontario', 'Canada', 'North America'),
+    ('Vancouver', 'British Columbia', 'Canada', 'North America'),
+    ('Montreal', 'Quebec', 'Canada', 'North America'),
+    ('Mexico City', '', 'Mexico', 'Latin America'),
+    ('Sao Paulo', '', 'Brazil', 'Latin America'),
+    ('Buenos Aires', '', 'Argentina', 'Latin America'),
+    ('Santiago', '', 'Chile', 'Latin America'),
+    ('Bogota', '', 'Colombia', 'Latin America'),
+    ('Lima', '', 'Peru', 'Latin America'),
+    ('London', 'England', 'United Kingdom', 'Europe'),
+    ('Manchester', 'England', 'United Kingdom', 'Europe'),
+    ('Edinburgh', 'Scotland', 'United Kingdom', 'Europe'),
+    ('Dublin', '', 'Ireland', 'Europe'),
+    ('Paris', '', 'France', 'Europe'),
+    ('Lyon', '', 'France', 'Europe'),
+    ('Berlin', '', 'Germany', 'Europe'),
+    ('Munich', 'Bavaria', 'Germany', 'Europe'),
+    ('Hamburg', '', 'Germany', 'Europe'),
+    ('Amsterdam', '', 'Netherlands', 'Europe'),
+    ('Leuven', '', 'Belgium', 'Europe'),
+    ('Zurich', '', 'Switzerland', 'Europe'),
+    ('Vienna', '', 'Austria', 'Europe'),
+    ('Madrid', '', 'Spain', 'Europe'),
+    ('Barcelona', 'Catalonia', 'Spain', 'Europe'),
+    ('Milan', '', 'Italy', 'Europe'),
+    ('Rome', '', 'Italy', 'Europe'),
+    ('Lisbon', '', 'Portugal', 'Europe'),
+    ('Stockholm', '', 'Sweden', 'Europe'),
+    ('Oslo', '', 'Norway', 'Europe'),
+    ('Copenhagen', '', 'Denmark', 'Europe'),
+    ('Helsinki', '', 'Finland', 'Europe'),
+    ('Warsaw', '', 'Poland', 'Europe'),
+    ('Prague', '', 'Czech Republic', 'Europe'),
+    ('Istanbul', '', 'Turkey', 'Europe'),
+    ('Moscow', '', 'Russia', 'Europe'),
+    ('Cairo', '', 'Egypt', 'Africa'),
+    ('Nairobi', '', 'Kenya', 'Africa'),
+    ('Lagos', '', 'Nigeria', 'Africa'),
+    ('Cape Town', 'Western Cape', 'South Africa', 'Africa'),
+    ('Riyadh', '', 'Saudi Arabia', 'Middle East'),
+    ('Dubai', '', 'United Arab Emirates', 'Middle East'),
+    ('Tel Aviv', '', 'Israel', 'Middle East'),
+    ('Mumbai', 'Maharashtra', 'India', 'Asia'),
+    ('Delhi', '', 'India', 'Asia'),
+    ('Bangalore', 'Karnataka', 'India', 'Asia'),
+    ('Beijing', '', 'China', 'Asia'),
+    ('Shanghai', '', 'China', 'Asia'),
+    ('Hong Kong', '', 'Hong Kong', 'Asia'),
+    ('Tokyo', '', 'Japan', 'Asia'),
+    ('Osaka', '', 'Japan', 'Asia'),
+    ('Seoul', '', 'South Korea', 'Asia'),
+    ('Singapore', '', 'Singapore', 'Asia'),
+    ('Kuala Lumpur', '', 'Malaysia', 'Asia'),
+    ('Bangkok', '', 'Thailand', 'Asia'),
+    ('Jakarta', '', 'Indonesia', 'Asia'),
+    ('Sydney', 'New South Wales', 'Australia', 'Oceania'),
+    ('Melbourne', 'Victoria', 'Australia', 'Oceania'),
+    ('Auckland', '', 'New Zealand', 'Oceania'),
+]
+
+NAME_PATTERNS = [
+    '{q}University of {city}', '{q}{city} University', '{q}{city} Institute of Technology',
+    '{q}{city} State University', '{q}Technical University of {city}', '{q}{city} College',
+    '{q}{city} University of Science and Technology', '{q}{city} Medical University',
+    '{q}{city} School of Economics', '{q}Catholic University of {city}', '{q}{city} Polytechnic University',
+    '{q}{city} Metropolitan University',
+]
+QUALIFIERS = ['', 'National ', 'Royal ', 'International ', 'Central ', 'Northern ', 'Southern ',
+              'Eastern ', 'Western ', 'Free ', 'Open ']
+
+TYPES = ["Public", "Private", "Public Research", "Private Research"]
+CAMPUS_TYPES = ["Urban", "Suburban", "Rural"]
+PROGRAMS = ["Computer Science", "Engineering", "Business", "Medicine", "Law", "Economics", "Physics",
+            "Mathematics", "Biology", "Chemistry", "Psychology", "Architecture", "Education", "Nursing",
+            "Political Science", "History"]
+FACILITIES = ["Library", "Sports Complex", "Research Centers", "Student Housing", "Laboratories",
+              "Museum", "Hospital", "Innovation Hub", "Performing Arts Center"]
+REQUIREMENTS = ["Transcripts", "Letters of Recommendation", "Personal Statement", "CV",
+                "English Proficiency Test", "Portfolio", "Research Proposal"]
+DEADLINES_FALL = ['January 1st', 'January 15th', 'February 1st', 'March 1st', 'August 1st']
+DEADLINES_SPRING = ['October 1st', 'November 1st', 'December 1st']
+DEADLINES_SUMMER = ['March 1st', 'April 1st', 'May 1st']
+COLORS = ['FF6B6B', '4ECDC4', '45B7D1', 'FFA07A', '98D8C8', 'F7DC6F', 'BB8FCE']
+
+# Pre-drawn list values; records pick one by index
+LIST_VARIANTS = 64
+
+# Largest integer drawn for any field other than ranking
+MAX_LOOKUP = 120_000
+
+def _encode(value) -> str:
+    return json.dumps(value, ensure_ascii=False)
+
+def _inner(text: str) -> str:
+    """JSON-escaped text without the surrounding quotes"""
+    return _encode(text)[1:-1]
+
+def _array(values: List) -> np.ndarray:
+    """Object array of the values, indexable by a numpy array of positions"""
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+def _pool(values: List) -> np.ndarray:
+    """JSON fragments of the values, indexable by a numpy array of positions"""
+    return _array([_encode(v) for v in values])
+
+# Field order and JSON shape of a record; each %s takes one column value,
+# already JSON-escaped, in the order the columns are listed in _batch()
+LAYOUT = [
+    ('uid', '%s'),
+    ('name', '"%s"'),
+    ('description', '"%s is a %s university in %s, %s."'),
+    ('country', '"%s"'),
+    ('city', '"%s"'),
+    ('state', '%s'),
+    ('address', '"%s Campus, %s"'),
+    ('website', '"https://www.%s.edu"'),
+    ('contact_email', '"admissions@%s.edu"'),
+    ('contact_phone', '"+1-%s-%s-%s"'),
+    ('established_year', '%s'),
+    ('type', '%s'),
+    ('ranking', '%s'),
+    ('tuition_fee', '%s'),
+    ('application_fee', '%s'),
+    ('acceptance_rate', '%s'),
+    ('student_population', '%s'),
+    ('faculty_count', '%s'),
+    ('programs_offered', '%s'),
+    ('facilities', '%s'),
+    ('image', '"https://picsum.photos/800/600?random=%s"'),
+    ('logo', '"https://ui-avatars.com/api/?name=%s&size=200&background=%s&color=fff&bold=true"'),
+    ('gallery', '["https://picsum.photos/800/600?random=%s", "https://picsum.photos/800/600?random=%s", '
+                '"https://picsum.photos/800/600?random=%s"]'),
+    ('campus_size', '"%s acres"'),
+    ('campus_type', '%s'),
+    ('accreditation', '"Fully Accredited"'),
+    ('notable_alumni', '[]'),
+    ('keywords', '["%s", "university", "education"]'),
+    ('region', '%s'),
+    ('ranking_type', '"QS World University Rankings"'),
+    ('ranking_year', '%s'),
+    ('min_gpa_required', '%s'),
+    ('sat_score_required', '"%s"'),
+    ('act_score_required', '"%s"'),
+    ('ielts_score_required', '"%s"'),
+    ('toefl_score_required', '"%s"'),
+    ('gre_score_required', '"%s"'),
+    ('gmat_score_required', '"%s"'),
+    ('application_deadline_fall', '%s'),
+    ('application_deadline_spring', '%s'),
+    ('application_deadline_summer', '%s'),
+    ('tuition_fee_graduate', '%s'),
+    ('scholarship_available', '%s'),
+    ('financial_aid_available', '%s'),
+    ('application_requirements', '%s'),
+    ('admission_essay_required', '%s'),
+    ('letters_of_recommendation_required', '%s'),
+    ('interview_required', '%s'),
+    ('work_experience_required', '%s'),
+    ('portfolio_required', '%s'),
+]
+FIELDS = [field for field, _ in LAYOUT]
+
+class SyntheticGenerator:
+    def __init__(self, seed: int = 42, uid: str = "admin_uid_placeholder", ranking_year: int = 2026):
+        self.seed = seed
+        self.ranking_year = ranking_year
+        # Values shared by every record are written into the template itself
+        constants = {'uid': _encode(uid), 'ranking_year': str(ranking_year)}
+        self.template = '{' + ', '.join(
+            f'"{field}": ' + (constants[field].replace('%', '%%') if field in constants else fragment)
+            for field, fragment in LAYOUT) + '}'
+
+        # Every pattern × qualifier × location, each name used once before any repeats
+        self.base_names = []
+        for pattern in NAME_PATTERNS:
+            for qualifier in QUALIFIERS:
+                for location, (city, _, _, _) in enumerate(LOCATIONS):
+                    self.base_names.append((pattern.format(q=qualifier, city=city), location))
+        self.name_inner = [_inner(name) for name, _ in self.base_names]
+        self.slugs = [re.sub(r'[^a-z0-9]', '', name.lower().replace('university', 'uni'))[:40]
+                      for name, _ in self.base_names]
+        self.initials = _array([''.join(w[0] for w in name.split() if w[0].isupper())[:3]
+                                for name, _ in self.base_names])
+        self.keywords = _array([_inner(name.lower()) for name, _ in self.base_names])
+        self.location_of = np.array([location for _, location in self.base_names])
+
+        self.cities = _array([_inner(city) for city, _, _, _ in LOCATIONS])
+        self.countries = _array([_inner(country) for _, _, country, _ in LOCATIONS])
+        self.states = _pool([state for _, state, _, _ in LOCATIONS])
+        self.regions = _pool([region for _, _, _, region in LOCATIONS])
+
+        self.types = _pool(TYPES)
+        self.type_words = _array([_inner(t.lower()) for t in TYPES])
+        self.campus_types = _pool(CAMPUS_TYPES)
+        self.colors = _array(COLORS)
+        self.deadlines = (_pool(DEADLINES_FALL), _pool(DEADLINES_SPRING), _pool(DEADLINES_SUMMER))
+        self.booleans = _array(['false', 'true'])
+        # Text of every small integer and of tenths up to 100.0; looking a number
+        # up is several times faster than converting it
+        self.numbers = _array([str(i) for i in range(MAX_LOOKUP + 1)])
+        self.tenths = _array([str(i / 10) for i in range(1001)])
+
+        list_rng = np.random.default_rng(seed + 1)
+        self.programs = _pool([list(list_rng.choice(PROGRAMS, list_rng.integers(3, 9), replace=False))
+                               for _ in range(LIST_VARIANTS)])
+        self.facilities = _pool([list(list_rng.choice(FACILITIES, list_rng.integers(3, 7), replace=False))
+                                 for _ in range(LIST_VARIANTS)])
+        self.requirements = _pool([list(list_rng.choice(REQUIREMENTS, list_rng.integers(2, 5), replace=False))
+                                   for _ in range(LIST_VARIANTS)])
+
+    @property
+    def name_space(self) -> int:
+        return len(self.base_names)
+
+    def _ints(self, values: np.ndarray) -> List[str]:
+        return self.numbers[values].tolist()
+
+    def _tenths(self, values: np.ndarray) -> List[str]:
+        """Text of values rounded to one decimal"""
+        return self.tenths[np.rint(values * 10).astype(np.int64)].tolist()
+
+    def batches(self, count: int) -> Iterator[List[str]]:
+        """JSON texts of ``count`` records, BATCH_SIZE at a time"""
+        rng = np.random.default_rng(self.seed)
+        order = rng.permutation(self.name_space)
+        for start in range(0, count, BATCH_SIZE):
+            size = min(BATCH_SIZE, count - start)
+            yield self._batch(rng, order, start, size)
+
+    def _batch(self, rng: np.random.Generator, order: np.ndarray, start: int, size: int) -> List[str]:
+        index = np.arange(start, start + size)
+        combos = order[index % self.name_space]
+        copies = index // self.name_space
+        # Past the name space, names repeat with a campus number: "University of Lyon 2"
+        if copies.any():
+            suffixes = [f" {c + 1}" if c else "" for c in copies.tolist()]
+            names = [self.name_inner[k] + s for k, s in zip(combos.tolist(), suffixes)]
+            slugs = [self.slugs[k] + s.strip() for k, s in zip(combos.tolist(), suffixes)]
+        else:
+            names = [self.name_inner[k] for k in combos.tolist()]
+            slugs = [self.slugs[k] for k in combos.tolist()]
+        locations = self.location_of[combos]
+        cities = self.cities[locations].tolist()
+        countries = self.countries[locations].tolist()
+        types = rng.integers(0, len(TYPES), size)
+        population = np.clip(rng.lognormal(9.6, 0.7, size), 800, 120000).astype(np.int64)
+        images = rng.integers(1, 1001, (4, size))
+        bools = rng.integers(0, 2, (4, size))
+
+        columns = [
+            names,                                                                 # name
+            names, self.type_words[types].tolist(), cities, countries,             # description
+            countries,                                                             # country
+            cities,                                                                # city
+            self.states[locations].tolist(),                                       # state
+            names, cities,                                                         # address
+            slugs,                                                                 # website
+            slugs,                                                                 # contact_email
+            self._ints(rng.integers(100, 1000, size)), self._ints(rng.integers(100, 1000, size)),
+            self._ints(rng.integers(1000, 10000, size)),                           # contact_phone
+            self._ints(rng.integers(1800, 2011, size)),                            # established_year
+            self.types[types].tolist(),                                            # type
+            (index + 1).astype(str).tolist(),                                      # ranking
+            self._ints(rng.integers(2000, 80001, size)),                           # tuition_fee
+            self._ints(rng.integers(0, 201, size)),                                # application_fee
+            self._tenths(rng.uniform(4.0, 95.0, size)),                            # acceptance_rate
+            self._ints(population),                                                # student_population
+            self._ints(population // rng.integers(8, 25, size)),                   # faculty_count
+            self.programs[rng.integers(0, LIST_VARIANTS, size)].tolist(),          # programs_offered
+            self.facilities[rng.integers(0, LIST_VARIANTS, size)].tolist(),        # facilities
+            self._ints(images[0]),                                                 # image
+            self.initials[combos].tolist(),
+            self.colors[rng.integers(0, len(COLORS), size)].tolist(),              # logo
+            self._ints(images[1]), self._ints(images[2]), self._ints(images[3]),   # gallery
+            self._ints(rng.integers(20, 2001, size)),                              # campus_size
+            self.campus_types[rng.integers(0, len(CAMPUS_TYPES), size)].tolist(),  # campus_type
+            self.keywords[combos].tolist(),                                        # keywords
+            self.regions[locations].tolist(),                                      # region
+            self._tenths(rng.uniform(2.5, 4.0, size)),                             # min_gpa_required
+            self._ints(rng.integers(1000, 1601, size)),                            # sat_score_required
+            self._ints(rng.integers(20, 37, size)),                                # act_score_required
+            self._tenths(rng.integers(11, 17, size) / 2),                          # ielts_score_required
+            self._ints(rng.integers(70, 121, size)),                               # toefl_score_required
+            self._ints(rng.integers(290, 341, size)),                              # gre_score_required
+            self._ints(rng.integers(450, 801, size)),                              # gmat_score_required
+            self.deadlines[0][rng.integers(0, len(DEADLINES_FALL), size)].tolist(),
+            self.deadlines[1][rng.integers(0, len(DEADLINES_SPRING), size)].tolist(),
+            self.deadlines[2][rng.integers(0, len(DEADLINES_SUMMER), size)].tolist(),
+            self._ints(rng.integers(3000, 90001, size)),                           # tuition_fee_graduate
+            self.booleans[bools[0]].tolist(),                                      # scholarship_available
+            self.booleans[bools[1]].tolist(),                                      # financial_aid_available
+            self.requirements[rng.integers(0, LIST_VARIANTS, size)].tolist(),      # application_requirements
+            self.booleans[bools[2]].tolist(),                                      # admission_essay_required
+            self._ints(rng.integers(0, 4, size)),                                  # letters_of_recommendation_required
+            self.booleans[bools[3]].tolist(),                                      # interview_required
+            self.booleans[(rng.random(size) < 0.15).astype(np.int64)].tolist(),    # work_experience_required
+            self.booleans[(rng.random(size) < 0.1).astype(np.int64)].tolist(),     # portfolio_required
+        ]
+        template = self.template
+        return [template % row for row in zip(*columns)]
+
+    def records(self, count: int) -> Iterator[Dict]:
+        """Parsed records, for callers that need dicts rather than a file"""
+        for batch in self.batches(count):
+            for text in batch:
+                yield json.loads(text)
+
+def write_dataset(generator: SyntheticGenerator, count: int, output: str, ndjson: bool = False) -> int:
+    """Stream ``count`` records to a JSON array or NDJSON file; returns bytes written"""
+    written = 0
+    with open(output, 'w', encoding='utf-8') as f:
+        first = True
+        if not ndjson:
+            written += f.write('[\n')
+        for batch in generator.batches(count):
+            if ndjson:
+                written += f.write('\n'.join(batch) + '\n')
+            else:
+                written += f.write(('' if first else ',\n') + ',\n'.join(batch))
+            first = False
+        if not ndjson:
+            written += f.write('\n]\n')
+    return written
+
+def main():
+    """Generate a synthetic university dataset"""
+    parser = argparse.ArgumentParser(description="Generate seeded, schema-valid synthetic universities")
+    parser.add_argument('--count', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='universities_synthetic.json')
+    parser.add_argument('--ndjson', action='store_true', help="one record per line instead of a JSON array")
+    parser.add_argument('--ranking-year', type=int, default=2026)
+    parser.add_argument('--uid', default="admin_uid_placeholder")
+    parser.add_argument('--validate', type=int, default=1000, metavar='N',
+                        help="check the first N records against the API validation rules (0 to skip)")
+    args = parser.parse_args()
+
+    generator = SyntheticGenerator(seed=args.seed, uid=args.uid, ranking_year=args.ranking_year)
+    start = time.perf_counter()
+    written = write_dataset(generator, args.count, args.output, ndjson=args.ndjson)
+    elapsed = time.perf_counter() - start
+    logger.info(f"✅ {args.count} universities ({written / (1024 * 1024):.1f} MB) written to {args.output} "
+                f"in {elapsed:.2f}s ({args.count / elapsed if elapsed else 0:,.0f} records/s)")
+    if args.count > generator.name_space:
+        logger.info(f"   names beyond the first {generator.name_space} carry a campus number")
+
+    if args.validate:
+        from university_validation import validate_university
+
+        invalid = 0
+        for record in generator.records(min(args.validate, args.count)):
+            errors = validate_university(record)
+            if errors:
+                invalid += 1
+                if invalid <= 5:
+                    logger.error(f"❌ {record['name']}: {', '.join(e['msg'] for e in errors)}")
+        if invalid:
+            logger.error(f"❌ {invalid} of the first {min(args.validate, args.count)} records fail validation")
+            raise SystemExit(1)
+        logger.info(f"✅ First {min(args.validate, args.count)} records pass validation")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Idempotency Keys for API Creates
+Values for the Idempotency-Key header honoured by the create endpoints
+(src/middlewares/idempotency.js). A key is derived from a record's identity
+and its full content: resending the same payload after a timeout reuses the
+key and gets the original response instead of creating a duplicate, while an
+edited or repaired record gets a new key and is created normally.
+"""
+
+import hashlib
+import json
+from typing import Dict
+
+HEADER = 'Idempotency-Key'
+
+def idempotency_key(identity: str, payload: Dict) -> str:
+    """sha256 of the identity and the canonical JSON of the payload"""
+    content = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+    return hashlib.sha256(f"{identity}\n{content}".encode('utf-8')).hexdigest()
+
+def idempotency_headers(identity: str, payload: Dict) -> Dict[str, str]:
+    return {HEADER: idempotency_key(identity, payload)}
+
+def still_in_progress(response) -> bool:
+    """The API's 409 for a key whose first request is still running; retry after Retry-After"""
+    return response.status_code == 409 and 'Retry-After' in response.headers
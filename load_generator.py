@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Load Generator for the University Read Endpoints
+Derives a realistic query mix from universities_fixed.json and drives
+getAllUniversities, searchUniversities, getUniversitiesByCountry and
+getUniversityCountries at a target request rate with async keep-alive
+clients, reporting throughput and latency percentiles per endpoint.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode, urlparse
+
+import benchmark_store
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+SUITE = "read_load"
+
+DEFAULT_MIX = {'list': 40, 'search': 30, 'country': 20, 'countries': 10}
+ENDPOINTS = ('list', 'search', 'country', 'countries', 'facets')
+
+STOPWORDS = {'university', 'universidad', 'universite', 'universität', 'universita', 'college',
+             'institute', 'technology', 'national', 'state', 'the', 'and', 'of', 'de', 'for', 'del'}
+
+class QueryMix:
+    """Builds request paths whose parameters follow the real dataset"""
+
+    def __init__(self, universities: List[Dict], weights: Dict[str, int], seed: Optional[int] = None):
+        self.rng = random.Random(seed)
+        self.endpoints = [name for name, weight in weights.items() if weight > 0]
+        self.weights = [weights[name] for name in self.endpoints]
+
+        country_counts = Counter(u['country'] for u in universities if u.get('country'))
+        self.countries = list(country_counts)
+        self.country_weights = [country_counts[c] for c in self.countries]
+
+        # Search terms: distinctive name words, name prefixes and cities
+        words = Counter()
+        for u in universities:
+            for word in re.findall(r"[^\W\d_]{4,}", u.get('name', '')):
+                if word.lower() not in STOPWORDS:
+                    words[word] += 1
+        self.search_terms = [w for w, _ in words.most_common(500)]
+        self.search_terms += [u['name'][:12].strip() for u in universities[:200] if u.get('name')]
+        self.search_terms += list({u['city'] for u in universities if u.get('city') and len(u['city']) > 3})[:200]
+
+        tuitions = sorted(u['tuition_fee'] for u in universities if isinstance(u.get('tuition_fee'), (int, float)))
+        self.tuition_bounds = [tuitions[int(len(tuitions) * q)] for q in (0.25, 0.5, 0.75, 0.9)] if tuitions else [40000]
+        rankings = sorted(u['ranking'] for u in universities if isinstance(u.get('ranking'), (int, float)))
+        max_ranking = rankings[-1] if rankings else 1000
+        self.ranking_bounds = [b for b in (10, 50, 100, 200, 500) if b < max_ranking] + [int(max_ranking)]
+        self.types = [t for t, _ in Counter(u.get('type') for u in universities if u.get('type')).most_common(3)]
+
+    def country(self) -> str:
+        return self.rng.choices(self.countries, self.country_weights)[0]
+
+    def next_request(self) -> Tuple[str, str]:
+        """Return (endpoint name, path with query string)"""
+        endpoint = self.rng.choices(self.endpoints, self.weights)[0]
+        return endpoint, getattr(self, f"_{endpoint}")()
+
+    def _list(self) -> str:
+        params = {}
+        roll = self.rng.random()
+        if roll < 0.3:
+            params['limit'] = 1000  # the frontend default
+        else:
+            params['limit'] = self.rng.choice([12, 20, 50])
+            params['page'] = self.rng.choice([1, 1, 1, 2, 3, 5])
+        if self.rng.random() < 0.4:
+            params['country'] = self.country()
+        if self.rng.random() < 0.2:
+            params['qsRankingRange'] = self.rng.choice(self.ranking_bounds)
+        if self.rng.random() < 0.1 and self.types:
+            params['type'] = self.rng.choice(self.types)
+        if self.rng.random() < 0.15:
+            params['search'] = self.rng.choice(self.search_terms)
+        return f"/api/universities?{urlencode(params)}"
+
+    def _search(self) -> str:
+        params = {}
+        if self.rng.random() < 0.3:
+            params['country'] = self.country()
+        if self.rng.random() < 0.3:
+            params['minRanking'] = self.rng.choice(self.ranking_bounds)
+        if self.rng.random() < 0.3:
+            params['maxTuition'] = self.rng.choice(self.tuition_bounds)
+        if self.rng.random() < 0.5:
+            params['limit'] = self.rng.choice([10, 20, 50])
+        path = f"/api/universities/search/{quote(self.rng.choice(self.search_terms), safe='')}"
+        return f"{path}?{urlencode(params)}" if params else path
+
+    def _country(self) -> str:
+        return f"/api/universities/country/{quote(self.country(), safe='')}"
+
+    def _countries(self) -> str:
+        return "/api/universities/countries"
+
+    def _facets(self) -> str:
+        return "/api/universities/facets"
+
+class AsyncHttpClient:
+    """Minimal keep-alive HTTP/1.1 GET client on asyncio streams"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+            self.writer = None
+
+    async def get(self, path: str) -> Tuple[int, int]:
+        """Send a GET and return (status, body bytes)"""
+        try:
+            return await asyncio.wait_for(self._get(path), self.timeout)
+        except BaseException:
+            await self.close()  # the connection state is unknown now
+            raise
+
+    async def _get(self, path: str) -> Tuple[int, int]:
+        if self.writer is None:
+            await self._connect()
+        self.writer.write(
+            f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+            f"Accept: application/json\r\nConnection: keep-alive\r\n\r\n".encode('latin-1')
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            size = 0
+            while True:
+                chunk_size = int((await self.reader.readline()).split(b';')[0], 16)
+                if chunk_size == 0:
+                    await self.reader.readline()
+                    break
+                await self.reader.readexactly(chunk_size + 2)
+                size += chunk_size
+        else:
+            size = int(headers.get('content-length', 0))
+            await self.reader.readexactly(size)
+
+        if headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, size
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.errors = 0
+        self.statuses = Counter()
+        self.bytes = 0
+
+async def run_load(base_url: str, mix: QueryMix, rate: float, duration: float,
+                   connections: int, timeout: float) -> Tuple[Dict[str, EndpointStats], float]:
+    """Open-loop load: requests are scheduled at a fixed rate and latency is measured
+    from the scheduled send time, so a slow server cannot hide queueing delay."""
+    parsed = urlparse(base_url)
+    host, port = parsed.hostname, parsed.port or 80
+    stats: Dict[str, EndpointStats] = {name: EndpointStats() for name in mix.endpoints}
+    queue: asyncio.Queue = asyncio.Queue()
+    total = max(1, int(rate * duration))
+
+    async def worker():
+        client = AsyncHttpClient(host, port, timeout)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                endpoint, path, scheduled = item
+                endpoint_stats = stats[endpoint]
+                try:
+                    status, size = await client.get(path)
+                    endpoint_stats.statuses[status] += 1
+                    endpoint_stats.bytes += size
+                    if status >= 400:
+                        endpoint_stats.errors += 1
+                except (asyncio.TimeoutError, ConnectionError, OSError, ValueError, asyncio.IncompleteReadError):
+                    endpoint_stats.errors += 1
+                    endpoint_stats.statuses['error'] += 1
+                endpoint_stats.latencies_ms.append((time.perf_counter() - scheduled) * 1000.0)
+        finally:
+            await client.close()
+
+    workers = [asyncio.create_task(worker()) for _ in range(connections)]
+    start = time.perf_counter()
+    for i in range(total):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        endpoint, path = mix.next_request()
+        queue.put_nowait((endpoint, path, scheduled))
+    for _ in workers:
+        queue.put_nowait(None)
+    await asyncio.gather(*workers)
+    return stats, time.perf_counter() - start
+
+def summarize(stats: Dict[str, EndpointStats], elapsed: float) -> Dict[str, Dict]:
+    summary = {}
+    for endpoint, s in stats.items():
+        summary[endpoint] = {
+            'requests': len(s.latencies_ms),
+            'errors': s.errors,
+            'requests_per_second': round(len(s.latencies_ms) / elapsed, 2) if elapsed > 0 else 0.0,
+            'mean_response_bytes': int(s.bytes / max(1, len(s.latencies_ms) - s.errors)),
+            'statuses': {str(k): v for k, v in s.statuses.items()},
+            'latency_ms': benchmark_store.latency_summary(s.latencies_ms),
+        }
+    return summary
+
+def print_report(summary: Dict[str, Dict], elapsed: float, target_rate: float):
+    total = sum(s['requests'] for s in summary.values())
+    errors = sum(s['errors'] for s in summary.values())
+    logger.info("=" * 86)
+    logger.info(f"📊 LOAD SUMMARY: {total} requests in {elapsed:.1f}s "
+                f"({total / elapsed:.1f} req/s achieved, {target_rate:.1f} req/s target, {errors} errors)")
+    logger.info("=" * 86)
+    logger.info(f"{'endpoint':<11}{'reqs':>7}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p90 ms':>10}"
+                f"{'p99 ms':>10}{'max ms':>10}{'avg KB':>9}")
+    for endpoint, s in summary.items():
+        lat = s['latency_ms']
+        logger.info(f"{endpoint:<11}{s['requests']:>7}{s['errors']:>8}{s['requests_per_second']:>9.1f}"
+                    f"{lat['p50']:>10.1f}{lat['p90']:>10.1f}{lat['p99']:>10.1f}{lat['max']:>10.1f}"
+                    f"{s['mean_response_bytes'] / 1024:>9.1f}")
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    weights = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        if not hasattr(QueryMix, f"_{name.strip()}"):
+            raise ValueError(f"unknown endpoint '{name}' (expected one of {', '.join(ENDPOINTS)})")
+        weights[name.strip()] = int(weight)
+    return weights
+
+def main():
+    """Run the load generator"""
+    parser = argparse.ArgumentParser(description="Load test the university read endpoints")
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--dataset', default='universities_fixed.json')
+    parser.add_argument('--rate', type=float, default=50.0, help="target requests per second")
+    parser.add_argument('--duration', type=float, default=30.0, help="seconds to generate load")
+    parser.add_argument('--connections', type=int, default=16, help="concurrent keep-alive connections")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument('--mix', default=','.join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="endpoint weights, e.g. list=40,search=30,country=20,countries=10 (also: facets)")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--stub', action='store_true',
+                        help="start the local stub API preloaded with the dataset instead of using --base-url")
+    parser.add_argument('--store', action='store_true', help="append the results to benchmark_results/")
+    args = parser.parse_args()
+
+    with open(args.dataset, 'r', encoding='utf-8') as f:
+        universities = json.load(f)
+    mix = QueryMix(universities, parse_mix(args.mix), seed=args.seed)
+    logger.info(f"📚 Query mix from {len(universities)} universities: {len(mix.countries)} countries, "
+                f"{len(mix.search_terms)} search terms")
+
+    server = None
+    base_url = args.base_url
+    if args.stub:
+        from stub_api_server import start_stub_server
+        server = start_stub_server()
+        server.store.load(universities)
+        base_url = server.base_url
+
+    logger.info(f"🚀 Driving {base_url} at {args.rate} req/s for {args.duration}s "
+                f"with {args.connections} connections")
+    try:
+        stats, elapsed = asyncio.run(run_load(base_url, mix, args.rate, args.duration,
+                                              args.connections, args.timeout))
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
+    summary = summarize(stats, elapsed)
+    print_report(summary, elapsed, args.rate)
+    if args.store:
+        for endpoint, result in summary.items():
+            benchmark_store.append_result(SUITE, {
+                'endpoint': endpoint, 'base_url': base_url, 'target_rate': args.rate,
+                'mix': args.mix, **result
+            })
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Multi-year Ranking Merge
+Joins yearly QS ranking editions into one record per university with its
+ranking history. Each edition is loaded once and hash-joined on a
+normalized key (name tokens in order plus canonical country), so many
+years of 10k-row editions merge in a single pass. Records are flagged when
+they appear in or drop out of an edition; names in one edition that only
+differ in word order are reported, not merged.
+
+Inputs are workbooks or converted JSON files, given as YEAR=PATH or as a
+path whose file name contains the year ("2025 QS Ranking 1000.xlsx").
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+YEAR_PATTERN = re.compile(r'(?<!\d)(19|20)\d{2}(?!\d)')
+
+def parse_edition(spec: str) -> Tuple[int, str]:
+    """(year, path) from "2025=rankings.xlsx" or a path containing the year"""
+    year, sep, path = spec.partition('=')
+    if sep and year.isdigit():
+        return int(year), path
+    match = YEAR_PATTERN.search(spec.rsplit('/', 1)[-1])
+    if not match:
+        raise ValueError(f"No year in {spec!r}; pass it as YEAR={spec}")
+    return int(match.group()), spec
+
+def load_edition(year: int, path: str) -> List[Dict]:
+    """University records of one edition, with ranking_year set to its year"""
+    with profile_stage('load'):
+        if path.endswith('.json'):
+            with open(path, 'r', encoding='utf-8') as f:
+                universities = json.load(f)
+        else:
+            from university_uploader_fixed import UniversityUploaderFixed
+
+            universities = UniversityUploaderFixed(ranking_year=year).convert_excel(path)
+    for university in universities:
+        university['ranking_year'] = year
+    return universities
+
+class RankingMerger:
+    """Accumulates editions into merged records keyed by normalized name and country"""
+
+    def __init__(self):
+        from dedup_universities import dedup_key, identity_key
+        from gazetteer import canonical_country
+
+        self._dedup_key = dedup_key
+        self._identity_key = identity_key
+        self._canonical_country = canonical_country
+        self.countries: Dict[str, Optional[str]] = {}
+        # Most universities are listed in every edition, so keys are computed once per spelling
+        self.keys: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self.merged: Dict[str, Dict] = {}
+        self.years: List[int] = []
+        self.duplicates = 0
+        # Distinct names of one edition sharing their words in another order, for review
+        self.collisions: List[Dict] = []
+
+    def keys_of(self, university: Dict) -> Tuple[str, str]:
+        """(join key, token-set key) of a university"""
+        spelling = (university.get('name', ''), university.get('country') or '')
+        keys = self.keys.get(spelling)
+        if keys is None:
+            name, country = spelling
+            if country not in self.countries:
+                self.countries[country] = self._canonical_country(country)
+            country = self.countries[country]
+            keys = self.keys[spelling] = (self._identity_key(name, country), self._dedup_key(name, country))
+        return keys
+
+    def add_edition(self, year: int, universities: List[Dict]):
+        """Hash-join one edition onto the merged records"""
+        if self.years and year <= self.years[-1]:
+            raise ValueError(f"Editions must be added in increasing year order ({year} after {self.years[-1]})")
+
+        # Build side: one entry per university, keeping the better rank of repeats
+        edition: Dict[str, Dict] = {}
+        token_sets: Dict[str, str] = {}
+        for university in universities:
+            key, token_key = self.keys_of(university)
+            first = token_sets.setdefault(token_key, key)
+            if first != key:
+                self.collisions.append({'year': year, 'name': university.get('name'),
+                                        'matches': edition[first].get('name'),
+                                        'country': university.get('country')})
+            other = edition.get(key)
+            if other is not None:
+                self.duplicates += 1
+                if _rank(other) <= _rank(university):
+                    continue
+            edition[key] = university
+
+        # Probe side: merged records carry the latest edition's fields
+        for key, university in edition.items():
+            entry = {'year': year, 'ranking': university.get('ranking')}
+            record = self.merged.get(key)
+            if record is None:
+                self.merged[key] = dict(university, ranking_history=[entry])
+            else:
+                history = record['ranking_history']
+                record.clear()
+                record.update(university, ranking_history=history)
+                history.append(entry)
+        self.years.append(year)
+
+    def results(self) -> List[Dict]:
+        """Merged records with appearance flags, ordered by latest ranking"""
+        latest_year = self.years[-1] if self.years else None
+        index = {year: i for i, year in enumerate(self.years)}
+        records = []
+        for record in self.merged.values():
+            history = record['ranking_history']
+            present = [index[entry['year']] for entry in history]
+            # An edition where it is listed but was not in the previous one, and the reverse
+            record['appeared_in'] = [self.years[i] for n, i in enumerate(present)
+                                     if i > 0 and (n == 0 or present[n - 1] != i - 1)]
+            record['disappeared_in'] = [self.years[i + 1] for n, i in enumerate(present)
+                                        if i + 1 < len(self.years) and (n + 1 == len(present) or present[n + 1] != i + 1)]
+            record['first_year'] = history[0]['year']
+            record['last_year'] = history[-1]['year']
+            record['in_latest'] = record['last_year'] == latest_year
+            record['is_new'] = len(self.years) > 1 and record['first_year'] == latest_year
+            previous = history[-2]['ranking'] if len(history) > 1 else None
+            current = history[-1]['ranking']
+            # Positive when the university moved up
+            record['ranking_change'] = (previous - current
+                                        if isinstance(previous, int) and isinstance(current, int) else None)
+            records.append(record)
+        records.sort(key=lambda r: (not r['in_latest'], _rank(r)))
+        return records
+
+def _rank(university: Dict) -> float:
+    ranking = university.get('ranking')
+    return ranking if isinstance(ranking, (int, float)) else float('inf')
+
+def main():
+    """Merge yearly ranking editions into one file with ranking history"""
+    parser = argparse.ArgumentParser(description="Merge yearly QS ranking editions with ranking history")
+    parser.add_argument('editions', nargs='+', help="workbooks or converted JSON files, as YEAR=PATH or PATH with the year in its name")
+    parser.add_argument('--output', default='universities_merged.json')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+
+    try:
+        editions = sorted(parse_edition(spec) for spec in args.editions)
+    except ValueError as e:
+        parser.error(str(e))
+    years = [year for year, _ in editions]
+    if len(set(years)) != len(years):
+        parser.error(f"More than one edition per year: {years}")
+
+    start = time.perf_counter()
+    merger = RankingMerger()
+    for year, path in editions:
+        universities = load_edition(year, path)
+        with profile_stage('join'):
+            merger.add_edition(year, universities)
+        logger.info(f"📚 {year}: {len(universities)} universities from {path} ({len(merger.merged)} merged so far)")
+    with profile_stage('flag'):
+        records = merger.results()
+    elapsed = time.perf_counter() - start
+
+    with profile_stage('write_json'):
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+
+    latest = years[-1]
+    logger.info(f"✅ {len(records)} universities across {len(years)} editions written to {args.output} in {elapsed:.2f}s")
+    if merger.duplicates:
+        logger.info(f"   {merger.duplicates} repeated entries within an edition kept at their best rank")
+    if merger.collisions:
+        logger.warning(f"🔎 {len(merger.collisions)} names share their words with another name of the same "
+                       f"edition in a different order; kept apart, review them with dedup_universities.py")
+        for collision in merger.collisions[:10]:
+            logger.warning(f"   {collision['year']}: {collision['name']} ~ {collision['matches']} ({collision['country']})")
+    if len(years) > 1:
+        returning = sum(latest in r['appeared_in'] and not r['is_new'] for r in records)
+        logger.info(f"   new in {latest}: {sum(r['is_new'] for r in records)}, returning: {returning}, "
+                    f"dropped from {latest}: {sum(not r['in_latest'] for r in records)}")
+
+    profiler.finish()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+University Data Pipeline Runner
+Runs convert → fix_images → final_fix → upload as a small make-style DAG.
+Each stage declares its input and output files, the modules holding its
+code and the parameters it depends on; a stage whose fingerprint matches
+the one recorded after its last successful run (and whose outputs are
+untouched) is skipped. File hashes are cached by mtime and size, so a
+no-op run hashes nothing and never imports pandas or requests.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = '.pipeline_cache.json'
+EXCEL_FILE = "2026 QS Ranking 1000.xlsx"
+JSON_FILE = "universities_fixed.json"
+API_BASE_URL = "http://localhost:8000"
+
+class Stage:
+    def __init__(self, name: str, action: Callable[[argparse.Namespace], None], inputs: List[str],
+                 outputs: List[str], code: List[str], params: Optional[Callable[[argparse.Namespace], Dict]] = None):
+        self.name = name
+        self.action = action
+        self.inputs = inputs
+        self.outputs = outputs
+        self.code = code
+        # Options that change what the stage produces, e.g. the upload target
+        self.params = params or (lambda args: {})
+
+class FileHashes:
+    """SHA-256 of files, reused while a file's mtime and size are unchanged"""
+
+    def __init__(self, cached: Dict[str, Dict]):
+        self.entries = cached
+
+    def stat_key(self, path: str) -> Optional[List[int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    def get(self, path: str) -> Optional[str]:
+        stat = self.stat_key(path)
+        if stat is None:
+            return None
+        entry = self.entries.get(path)
+        if entry and entry['stat'] == stat:
+            return entry['sha256']
+
+        with profile_stage('hash_files'):
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+        self.entries[path] = {'stat': stat, 'sha256': digest.hexdigest()}
+        return self.entries[path]['sha256']
+
+class Pipeline:
+    def __init__(self, stages: List[Stage], cache_file: str = CACHE_FILE):
+        self.stages = stages
+        self.cache_file = cache_file
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cache = {}
+        self.hashes = FileHashes(cache.get('files', {}))
+        self.records: Dict[str, Dict] = cache.get('stages', {})
+
+    def save(self):
+        with open(self.cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.hashes.entries, 'stages': self.records}, f, indent=2)
+
+    def producers(self) -> Dict[str, Dict[str, Optional[Stage]]]:
+        """For each stage, the earlier stage that last wrote each of its inputs (None for source files)"""
+        last_writer: Dict[str, Stage] = {}
+        producers = {}
+        for stage in self.stages:
+            producers[stage.name] = {path: last_writer.get(path) for path in stage.inputs}
+            for path in stage.outputs:
+                last_writer[path] = stage
+        return producers
+
+    def latest_writers(self) -> Dict[str, str]:
+        """The stage that wrote each file most recently; only its recorded hash describes the file"""
+        latest: Dict[str, str] = {}
+        for stage in self.stages:
+            record = self.records.get(stage.name)
+            for path in stage.outputs if record else ():
+                if path not in latest or self.records[latest[path]]['finished_at'] <= record['finished_at']:
+                    latest[path] = stage.name
+        return latest
+
+    def fingerprint(self, stage: Stage, producers: Dict[str, Optional[Stage]], keys: Dict[str, str],
+                    args: argparse.Namespace) -> str:
+        """Hash of the stage's code, parameters, source inputs and upstream stage keys"""
+        digest = hashlib.sha256()
+        digest.update(inspect.getsource(stage.action).encode())
+        for path in stage.code:
+            digest.update(f"code:{path}:{self.hashes.get(path)}".encode())
+        digest.update(json.dumps(stage.params(args), sort_keys=True).encode())
+        for path, producer in producers.items():
+            # Generated inputs stand for their producer's key, since in-place
+            # stages overwrite them and their content says nothing stable
+            source = f"stage:{keys[producer.name]}" if producer else f"file:{self.hashes.get(path)}"
+            digest.update(f"input:{path}:{source}".encode())
+        return digest.hexdigest()
+
+    def outputs_intact(self, stage: Stage, record: Dict, latest_writers: Dict[str, str]) -> bool:
+        for path in stage.outputs:
+            if not os.path.exists(path):
+                return False
+            if latest_writers[path] == stage.name and self.hashes.get(path) != record['outputs'].get(path):
+                return False
+        return True
+
+    def run(self, args: argparse.Namespace, targets: Set[str], force: Set[str], dry_run: bool = False) -> Dict:
+        producers = self.producers()
+        latest_writers = self.latest_writers()
+
+        # A file edited since its last writer ran invalidates every stage writing it
+        tampered = set()
+        for stage in self.stages:
+            record = self.records.get(stage.name)
+            if record and not self.outputs_intact(stage, record, latest_writers):
+                tampered.update(stage.outputs)
+
+        keys: Dict[str, str] = {}
+        ran: Set[str] = set()
+        summary = {'ran': [], 'skipped': []}
+        for stage in self.stages:
+            keys[stage.name] = self.fingerprint(stage, producers[stage.name], keys, args)
+            if stage.name not in targets:
+                continue
+
+            record = self.records.get(stage.name)
+            reasons = []
+            if stage.name in force:
+                reasons.append('forced')
+            if not record:
+                reasons.append('never run')
+            elif record['key'] != keys[stage.name]:
+                reasons.append('code, parameters or inputs changed')
+            if tampered.intersection(stage.outputs):
+                reasons.append('outputs missing or modified')
+            # Upstream stages that ran in this run or, in an earlier one, after this stage
+            upstream = {p.name for p in producers[stage.name].values() if p and (
+                p.name in ran or record and p.name in self.records
+                and self.records[p.name]['finished_at'] > record['finished_at'])}
+            if upstream:
+                reasons.append(f"upstream re-ran ({', '.join(sorted(upstream))})")
+
+            if not reasons:
+                logger.info(f"⏭️  {stage.name}: up to date")
+                summary['skipped'].append(stage.name)
+                continue
+
+            logger.info(f"▶️  {stage.name}: {'; '.join(reasons)}")
+            ran.add(stage.name)
+            summary['ran'].append(stage.name)
+            if dry_run:
+                continue
+
+            start = time.perf_counter()
+            with profile_stage(stage.name):
+                stage.action(args)
+            self.records[stage.name] = {
+                'key': keys[stage.name],
+                'outputs': {path: self.hashes.get(path) for path in stage.outputs},
+                'finished_at': time.time(),
+            }
+            # Record after every stage so a later failure keeps the finished work
+            self.save()
+            logger.info(f"✅ {stage.name} finished in {time.perf_counter() - start:.2f}s")
+
+        if not dry_run:
+            self.save()
+        return summary
+
+def _transform_json(path: str, fix: Callable[[Dict], object]):
+    with open(path, 'r', encoding='utf-8') as f:
+        universities = json.load(f)
+    changed = sum(1 for uni in universities if fix(uni))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(universities, f, indent=2, ensure_ascii=False)
+    logger.info(f"   fixed {changed} of {len(universities)} universities")
+
+def convert_stage(args: argparse.Namespace):
+    from university_uploader_fixed import UniversityUploaderFixed
+
+    UniversityUploaderFixed().convert_excel_to_json(args.excel, args.json)
+
+def fix_images_stage(args: argparse.Namespace):
+    from fix_images import fix_university_media
+
+    _transform_json(args.json, fix_university_media)
+
+def final_fix_stage(args: argparse.Namespace):
+    from final_fix import fix_university_fields
+
+    _transform_json(args.json, fix_university_fields)
+
+def upload_stage(args: argparse.Namespace):
+    from smart_upload import SmartUploader
+
+    with open(args.json, 'r', encoding='utf-8') as f:
+        universities = json.load(f)
+    uploader = SmartUploader(api_base_url=args.api_base_url)
+    if not uploader.test_api_connection():
+        raise RuntimeError(f"API at {args.api_base_url} is not reachable")
+    results = uploader.smart_upload_all(universities, delay=args.delay)
+    if results['failed']:
+        # Not recorded as done, so the next run retries
+        raise RuntimeError(f"{results['failed']} uploads failed: {', '.join(results['errors'][:10])}")
+
+def build_stages(args: argparse.Namespace) -> List[Stage]:
+    return [
+        Stage('convert', convert_stage, inputs=[args.excel], outputs=[args.json],
+              code=['university_uploader_fixed.py']),
+        Stage('fix_images', fix_images_stage, inputs=[args.json], outputs=[args.json],
+              code=['fix_images.py']),
+        Stage('final_fix', final_fix_stage, inputs=[args.json], outputs=[args.json],
+              code=['final_fix.py']),
+        Stage('upload', upload_stage, inputs=[args.json], outputs=[],
+              code=['smart_upload.py', 'dedup_universities.py'],
+              params=lambda a: {'api_base_url': a.api_base_url}),
+    ]
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the university data pipeline, skipping up-to-date stages")
+    parser.add_argument('stages', nargs='*', help="stages to run (default: all but upload)")
+    parser.add_argument('--all', action='store_true', help="include the upload stage")
+    parser.add_argument('--force', nargs='*', metavar='STAGE',
+                        help="re-run these stages (all selected stages when none are named)")
+    parser.add_argument('--dry-run', action='store_true', help="show which stages would run")
+    parser.add_argument('--excel', default=EXCEL_FILE)
+    parser.add_argument('--json', default=JSON_FILE)
+    parser.add_argument('--api-base-url', default=API_BASE_URL)
+    parser.add_argument('--delay', type=float, default=0.3, help="seconds between uploads")
+    parser.add_argument('--cache-file', default=CACHE_FILE)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+
+    start = time.perf_counter()
+    stages = build_stages(args)
+    names = [stage.name for stage in stages]
+    targets = set(args.stages) if args.stages else {n for n in names if args.all or n != 'upload'}
+    unknown = targets - set(names) | set(args.force or []) - set(names)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))} (choose from {', '.join(names)})")
+    force = targets if args.force == [] else set(args.force or [])
+
+    try:
+        summary = Pipeline(stages, cache_file=args.cache_file).run(args, targets, force, dry_run=args.dry_run)
+    except Exception as e:
+        logger.error(f"❌ Pipeline failed: {e}")
+        return 1
+    finally:
+        profiler.finish()
+
+    logger.info(f"🏁 {len(summary['ran'])} stages {'would run' if args.dry_run else 'ran'}, "
+                f"{len(summary['skipped'])} up to date in {time.perf_counter() - start:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Stage-level Profiler for the Data Pipeline Scripts
+Records wall time, CPU time and peak memory per named stage, optionally
+dumping cProfile stats and tracemalloc snapshots, and prints a ranked
+stage breakdown. When profiling is off, stage() returns a shared no-op
+context manager so instrumented code pays almost nothing.
+"""
+
+import argparse
+import cProfile
+import os
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Dict, List, Optional
+
+_DISABLED = nullcontext()
+
+class StageStats:
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.peak_bytes = 0
+        # False while the stage has only run off the main thread, where memory is not measured
+        self.peak_tracked = False
+        self.depth = 0
+
+class _Stage:
+    """Context manager measuring one execution of a stage"""
+
+    def __init__(self, profiler: 'StageProfiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        self.depth = len(profiler.stack)
+        self.child_peak = 0
+        # cProfile allows one active profiler per process and the tracemalloc peak is
+        # process-wide, so both are only driven from the main thread's stages
+        self.on_main = threading.current_thread() is threading.main_thread()
+        if profiler.trace_memory and self.on_main:
+            current, peak = tracemalloc.get_traced_memory()
+            if profiler.stack:
+                # Resetting the peak below would hide the parent's peak so far
+                parent = profiler.stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+            self.start_memory = current
+            tracemalloc.reset_peak()
+        profiler.stack.append(self)
+        if self.depth == 0 and self.on_main and profiler.cprofile_dir:
+            self.cprofile = profiler.cprofiles.setdefault(self.name, cProfile.Profile())
+            self.cprofile.enable()
+        self.start_cpu = time.process_time()
+        self.start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.start_wall
+        cpu = time.process_time() - self.start_cpu
+        profiler = self.profiler
+        if self.depth == 0 and self.on_main and profiler.cprofile_dir:
+            self.cprofile.disable()
+        profiler.stack.pop()
+
+        peak_bytes = 0
+        if profiler.trace_memory and self.on_main:
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            peak_bytes = max(0, peak - self.start_memory)
+            if profiler.stack:
+                parent = profiler.stack[-1]
+                parent.child_peak = max(parent.child_peak, peak)
+
+        with profiler.lock:
+            stats = profiler.stats.get(self.name)
+            if stats is None:
+                stats = profiler.stats[self.name] = StageStats(self.name)
+                stats.depth = self.depth
+            stats.calls += 1
+            stats.wall += wall
+            stats.cpu += cpu
+            stats.peak_bytes = max(stats.peak_bytes, peak_bytes)
+            stats.peak_tracked = stats.peak_tracked or self.on_main
+
+        if self.depth == 0 and self.on_main and profiler.tracemalloc_dir:
+            suffix = f"-{stats.calls}" if stats.calls > 1 else ""
+            path = os.path.join(profiler.tracemalloc_dir, f"{_safe_name(self.name)}{suffix}.tracemalloc")
+            tracemalloc.take_snapshot().dump(path)
+        return False
+
+def _safe_name(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+
+class StageProfiler:
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.cprofile_dir: Optional[str] = None
+        self.tracemalloc_dir: Optional[str] = None
+        self.stats: Dict[str, StageStats] = {}
+        # Stages nest per thread; worker threads of the streaming pipeline time their own stages
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.cprofiles: Dict[str, cProfile.Profile] = {}
+
+    @property
+    def stack(self) -> List[_Stage]:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+        return self.local.stack
+
+    def enable(self, trace_memory: bool = True, cprofile_dir: Optional[str] = None,
+               tracemalloc_dir: Optional[str] = None):
+        """Start collecting stage measurements"""
+        self.enabled = True
+        self.trace_memory = trace_memory or bool(tracemalloc_dir)
+        self.cprofile_dir = cprofile_dir
+        self.tracemalloc_dir = tracemalloc_dir
+        for directory in (cprofile_dir, tracemalloc_dir):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name: str):
+        """Context manager timing a stage; a shared no-op when disabled"""
+        if not self.enabled:
+            return _DISABLED
+        return _Stage(self, name)
+
+    def finish(self):
+        """Write cProfile dumps and print the ranked breakdown"""
+        if not self.enabled:
+            return
+        for name, profile in self.cprofiles.items():
+            profile.dump_stats(os.path.join(self.cprofile_dir, f"{_safe_name(name)}.prof"))
+        self.print_report()
+        if self.cprofile_dir:
+            print(f"cProfile stats written to {self.cprofile_dir}/ (view with: python -m pstats <file>)")
+        if self.tracemalloc_dir:
+            print(f"tracemalloc snapshots written to {self.tracemalloc_dir}/")
+
+    def print_report(self):
+        top_level_wall = sum(s.wall for s in self.stats.values() if s.depth == 0) or 1e-9
+        ranked = sorted(self.stats.values(), key=lambda s: s.wall, reverse=True)
+        print("\n" + "=" * 78)
+        print("⏱️  STAGE PROFILE (ranked by wall time)")
+        print("=" * 78)
+        print(f"{'stage':<28}{'calls':>7}{'wall s':>10}{'% total':>9}{'cpu s':>10}{'peak MB':>10}")
+        for s in ranked:
+            name = ("  " * s.depth + s.name)[:27]
+            peak = f"{s.peak_bytes / (1024 * 1024):.1f}" if self.trace_memory and s.peak_tracked else "-"
+            print(f"{name:<28}{s.calls:>7}{s.wall:>10.3f}{s.wall / top_level_wall * 100:>8.1f}%"
+                  f"{s.cpu:>10.3f}{peak:>10}")
+        print("=" * 78)
+
+# Shared profiler used by all pipeline scripts
+PROFILER = StageProfiler()
+
+def profile_stage(name: str):
+    """Time a block as a named stage, e.g. ``with profile_stage('read_excel'):``"""
+    return PROFILER.stage(name)
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group('profiling')
+    group.add_argument('--profile', action='store_true',
+                       help="record wall time, CPU time and peak memory per stage")
+    group.add_argument('--profile-no-memory', action='store_true',
+                       help="skip tracemalloc peak memory tracking (lower overhead)")
+    group.add_argument('--profile-cprofile', metavar='DIR',
+                       help="also dump cProfile stats per top-level stage to DIR")
+    group.add_argument('--profile-tracemalloc', metavar='DIR',
+                       help="also dump tracemalloc snapshots per top-level stage to DIR")
+
+def configure_profiler(args: argparse.Namespace) -> StageProfiler:
+    """Enable the shared profiler if any profiling flag was given"""
+    if args.profile or args.profile_cprofile or args.profile_tracemalloc:
+        PROFILER.enable(
+            trace_memory=not args.profile_no_memory,
+            cprofile_dir=args.profile_cprofile,
+            tracemalloc_dir=args.profile_tracemalloc
+        )
+    return PROFILER
@@ -4,21 +4,36 @@ Smart University Uploader with Resume Capability
 Handles interruptions and can resume from where it left off
 """
 
+import argparse
 import json
 import requests
 import time
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Tuple
 import signal
 import sys
 
+from auto_repair import parse_validation_errors, repair_batch, write_report
+from dedup_universities import UploadKeys, identity_key
+from idempotency import idempotency_headers, still_in_progress
+from fast_logging import RECORD_LOG, add_logging_arguments, configure_logging, track
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class SmartUploader:
-    def __init__(self, api_base_url: str = "http://localhost:8000"):
+    def __init__(self, api_base_url: str = "http://localhost:8000", repair_rounds: int = 2,
+                 repair_report: Optional[str] = None):
         self.api_base_url = api_base_url
+        # Rounds of repairing and re-sending universities the API rejected (0 = off)
+        self.repair_rounds = repair_rounds
+        self.repair_report = repair_report
+        # Field errors of the last upload_university call that got a 400
+        self.last_errors: List[Dict] = []
+        # Record the API returned for the last upload_university call that created one
+        self.last_created: Optional[Dict] = None
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -35,56 +50,76 @@ class SmartUploader:
         logger.info(f"\n⚠️ Received signal {signum}. Stopping gracefully after current upload...")
         self.should_stop = True
     
-    def get_existing_universities(self) -> Set[str]:
-        """Get names of universities already in the database"""
+    def get_existing_universities(self, page_size: int = 1000) -> UploadKeys:
+        """Get identity keys (normalized name and country) of universities already in the database"""
         try:
-            response = self.session.get(f"{self.api_base_url}/api/universities?limit=1000")
-            if response.status_code == 200:
+            existing_keys = UploadKeys()
+            cursor = ''
+            # Keyset pages with only the name and country columns; servers without cursor
+            # support return everything up to the limit and no nextCursor
+            while cursor is not None:
+                with profile_stage('fetch_existing'):
+                    response = self.session.get(
+                        f"{self.api_base_url}/api/universities",
+                        params={'limit': page_size, 'fields': 'name,country', 'cursor': cursor, 'count': 'none'}
+                    )
+                if response.status_code != 200:
+                    logger.error(f"Failed to fetch existing universities: {response.status_code}")
+                    return UploadKeys()
                 data = response.json()
-                if 'universities' in data:
-                    existing_names = {uni['name'] for uni in data['universities']}
-                    logger.info(f"Found {len(existing_names)} existing universities in database")
-                    return existing_names
-                else:
+                if 'universities' not in data:
                     logger.warning("Unexpected API response format")
-                    return set()
-            else:
-                logger.error(f"Failed to fetch existing universities: {response.status_code}")
-                return set()
+                    return UploadKeys()
+                for uni in data['universities']:
+                    existing_keys.add(uni['name'], uni.get('country'), report=False)
+                cursor = data.get('pagination', {}).get('nextCursor')
+            logger.info(f"Found {len(existing_keys)} existing universities in database")
+            return existing_keys
         except Exception as e:
             logger.error(f"Error fetching existing universities: {e}")
-            return set()
+            return UploadKeys()
     
     def upload_university(self, university_data: Dict) -> bool:
         """Upload a single university to the API"""
+        self.last_errors = []
+        self.last_created = None
         try:
             url = f"{self.api_base_url}/api/universities"
             
-            response = self.session.post(url, json=university_data, timeout=30)
+            # Retries after a timeout reuse the key, so the API cannot create the university twice
+            headers = idempotency_headers(identity_key(university_data['name'], university_data.get('country')),
+                                          university_data)
+            with profile_stage('network'):
+                response = self.session.post(url, json=university_data, headers=headers, timeout=30)
             
             if response.status_code == 201:
-                logger.info(f"✅ Successfully uploaded: {university_data['name']}")
+                self.last_created = response.json().get('university')
+                RECORD_LOG.info("✅ Successfully uploaded: %s", university_data['name'])
                 return True
             elif response.status_code == 400:
                 error_msg = response.text
-                logger.error(f"❌ Validation error for {university_data['name']}: {error_msg}")
+                RECORD_LOG.error("❌ Validation error for %s: %s", university_data['name'], error_msg)
+                self.last_errors = parse_validation_errors(error_msg)
+                return False
+            elif still_in_progress(response):
+                RECORD_LOG.warning("⏳ Earlier attempt still in progress: %s", university_data['name'])
                 return False
             elif response.status_code == 409:
-                logger.warning(f"⚠️ University already exists: {university_data['name']}")
+                RECORD_LOG.warning("⚠️ University already exists: %s", university_data['name'])
                 return True  # Consider as success since it exists
             else:
-                logger.error(f"❌ Failed to upload {university_data['name']}: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                RECORD_LOG.error("❌ Failed to upload %s: %s", university_data['name'], response.status_code)
+                RECORD_LOG.error("Response: %s", response.text)
                 return False
                 
         except requests.exceptions.Timeout:
-            logger.error(f"❌ Timeout uploading {university_data['name']}")
+            RECORD_LOG.error("❌ Timeout uploading %s", university_data['name'])
             return False
         except requests.exceptions.ConnectionError:
-            logger.error(f"❌ Connection error uploading {university_data['name']}")
+            RECORD_LOG.error("❌ Connection error uploading %s", university_data['name'])
             return False
         except Exception as e:
-            logger.error(f"❌ Unexpected error uploading {university_data['name']}: {e}")
+            RECORD_LOG.error("❌ Unexpected error uploading %s: %s", university_data['name'], e)
             return False
     
     def smart_upload_all(self, universities: List[Dict], delay: float = 0.3) -> Dict:
@@ -92,40 +127,79 @@ class SmartUploader:
         logger.info(f"Starting smart upload of universities...")
         
         # Get existing universities to avoid duplicates
-        existing_names = self.get_existing_universities()
+        existing_keys = self.get_existing_universities()
         
-        # Filter out already uploaded universities
+        # Filter out already uploaded universities and repeats within this batch;
+        # keys ignore case, punctuation and parenthetical acronyms but keep word order
         to_upload = []
         skipped = 0
         
         for uni in universities:
-            if uni['name'] in existing_names:
-                skipped += 1
-            else:
+            if existing_keys.add(uni['name'], uni.get('country')):
                 to_upload.append(uni)
+            else:
+                skipped += 1
         
+        existing_keys.log_near_duplicates()
         logger.info(f"Universities to upload: {len(to_upload)}")
         logger.info(f"Already exist (skipping): {skipped}")
         
         if not to_upload:
             logger.info("🎉 All universities are already uploaded!")
-            return {'successful': skipped, 'failed': 0, 'skipped': skipped, 'errors': []}
+            return {'successful': skipped, 'failed': 0, 'skipped': skipped, 'errors': [],
+                    'repaired': 0, 'unrepairable': []}
         
         results = {
             'successful': skipped,  # Count existing ones as successful
             'failed': 0,
             'skipped': skipped,
-            'errors': []
+            'errors': [],
+            'repaired': 0,
+            'unrepairable': []
         }
         
         logger.info(f"Starting upload of {len(to_upload)} remaining universities...")
+        rejected = self.upload_batch(to_upload, delay, results)
         
+        # Repair what the server rejected and send it again in this run
+        for round_number in range(1, self.repair_rounds + 1):
+            if not rejected or self.should_stop:
+                break
+            # Repairs work on copies and may rewrite the name, so errors are
+            # cleared under the name each university failed with
+            rejected = [(dict(university), errors) for university, errors in rejected]
+            failed_names = {id(university): university['name'] for university, _ in rejected}
+            with profile_stage('repair'):
+                requeue, unrepairable = repair_batch(rejected)
+            results['unrepairable'].extend(unrepairable)
+            if not requeue:
+                break
+            logger.info(f"🔁 Repair round {round_number}: re-sending {len(requeue)} repaired universities")
+            for university in requeue:
+                results['failed'] -= 1
+                results['errors'].remove(failed_names[id(university)])
+            before = results['successful']
+            rejected = self.upload_batch(requeue, delay, results)
+            results['repaired'] += results['successful'] - before
+        else:
+            # Still rejected after the last round
+            results['unrepairable'].extend({'name': record['name'], 'repaired': [], 'errors': errors}
+                                           for record, errors in rejected)
+        
+        if results['unrepairable'] and self.repair_report:
+            write_report(self.repair_report, results['unrepairable'])
+        return results
+    
+    def upload_batch(self, to_upload: List[Dict], delay: float, results: Dict) -> List[Tuple[Dict, List[Dict]]]:
+        """Upload with retries, updating results; returns (university, field errors) of validation rejections"""
+        rejected = []
+        progress = track(len(to_upload), 'universities')
         for i, university in enumerate(to_upload, 1):
             if self.should_stop:
                 logger.info("❌ Upload interrupted by user")
                 break
             
-            logger.info(f"Processing {i}/{len(to_upload)}: {university['name']}")
+            RECORD_LOG.info("Processing %d/%d: %s", i, len(to_upload), university['name'])
             
             # Retry mechanism
             max_retries = 3
@@ -136,11 +210,13 @@ class SmartUploader:
                     break
                 
                 if retry > 0:
-                    logger.info(f"  Retry {retry}/{max_retries - 1}")
-                    time.sleep(1)  # Wait before retry
+                    RECORD_LOG.info("  Retry %d/%d", retry, max_retries - 1)
+                    with profile_stage('delay'):
+                        time.sleep(1)  # Wait before retry
                 
                 success = self.upload_university(university)
-                if success:
+                # The same payload would be rejected again, so validation errors are not retried
+                if success or self.last_errors:
                     break
             
             if success:
@@ -148,12 +224,17 @@ class SmartUploader:
             else:
                 results['failed'] += 1
                 results['errors'].append(university['name'])
+                if self.last_errors:
+                    rejected.append((university, self.last_errors))
+            progress.advance('successful' if success else 'failed')
             
             # Rate limiting - wait between requests
             if delay > 0 and not self.should_stop and i < len(to_upload):
-                time.sleep(delay)
+                with profile_stage('delay'):
+                    time.sleep(delay)
         
-        return results
+        progress.finish()
+        return rejected
     
     def test_api_connection(self) -> bool:
         """Test if the API is accessible"""
@@ -172,6 +253,17 @@ class SmartUploader:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Upload universities_fixed.json with resume support")
+    parser.add_argument('--repair-rounds', type=int, default=2,
+                        help="rounds of repairing and re-sending universities the API rejects (0 = off)")
+    parser.add_argument('--repair-report', default='unrepairable_universities.json',
+                        help="where universities that could not be repaired are listed")
+    add_profile_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+    configure_logging(args)
+    
     JSON_FILE = "universities_fixed.json"
     API_BASE_URL = "http://localhost:8000"
     DELAY_BETWEEN_UPLOADS = 0.3  # seconds
@@ -179,7 +271,8 @@ def main():
     logger.info("🚀 Starting Smart University Uploader...")
     
     # Initialize uploader
-    uploader = SmartUploader(api_base_url=API_BASE_URL)
+    uploader = SmartUploader(api_base_url=API_BASE_URL, repair_rounds=args.repair_rounds,
+                             repair_report=args.repair_report)
     
     # Test API connection
     if not uploader.test_api_connection():
@@ -187,8 +280,9 @@ def main():
     
     # Load universities from JSON
     try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            universities = json.load(f)
+        with profile_stage('read_json'):
+            with open(JSON_FILE, 'r', encoding='utf-8') as f:
+                universities = json.load(f)
         logger.info(f"📚 Loaded {len(universities)} universities from {JSON_FILE}")
     except FileNotFoundError:
         logger.error(f"❌ File {JSON_FILE} not found! Please run the converter first.")
@@ -199,7 +293,8 @@ def main():
     
     # Start smart upload
     try:
-        results = uploader.smart_upload_all(universities, delay=DELAY_BETWEEN_UPLOADS)
+        with profile_stage('upload'):
+            results = uploader.smart_upload_all(universities, delay=DELAY_BETWEEN_UPLOADS)
         
         # Summary
         logger.info("="*60)
@@ -209,6 +304,9 @@ def main():
         logger.info(f"Successfully uploaded: {results['successful']}")
         logger.info(f"Failed uploads: {results['failed']}")
         logger.info(f"Skipped (already exist): {results['skipped']}")
+        if results['repaired'] or results['unrepairable']:
+            logger.info(f"Repaired and uploaded: {results['repaired']}, "
+                        f"unrepairable: {len(results['unrepairable'])} (see {args.repair_report})")
         
         if results['successful'] > 0:
             success_rate = (results['successful']/len(universities)*100)
@@ -235,6 +333,8 @@ def main():
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}")
         raise
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,36 +1,165 @@
 const { supabase, supabaseAdmin } = require('../utils/supabase');
 const { v4: uuidv4 } = require('uuid');
+const { createCache } = require('../utils/ttlCache');
+const { responseSize } = require('../middlewares/responseCache');
+
+// Slug queries are chunked so the or() filter stays well within URL limits
+const SLUG_QUERY_CHUNK_SIZE = 50;
+const SLUG_CONFLICT_RETRIES = 3;
+
+// Default and largest page the search endpoint returns; callers page with
+// ?page= while pagination.hasMore is true
+const SEARCH_MAX_LIMIT = 1000;
+
+// Slugs claimed by in-flight writes in this process, so concurrent creates
+// never pick the same candidate before either row is inserted
+const pendingSlugs = new Set();
+
+// Cached responses of the public read routes, cleared by every successful write.
+// The TTL bounds staleness across server instances, which do not see each other's writes.
+const universityCache = createCache('universities', {
+  ttlMs: parseInt(process.env.UNIVERSITY_CACHE_TTL_MS) || 60 * 1000,
+  maxEntries: 1000,
+  maxBytes: 64 * 1024 * 1024,
+  sizeOf: responseSize
+});
+
+// Helper function to turn a university name into its base slug
+const slugify = (name) => name.toLowerCase()
+  .replace(/[^a-z0-9\s-]/g, '') // Remove special characters
+  .replace(/\s+/g, '-') // Replace spaces with hyphens
+  .replace(/-+/g, '-') // Replace multiple hyphens with single
+  .trim('-'); // Remove leading/trailing hyphens
+
+// First free slug in the sequence base, base-1, base-2, ...
+const nextFreeSlug = (baseSlug, taken) => {
+  if (!taken.has(baseSlug)) {
+    return baseSlug;
+  }
 
-// Helper function to generate unique slug
-const generateUniqueSlug = async (name) => {
-  const baseSlug = name.toLowerCase()
-    .replace(/[^a-z0-9\s-]/g, '') // Remove special characters
-    .replace(/\s+/g, '-') // Replace spaces with hyphens
-    .replace(/-+/g, '-') // Replace multiple hyphens with single
-    .trim('-'); // Remove leading/trailing hyphens
-
-  let slug = baseSlug;
   let counter = 1;
+  while (taken.has(`${baseSlug}-${counter}`)) {
+    counter++;
+  }
 
-  // Check if slug exists and generate unique one
-  while (true) {
-    const { data: existing } = await supabase()
+  return `${baseSlug}-${counter}`;
+};
+
+// Helper function to allocate unique slugs for a batch of names. The base
+// slug and its numeric-suffix variants are fetched with one query and the
+// next free suffix is computed in memory. Slugs only contain [a-z0-9-], so
+// the base needs no regex escaping.
+const allocateUniqueSlugs = async (names) => {
+  const baseSlugs = names.map(name => slugify(name) || 'university');
+  const uniqueBases = [...new Set(baseSlugs)];
+  const taken = new Set(pendingSlugs);
+
+  for (let i = 0; i < uniqueBases.length; i += SLUG_QUERY_CHUNK_SIZE) {
+    const chunk = uniqueBases.slice(i, i + SLUG_QUERY_CHUNK_SIZE);
+    const { data: existing, error } = await supabaseAdmin()
       .from('universities')
-      .select('id')
-      .eq('slug', slug)
-      .single();
+      .select('slug')
+      .or(chunk.map(baseSlug => `slug.eq.${baseSlug},slug.match.^${baseSlug}-[0-9]+$`).join(','));
 
-    if (!existing) {
-      break; // Slug is unique
+    if (error) {
+      throw error;
     }
 
-    slug = `${baseSlug}-${counter}`;
-    counter++;
+    existing.forEach(row => taken.add(row.slug));
   }
 
+  return baseSlugs.map(baseSlug => {
+    const slug = nextFreeSlug(baseSlug, taken);
+    taken.add(slug);
+    return slug;
+  });
+};
+
+// Helper function to generate unique slug
+const generateUniqueSlug = async (name) => {
+  const [slug] = await allocateUniqueSlugs([name]);
   return slug;
 };
 
+const isSlugConflict = (error) =>
+  Boolean(error && error.code === '23505' && /slug/.test(error.message || ''));
+
+// Run a write with a freshly allocated slug. The slug is reserved in-process
+// while the write runs; if another instance claims it first, the unique
+// index rejects the write and a new slug is allocated.
+const withUniqueSlug = async (name, write) => {
+  for (let attempt = 0; ; attempt++) {
+    const slug = await generateUniqueSlug(name);
+    pendingSlugs.add(slug);
+
+    try {
+      const result = await write(slug);
+      if (isSlugConflict(result.error) && attempt < SLUG_CONFLICT_RETRIES) {
+        continue;
+      }
+      return result;
+    } finally {
+      pendingSlugs.delete(slug);
+    }
+  }
+};
+
+// Columns that can be requested through ?fields= on the listing endpoint
+const UNIVERSITY_COLUMNS = new Set([
+  'id', 'name', 'description', 'country', 'city', 'state', 'address', 'website',
+  'contact_email', 'contact_phone', 'established_year', 'type', 'ranking',
+  'tuition_fee', 'application_fee', 'acceptance_rate', 'student_population',
+  'faculty_count', 'programs_offered', 'facilities', 'image', 'logo', 'gallery',
+  'campus_size', 'campus_type', 'accreditation', 'notable_alumni', 'slug',
+  'keywords', 'region', 'ranking_type', 'ranking_year', 'min_gpa_required',
+  'sat_score_required', 'act_score_required', 'ielts_score_required',
+  'toefl_score_required', 'gre_score_required', 'gmat_score_required',
+  'application_deadline_fall', 'application_deadline_spring',
+  'application_deadline_summer', 'tuition_fee_graduate', 'scholarship_available',
+  'financial_aid_available', 'application_requirements', 'admission_essay_required',
+  'letters_of_recommendation_required', 'interview_required',
+  'work_experience_required', 'portfolio_required', 'status', 'featured',
+  'verified', 'created_by', 'created_at', 'updated_at'
+]);
+
+const COUNT_MODES = new Set(['exact', 'planned', 'estimated']);
+
+// Filter facets maintained in the university_facets table
+const FACETS = ['country', 'type', 'campus_type', 'region'];
+
+// Helper function to build the select list for ?fields=a,b,c
+// The keyset columns (ranking, id) are always included
+const selectColumns = (fields) => {
+  if (!fields) {
+    return '*';
+  }
+
+  const requested = fields.split(',')
+    .map(field => field.trim())
+    .filter(field => UNIVERSITY_COLUMNS.has(field));
+
+  return [...new Set(['id', 'ranking', ...requested])].join(',');
+};
+
+// Keyset cursors encode the (ranking, id) of the last row of a page
+const UUID_PATTERN = /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+const encodeCursor = (university) =>
+  Buffer.from(JSON.stringify({ ranking: university.ranking, id: university.id })).toString('base64url');
+
+const decodeCursor = (cursor) => {
+  try {
+    const { ranking, id } = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    // Both values are interpolated into the PostgREST filter, so only a UUID and an integer pass
+    if (typeof id !== 'string' || !UUID_PATTERN.test(id) || (ranking !== null && !Number.isInteger(ranking))) {
+      return null;
+    }
+    return { ranking, id };
+  } catch (error) {
+    return null;
+  }
+};
+
 // Get all universities with pagination and filtering
 const getAllUniversities = async (req, res) => {
   try {
@@ -50,14 +179,28 @@ const getAllUniversities = async (req, res) => {
       campusType,
       studentPopulation,
       acceptanceRate,
-      showOnlyOpenApplications
+      showOnlyOpenApplications,
+      cursor,
+      fields,
+      count: countMode
     } = req.query;
     
     const offset = (page - 1) * limit;
+
+    // Keyset mode (?cursor=, empty for the first page) pages by (ranking, id)
+    // so the cost of a page does not grow with its depth
+    const keyset = cursor !== undefined;
+    const keysetCursor = keyset && cursor !== '' ? decodeCursor(cursor) : null;
+    if (keyset && cursor !== '' && !keysetCursor) {
+      return res.status(400).json({ error: 'Invalid cursor' });
+    }
+
+    // Offset mode keeps the exact count by default; keyset mode only counts on request
+    const count = COUNT_MODES.has(countMode) ? countMode : (keyset || countMode === 'none' ? null : 'exact');
     
     let query = supabase()
       .from('universities')
-      .select('*', { count: 'exact' });
+      .select(selectColumns(fields), count ? { count } : undefined);
       
     // Apply filters if provided
     if (country) {
@@ -129,12 +272,47 @@ const getAllUniversities = async (req, res) => {
       }
     }
     
+    // Each branch is served by a trigram or GIN index (database/university_search.sql)
     if (search) {
       query = query.or(`name.ilike.%${search}%,description.ilike.%${search}%,city.ilike.%${search}%,programs_offered.cs.{${search}}`);
     }
     
+    if (keyset) {
+      const pageSize = parseInt(limit);
+
+      if (keysetCursor && keysetCursor.ranking === null) {
+        query = query.is('ranking', null).gt('id', keysetCursor.id);
+      } else if (keysetCursor) {
+        const { ranking, id } = keysetCursor;
+        query = query.or(`ranking.gt.${ranking},and(ranking.eq.${ranking},id.gt.${id}),ranking.is.null`);
+      }
+
+      // Fetch one extra row to know whether another page follows
+      const { data: rows, error, count: totalItems } = await query
+        .order('ranking', { ascending: true, nullsFirst: false })
+        .order('id', { ascending: true })
+        .limit(pageSize + 1);
+
+      if (error) {
+        console.error('Error fetching universities:', error);
+        return res.status(500).json({ error: 'Failed to fetch universities' });
+      }
+
+      const universities = rows.slice(0, pageSize);
+      const hasMore = rows.length > pageSize;
+
+      return res.status(200).json({
+        universities,
+        pagination: {
+          nextCursor: hasMore ? encodeCursor(universities[universities.length - 1]) : null,
+          itemsPerPage: pageSize,
+          ...(count ? { totalItems } : {})
+        }
+      });
+    }
+    
     // Apply pagination
-    const { data: universities, error, count } = await query
+    const { data: universities, error, count: totalItems } = await query
       .order('ranking', { ascending: true, nullsLast: true })
       .range(offset, offset + limit - 1);
 
@@ -144,12 +322,12 @@ const getAllUniversities = async (req, res) => {
     }
 
     // Calculate total pages
-    const totalPages = Math.ceil(count / limit);
+    const totalPages = count ? Math.ceil(totalItems / limit) : null;
 
     res.status(200).json({
       universities,
       pagination: {
-        totalItems: count,
+        totalItems: count ? totalItems : null,
         totalPages,
         currentPage: parseInt(page),
         itemsPerPage: parseInt(limit)
@@ -247,11 +425,8 @@ const createUniversity = async (req, res) => {
     // The UID has already been verified by checkAdminByUid middleware
     const createdBy = uid;
 
-    // Generate unique slug
-    const slug = await generateUniqueSlug(name);
-
-    // Use admin client to bypass RLS for admin operations
-    const { data: university, error } = await supabaseAdmin()
+    // Use admin client to bypass RLS for admin operations, with a unique slug
+    const { data: university, error } = await withUniqueSlug(name, (slug) => supabaseAdmin()
       .from('universities')
       .insert([
         {
@@ -319,13 +494,15 @@ const createUniversity = async (req, res) => {
         }
       ])
       .select()
-      .single();
+      .single());
 
     if (error) {
       console.error('Error creating university:', error);
       return res.status(500).json({ error: 'Failed to create university' });
     }
 
+    universityCache.clear();
+
     res.status(201).json({
       message: 'University created successfully',
       university
@@ -408,14 +585,8 @@ const updateUniversity = async (req, res) => {
       return res.status(404).json({ error: 'University not found' });
     }
 
-    // Generate new slug if name changed
-    let slug = existingUniversity.slug;
-    if (name && name !== existingUniversity.name) {
-      slug = await generateUniqueSlug(name);
-    }
-
     // Update the university using admin client (admin can update any university)
-    const { data: updatedUniversity, error } = await supabaseAdmin()
+    const writeUpdate = (slug) => supabaseAdmin()
       .from('universities')
       .update({
         name,
@@ -478,11 +649,18 @@ const updateUniversity = async (req, res) => {
       .select()
       .single();
 
+    // Generate new slug if name changed
+    const { data: updatedUniversity, error } = name && name !== existingUniversity.name
+      ? await withUniqueSlug(name, writeUpdate)
+      : await writeUpdate(existingUniversity.slug);
+
     if (error) {
       console.error('Error updating university:', error);
       return res.status(500).json({ error: 'Failed to update university' });
     }
 
+    universityCache.clear();
+
     res.status(200).json({
       message: 'University updated successfully',
       university: updatedUniversity
@@ -521,6 +699,8 @@ const deleteUniversity = async (req, res) => {
       return res.status(500).json({ error: 'Failed to delete university' });
     }
 
+    universityCache.clear();
+
     res.status(200).json({
       message: 'University deleted successfully'
     });
@@ -555,40 +735,49 @@ const getUniversitiesByCountry = async (req, res) => {
   }
 };
 
+// Integer query parameter clamped to [min, max]; non-numeric input gets the fallback
+const parseBoundedInt = (value, fallback, min, max) => {
+  const parsed = parseInt(value, 10);
+  return Number.isNaN(parsed) ? fallback : Math.min(max, Math.max(min, parsed));
+};
+
 // Search universities
+// Uses the search_universities function (database/university_search.sql), which
+// matches through full-text and trigram indexes and orders results by relevance
 const searchUniversities = async (req, res) => {
   try {
     const { query } = req.params;
-    const { country, minRanking, maxTuition, limit = 1000 } = req.query;
-
-    let searchQuery = supabase()
-      .from('universities')
-      .select('*')
-      .or(`name.ilike.%${query}%,description.ilike.%${query}%,city.ilike.%${query}%`);
-
-    // Apply additional filters
-    if (country) {
-      searchQuery = searchQuery.eq('country', country);
-    }
-
-    if (minRanking) {
-      searchQuery = searchQuery.lte('ranking', minRanking);
-    }
+    const { country, minRanking, maxTuition } = req.query;
+    // The SQL function applies no LIMIT when given null, so never pass NaN through
+    const limit = parseBoundedInt(req.query.limit, SEARCH_MAX_LIMIT, 1, SEARCH_MAX_LIMIT);
+    const page = parseBoundedInt(req.query.page, 1, 1, Number.MAX_SAFE_INTEGER);
 
-    if (maxTuition) {
-      searchQuery = searchQuery.lte('tuition_fee', maxTuition);
-    }
-
-    const { data: universities, error } = await searchQuery
-      .order('ranking', { ascending: true })
-      .limit(limit);
+    const { data: universities, error } = await supabase()
+      .rpc('search_universities', {
+        search_query: query,
+        filter_country: country || null,
+        max_ranking: minRanking ? parseInt(minRanking) : null,
+        max_tuition: maxTuition ? parseFloat(maxTuition) : null,
+        // One extra row tells whether another page follows
+        result_limit: limit + 1,
+        result_offset: (page - 1) * limit
+      });
 
     if (error) {
       console.error('Error searching universities:', error);
       return res.status(500).json({ error: 'Failed to search universities' });
     }
 
-    res.status(200).json({ universities: universities || [] });
+    const rows = universities || [];
+
+    res.status(200).json({
+      universities: rows.slice(0, limit),
+      pagination: {
+        currentPage: page,
+        itemsPerPage: limit,
+        hasMore: rows.length > limit
+      }
+    });
   } catch (error) {
     console.error('Search universities error:', error);
     res.status(500).json({ error: 'Server error searching universities' });
@@ -598,18 +787,19 @@ const searchUniversities = async (req, res) => {
 // Get university countries
 const getUniversityCountries = async (req, res) => {
   try {
+    // Served from the trigger-maintained facet table (database/university_facets.sql)
     const { data, error } = await supabase()
-      .from('universities')
-      .select('country')
-      .order('country');
+      .from('university_facets')
+      .select('value')
+      .eq('facet', 'country')
+      .order('value');
 
     if (error) {
       console.error('Error fetching university countries:', error);
       return res.status(500).json({ error: 'Failed to fetch university countries' });
     }
 
-    // Extract unique countries
-    const countries = [...new Set(data.map(university => university.country))];
+    const countries = data.map(facet => facet.value);
 
     res.status(200).json({ countries });
   } catch (error) {
@@ -618,6 +808,43 @@ const getUniversityCountries = async (req, res) => {
   }
 };
 
+// Get per-value counts for the listing filters (country, type, campus_type, region)
+const getUniversityFacets = async (req, res) => {
+  try {
+    const { facet } = req.query;
+
+    const requested = facet
+      ? facet.split(',').map(name => name.trim()).filter(name => FACETS.includes(name))
+      : FACETS;
+
+    if (requested.length === 0) {
+      return res.status(400).json({ error: `facet must be one of: ${FACETS.join(', ')}` });
+    }
+
+    const { data, error } = await supabase()
+      .from('university_facets')
+      .select('facet, value, count')
+      .in('facet', requested)
+      .order('count', { ascending: false })
+      .order('value');
+
+    if (error) {
+      console.error('Error fetching university facets:', error);
+      return res.status(500).json({ error: 'Failed to fetch university facets' });
+    }
+
+    const facets = Object.fromEntries(requested.map(name => [name, []]));
+    data.forEach(({ facet: name, value, count }) => {
+      facets[name].push({ value, count });
+    });
+
+    res.status(200).json({ facets });
+  } catch (error) {
+    console.error('Get university facets error:', error);
+    res.status(500).json({ error: 'Server error fetching university facets' });
+  }
+};
+
 module.exports = {
   getAllUniversities,
   getUniversityById,
@@ -626,5 +853,7 @@ module.exports = {
   deleteUniversity,
   getUniversitiesByCountry,
   searchUniversities,
-  getUniversityCountries
+  getUniversityCountries,
+  getUniversityFacets,
+  universityCache
 }; 
\ No newline at end of file
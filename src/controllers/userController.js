@@ -1,4 +1,5 @@
 const { supabaseAdmin } = require('../utils/supabase');
+const { invalidateAdminCache } = require('../middlewares/auth');
 
 // Get all users
 const getAllUsers = async (req, res) => {
@@ -73,6 +74,9 @@ const updateUser = async (req, res) => {
 
     if (error) throw error;
 
+    // The role may have changed, so the cached admin check must not outlive it
+    invalidateAdminCache(id);
+
     res.json({
       success: true,
       data: profile,
@@ -101,6 +105,8 @@ const deleteUser = async (req, res) => {
 
     if (error) throw error;
 
+    invalidateAdminCache(id);
+
     res.json({
       success: true,
       message: 'User deleted successfully'
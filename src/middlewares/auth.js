@@ -1,4 +1,55 @@
 const { supabase, supabaseAdmin } = require('../utils/supabase');
+const { createCache } = require('../utils/ttlCache');
+
+// Profiles looked up by checkAdminByUid, so bulk writes by the same admin
+// skip the profiles query. Kept short-lived; role changes made through
+// userController invalidate immediately via invalidateAdminCache().
+const adminProfileCache = createCache('adminProfiles', {
+  ttlMs: parseInt(process.env.ADMIN_CACHE_TTL_MS) || 30 * 1000,
+  maxEntries: 1000
+});
+
+// In-flight lookups, so concurrent requests for one UID share a query
+const pendingAdminLookups = new Map();
+
+// Helper function to fetch a profile for the admin check, cached by UID
+const getAdminProfile = async (uid) => {
+  const cached = adminProfileCache.get(uid);
+  if (cached) {
+    return cached;
+  }
+
+  if (!pendingAdminLookups.has(uid)) {
+    const generation = adminProfileCache.generation;
+    const lookup = supabaseAdmin()
+      .from('profiles')
+      .select('id, role, name, email')
+      .eq('id', uid)
+      .single()
+      .then(({ data: profile, error }) => {
+        // Missing profiles are not cached; the user may sign up in the meantime
+        if (!error && profile) {
+          adminProfileCache.set(uid, profile, { generation });
+        }
+        return profile || null;
+      })
+      .finally(() => {
+        // invalidateAdminCache may have let a newer lookup take this uid's slot
+        if (pendingAdminLookups.get(uid) === lookup) {
+          pendingAdminLookups.delete(uid);
+        }
+      });
+    pendingAdminLookups.set(uid, lookup);
+  }
+
+  return pendingAdminLookups.get(uid);
+};
+
+// Drop a cached profile after its role changes or it is deleted
+const invalidateAdminCache = (uid) => {
+  adminProfileCache.delete(uid);
+  pendingAdminLookups.delete(uid);
+};
 
 // Middleware to validate user authentication using Supabase Auth
 const authenticateUser = async (req, res, next) => {
@@ -109,14 +160,10 @@ const checkAdminByUid = async (req, res, next) => {
       return res.status(400).json({ error: 'UID is required' });
     }
     
-    // Get user profile from database using admin client
-    const { data: profile, error } = await supabaseAdmin()
-      .from('profiles')
-      .select('id, role, name, email')
-      .eq('id', uid)
-      .single();
+    // Get user profile from database using admin client (cached by UID)
+    const profile = await getAdminProfile(uid);
     
-    if (error || !profile) {
+    if (!profile) {
       return res.status(404).json({ error: 'User not found' });
     }
     
@@ -200,6 +247,7 @@ module.exports = {
   validateUid,
   isAdmin,
   checkAdminByUid,
+  invalidateAdminCache,
   verifyToken,
   checkAdmin
 }; 
\ No newline at end of file
@@ -0,0 +1,200 @@
+const crypto = require('crypto');
+const { supabaseAdmin } = require('../utils/supabase');
+const { createCache } = require('../utils/ttlCache');
+
+// Idempotency keys for creates (Idempotency-Key request header).
+// The first request with a key runs and its response is stored; repeats with
+// the same key and body get that response back with Idempotent-Replayed: true,
+// so clients can retry timeouts and upload in parallel without duplicates.
+// Completed responses are cached in-process and in the idempotency_keys table
+// (database/idempotency_keys.sql), which is shared between instances.
+
+const KEY_TTL_MS = 24 * 60 * 60 * 1000;
+// A claim this old belongs to a request that never finished and may be taken over
+const CLAIM_TIMEOUT_MS = 60 * 1000;
+const KEY_PATTERN = /^[A-Za-z0-9._:-]{1,255}$/;
+
+const idempotencyCache = createCache('idempotency', {
+  ttlMs: KEY_TTL_MS,
+  maxEntries: 20000,
+  sizeOf: ({ body }) => Buffer.byteLength(body)
+});
+
+// Requests running in this instance, so a concurrent repeat waits for the original
+const inFlight = new Map();
+
+const requestHash = (req) => crypto.createHash('sha256')
+  .update(JSON.stringify(req.body ?? null))
+  .digest('hex');
+
+const replay = (res, stored) => {
+  res.set('Idempotent-Replayed', 'true');
+  return res.status(stored.status).type('application/json').send(stored.body);
+};
+
+const keyReused = (res) => res.status(422).json({
+  error: 'Idempotency-Key was already used with a different request body'
+});
+
+const stillRunning = (res) => {
+  res.set('Retry-After', '1');
+  return res.status(409).json({ error: 'A request with this Idempotency-Key is still in progress' });
+};
+
+// Claim (scope, key) in the shared table; returns the row of whoever holds it otherwise
+const claimKey = async (scope, key, hash) => {
+  const { error } = await supabaseAdmin()
+    .from('idempotency_keys')
+    .insert([{ scope, key, request_hash: hash }]);
+  if (!error) {
+    return { claimed: true };
+  }
+  if (error.code !== '23505') {
+    throw error;
+  }
+
+  const { data: row, error: readError } = await supabaseAdmin()
+    .from('idempotency_keys')
+    .select('request_hash, status_code, response_body, created_at')
+    .eq('scope', scope)
+    .eq('key', key)
+    .maybeSingle();
+  if (readError) {
+    throw readError;
+  }
+
+  // Take over an abandoned claim; matching created_at makes only one taker win
+  if (row && row.status_code === null && Date.parse(row.created_at) < Date.now() - CLAIM_TIMEOUT_MS) {
+    const { data: taken, error: takeError } = await supabaseAdmin()
+      .from('idempotency_keys')
+      .update({ request_hash: hash, created_at: new Date().toISOString() })
+      .eq('scope', scope)
+      .eq('key', key)
+      .eq('created_at', row.created_at)
+      .select('key');
+    if (takeError) {
+      throw takeError;
+    }
+    if (taken.length) {
+      return { claimed: true };
+    }
+  }
+  return { claimed: false, row };
+};
+
+const completeKey = (scope, key, status, body) => supabaseAdmin()
+  .from('idempotency_keys')
+  .update({ status_code: status, response_body: body })
+  .eq('scope', scope)
+  .eq('key', key);
+
+// Server errors are not stored, so the request can be retried under the same key
+const releaseKey = (scope, key) => supabaseAdmin()
+  .from('idempotency_keys')
+  .delete()
+  .eq('scope', scope)
+  .eq('key', key);
+
+// Table writes after the response are not awaited; failures are only logged
+const inBackground = (action, query) => {
+  Promise.resolve(query)
+    .then(({ error }) => {
+      if (error) {
+        throw error;
+      }
+    })
+    .catch(error => console.error(`Error ${action} idempotency key:`, error));
+};
+
+const idempotency = async (req, res, next) => {
+  const key = req.get('Idempotency-Key');
+  if (!key) {
+    return next();
+  }
+  if (!KEY_PATTERN.test(key)) {
+    return res.status(400).json({ error: 'Idempotency-Key must be 1-255 letters, digits, ".", "_", ":" or "-"' });
+  }
+
+  // Keys are per route and caller
+  const scope = `${req.method} ${req.baseUrl}${req.path} ${req.body?.uid || ''}`;
+  const cacheKey = `${scope} ${key}`;
+  const hash = requestHash(req);
+
+  const cached = idempotencyCache.get(cacheKey);
+  if (cached) {
+    return cached.hash === hash ? replay(res, cached) : keyReused(res);
+  }
+
+  const running = inFlight.get(cacheKey);
+  if (running) {
+    if (running.hash !== hash) {
+      return keyReused(res);
+    }
+    // Once the original finishes this finds its cached response, or runs if it failed
+    await running.done;
+    return idempotency(req, res, next);
+  }
+
+  let settle;
+  const done = new Promise(resolve => { settle = resolve; });
+  inFlight.set(cacheKey, { hash, done });
+  const finish = () => {
+    if (inFlight.get(cacheKey)?.done === done) {
+      inFlight.delete(cacheKey);
+      settle();
+    }
+  };
+
+  let shared = true;
+  try {
+    const claim = await claimKey(scope, key, hash);
+    if (!claim.claimed) {
+      finish();
+      const { row } = claim;
+      if (row && row.request_hash !== hash) {
+        return keyReused(res);
+      }
+      if (!row || row.status_code === null) {
+        return stillRunning(res);
+      }
+      const stored = { status: row.status_code, body: row.response_body, hash };
+      idempotencyCache.set(cacheKey, stored);
+      return replay(res, stored);
+    }
+  } catch (error) {
+    // Without the table keys are still honoured within this instance
+    console.error('Idempotency key store unavailable:', error.message || error);
+    shared = false;
+  }
+
+  let stored = false;
+  const json = res.json.bind(res);
+  res.json = (payload) => {
+    const body = JSON.stringify(payload);
+    if (res.statusCode < 500) {
+      idempotencyCache.set(cacheKey, { status: res.statusCode, body, hash });
+      if (shared) {
+        inBackground('storing', completeKey(scope, key, res.statusCode, body));
+      }
+      stored = true;
+    }
+    finish();
+    res.json = json;
+    return res.type('application/json').send(body);
+  };
+
+  // Responses that were not stored (server errors, aborted requests) free the key
+  res.on('close', () => {
+    if (!stored && shared) {
+      inBackground('releasing', releaseKey(scope, key));
+    }
+    finish();
+  });
+
+  next();
+};
+
+module.exports = {
+  idempotency,
+  idempotencyCache
+};
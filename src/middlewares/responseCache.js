@@ -0,0 +1,64 @@
+const crypto = require('crypto');
+const { getCacheStats } = require('../utils/ttlCache');
+
+// Cache key from the route and its query parameters in sorted order,
+// so ?page=1&limit=20 and ?limit=20&page=1 share an entry
+const cacheKey = (req) => {
+  const params = Object.keys(req.query)
+    .sort()
+    .map(name => `${name}=${[].concat(req.query[name]).join(',')}`)
+    .join('&');
+  return `${req.baseUrl}${req.path}?${params}`;
+};
+
+// Middleware serving successful JSON GET responses from a TtlCache.
+// Responses carry an ETag, so clients sending If-None-Match get a 304,
+// and an X-Cache: HIT/MISS header. Writers invalidate with cache.clear().
+const responseCache = (cache) => (req, res, next) => {
+  if (req.method !== 'GET') {
+    return next();
+  }
+
+  const key = cacheKey(req);
+  const cached = cache.get(key);
+
+  if (cached) {
+    res.set('X-Cache', 'HIT');
+    res.set('ETag', cached.etag);
+    // res.send answers 304 itself when If-None-Match matches the ETag
+    return res.type('application/json').send(cached.body);
+  }
+
+  const generation = cache.generation;
+  const json = res.json.bind(res);
+
+  res.json = (payload) => {
+    if (res.statusCode !== 200) {
+      return json(payload);
+    }
+
+    const body = JSON.stringify(payload);
+    const etag = `"${crypto.createHash('sha1').update(body).digest('base64url')}"`;
+    cache.set(key, { body, etag }, { generation });
+
+    res.set('X-Cache', 'MISS');
+    res.set('ETag', etag);
+    return res.type('application/json').send(body);
+  };
+
+  next();
+};
+
+// Size of a cached response in bytes, for the cache's memory bound
+const responseSize = ({ body, etag }) => Buffer.byteLength(body) + etag.length;
+
+// Report hit ratio and memory use of every registered cache
+const getCacheStatsHandler = (req, res) => {
+  res.status(200).json(getCacheStats());
+};
+
+module.exports = {
+  responseCache,
+  responseSize,
+  getCacheStatsHandler
+};
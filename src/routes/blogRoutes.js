@@ -11,6 +11,7 @@ const {
 } = require('../controllers/blogController');
 const { checkAdminByUid } = require('../middlewares/auth');
 const { blogValidationRules } = require('../middlewares/validators');
+const { idempotency } = require('../middlewares/idempotency');
 
 // Public routes
 router.get('/blogs', getBlogs);
@@ -19,7 +20,7 @@ router.get('/blog-categories', getBlogCategories);
 router.get('/blog-tags', getBlogTags);
 
 // Admin-only routes (check admin by UID)
-router.post('/blogs', checkAdminByUid, blogValidationRules, createBlog);
+router.post('/blogs', checkAdminByUid, idempotency, blogValidationRules, createBlog);
 router.put('/blogs/:id', checkAdminByUid, updateBlog);
 router.delete('/blogs/:id', checkAdminByUid, deleteBlog);
 
@@ -13,6 +13,7 @@ const {
 } = require('../controllers/caseStudyController');
 const { checkAdminByUid } = require('../middlewares/auth');
 const { caseStudyValidationRules } = require('../middlewares/validators');
+const { idempotency } = require('../middlewares/idempotency');
 
 // Public routes
 router.get('/', getCaseStudies);
@@ -23,7 +24,7 @@ router.get('/fields', getCaseStudyFields);
 router.get('/:id', getCaseStudyById);
 
 // Admin routes (require authentication)
-router.post('/', checkAdminByUid, caseStudyValidationRules, createCaseStudy);
+router.post('/', checkAdminByUid, idempotency, caseStudyValidationRules, createCaseStudy);
 router.put('/:id', checkAdminByUid, caseStudyValidationRules, updateCaseStudy);
 router.delete('/:id', checkAdminByUid, deleteCaseStudy);
 
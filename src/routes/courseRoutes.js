@@ -11,6 +11,7 @@ const {
 } = require('../controllers/courseController');
 const { checkAdminByUid } = require('../middlewares/auth');
 const { courseValidationRules } = require('../middlewares/validators');
+const { idempotency } = require('../middlewares/idempotency');
 
 // Public routes
 router.get('/courses', getCourses);
@@ -19,7 +20,7 @@ router.get('/course-categories', getCourseCategories);
 router.get('/course-levels', getCourseLevels);
 
 // Admin-only routes (check admin by UID)
-router.post('/courses', checkAdminByUid, courseValidationRules, createCourse);
+router.post('/courses', checkAdminByUid, idempotency, courseValidationRules, createCourse);
 router.put('/courses/:id', checkAdminByUid, updateCourse);
 router.delete('/courses/:id', checkAdminByUid, deleteCourse);
 
@@ -11,6 +11,7 @@ const {
 } = require('../controllers/scholarshipController');
 const { checkAdminByUid } = require('../middlewares/auth');
 const { scholarshipValidationRules } = require('../middlewares/validators');
+const { idempotency } = require('../middlewares/idempotency');
 
 // Public routes
 router.get('/scholarships', getScholarships);
@@ -19,7 +20,7 @@ router.get('/scholarship-countries', getScholarshipCountries);
 router.get('/scholarship-universities', getScholarshipUniversities);
 
 // Admin-only routes (check admin by UID)
-router.post('/scholarships', checkAdminByUid, scholarshipValidationRules, createScholarship);
+router.post('/scholarships', checkAdminByUid, idempotency, scholarshipValidationRules, createScholarship);
 router.put('/scholarships/:id', checkAdminByUid, updateScholarship);
 router.delete('/scholarships/:id', checkAdminByUid, deleteScholarship);
 
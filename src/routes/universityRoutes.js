@@ -7,21 +7,30 @@ const {
   updateUniversity, 
   deleteUniversity,
   getUniversityCountries,
+  getUniversityFacets,
   getUniversitiesByCountry,
-  searchUniversities
+  searchUniversities,
+  universityCache
 } = require('../controllers/universityController');
 const { checkAdminByUid } = require('../middlewares/auth');
 const { universityValidationRules } = require('../middlewares/validators');
+const { idempotency } = require('../middlewares/idempotency');
+const { responseCache, getCacheStatsHandler } = require('../middlewares/responseCache');
+
+// Public reads are served from the in-process response cache
+const cached = responseCache(universityCache);
 
 // Public routes
-router.get('/', getAllUniversities);
-router.get('/countries', getUniversityCountries);
-router.get('/country/:country', getUniversitiesByCountry);
-router.get('/search/:query', searchUniversities);
+router.get('/', cached, getAllUniversities);
+router.get('/countries', cached, getUniversityCountries);
+router.get('/facets', cached, getUniversityFacets);
+router.get('/country/:country', cached, getUniversitiesByCountry);
+router.get('/search/:query', cached, searchUniversities);
+router.get('/cache/stats', checkAdminByUid, getCacheStatsHandler);
 router.get('/:id', getUniversityById);
 
 // Admin-only routes (check admin by UID)
-router.post('/', checkAdminByUid, universityValidationRules, createUniversity);
+router.post('/', checkAdminByUid, idempotency, universityValidationRules, createUniversity);
 router.put('/:id', checkAdminByUid, updateUniversity);
 router.delete('/:id', checkAdminByUid, deleteUniversity);
 
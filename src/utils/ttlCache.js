@@ -0,0 +1,127 @@
+// In-process LRU cache with per-entry expiry
+// Entries are kept in a Map, whose insertion order doubles as the LRU order:
+// a hit re-inserts the key at the end and eviction removes from the front.
+
+// Named caches, so their statistics can be reported together
+const caches = new Map();
+
+class TtlCache {
+  constructor({ name, ttlMs = 60 * 1000, maxEntries = 500, maxBytes = 50 * 1024 * 1024, sizeOf } = {}) {
+    this.name = name;
+    this.ttlMs = ttlMs;
+    this.maxEntries = maxEntries;
+    this.maxBytes = maxBytes;
+    this.sizeOf = sizeOf || (() => 0);
+    this.entries = new Map();
+    this.bytes = 0;
+    // Bumped by delete() and clear() so loads in flight during an invalidation are not stored
+    this.generation = 0;
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+    this.expirations = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry);
+      this.expirations++;
+      this.misses++;
+      return undefined;
+    }
+
+    // Move to the most recently used position
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key, value, { ttlMs = this.ttlMs, generation = this.generation } = {}) {
+    if (generation !== this.generation) {
+      return false;
+    }
+
+    const size = this.sizeOf(value);
+    if (size > this.maxBytes) {
+      return false;
+    }
+
+    const existing = this.entries.get(key);
+    if (existing) {
+      this.remove(key, existing);
+    }
+
+    this.entries.set(key, { value, size, expiresAt: Date.now() + ttlMs });
+    this.bytes += size;
+
+    // Evict least recently used entries until both bounds hold
+    while (this.entries.size > this.maxEntries || this.bytes > this.maxBytes) {
+      const [oldestKey, oldest] = this.entries.entries().next().value;
+      this.remove(oldestKey, oldest);
+      this.evictions++;
+    }
+    return true;
+  }
+
+  delete(key) {
+    const entry = this.entries.get(key);
+    if (entry) {
+      this.remove(key, entry);
+    }
+    this.generation++;
+  }
+
+  remove(key, entry) {
+    this.entries.delete(key);
+    this.bytes -= entry.size;
+  }
+
+  clear() {
+    this.entries.clear();
+    this.bytes = 0;
+    this.generation++;
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      name: this.name,
+      entries: this.entries.size,
+      bytes: this.bytes,
+      maxEntries: this.maxEntries,
+      maxBytes: this.maxBytes,
+      ttlMs: this.ttlMs,
+      hits: this.hits,
+      misses: this.misses,
+      hitRatio: lookups ? this.hits / lookups : 0,
+      evictions: this.evictions,
+      expirations: this.expirations
+    };
+  }
+}
+
+// Create (or return the existing) cache registered under a name
+const createCache = (name, options = {}) => {
+  if (!caches.has(name)) {
+    caches.set(name, new TtlCache({ ...options, name }));
+  }
+  return caches.get(name);
+};
+
+// Statistics for every registered cache plus the process heap usage
+const getCacheStats = () => ({
+  caches: [...caches.values()].map(cache => cache.stats()),
+  process: {
+    heapUsed: process.memoryUsage().heapUsed,
+    rss: process.memoryUsage().rss
+  }
+});
+
+module.exports = { TtlCache, createCache, getCacheStats };
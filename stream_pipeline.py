@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Streaming Workbook-to-API Pipeline
+Chains read → convert → fix → validate → upload so records flow through one
+at a time instead of each step rewriting universities_fixed.json. The main
+thread converts, fixes and validates records into a bounded queue that upload
+worker threads drain; a full queue blocks the producer, so memory stays bounded
+by the queue size and the first upload starts as soon as one record is ready.
+
+The workbook stores one university per column, so the sheet itself is read
+up front; every later step is per record.
+"""
+
+import argparse
+import logging
+import queue
+import signal
+import sys
+import threading
+import time
+from typing import Dict, Iterable, Iterator
+
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+EXCEL_FILE = "2026 QS Ranking 1000.xlsx"
+API_BASE_URL = "http://localhost:8000"
+
+_DONE = object()
+
+def read_workbook(excel_file: str) -> Iterator[Dict]:
+    """Converted university records, one workbook column at a time"""
+    import pandas as pd
+    from university_uploader_fixed import UniversityUploaderFixed
+
+    with profile_stage('read_excel'):
+        df = pd.read_excel(excel_file)
+    field_names = df.iloc[:, 0].tolist()
+    converter = UniversityUploaderFixed()
+    for col_idx in range(1, len(df.columns)):
+        raw = dict(zip(field_names, df.iloc[:, col_idx].tolist()))
+        with profile_stage('convert'):
+            record = converter.build_university_record(raw, col_idx)
+        if record:
+            yield record
+
+class StreamPipeline:
+    def __init__(self, api_base_url: str = API_BASE_URL, workers: int = 4, queue_size: int = 32,
+                 max_retries: int = 3, skip_existing: bool = True):
+        from smart_upload import SmartUploader
+
+        self.api_base_url = api_base_url
+        self.max_retries = max_retries
+        self.skip_existing = skip_existing
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        # One session per worker. SmartUploader installs signal handlers, which
+        # only the main thread may do, so they are built here and the handlers
+        # replaced by one that stops the whole pipeline.
+        self.uploaders = [SmartUploader(api_base_url=api_base_url) for _ in range(max(1, workers))]
+        signal.signal(signal.SIGINT, self.signal_handler)
+        signal.signal(signal.SIGTERM, self.signal_handler)
+
+        self.start_time = 0.0
+        self.results = {'successful': 0, 'failed': 0, 'skipped': 0, 'invalid': 0, 'errors': [],
+                        'invalid_records': [], 'first_upload_seconds': None, 'max_queue_depth': 0}
+
+    def signal_handler(self, signum, frame):
+        logger.info(f"\n⚠️ Received signal {signum}. Stopping after the uploads in progress...")
+        self.stop.set()
+        for uploader in self.uploaders:
+            uploader.should_stop = True
+
+    def produce(self, records: Iterable[Dict], existing_keys):
+        """Fix and validate records into the queue; blocks while the queue is full"""
+        from auto_repair import parse_validation_errors, repair_record
+        from final_fix import fix_university_fields
+        from fix_images import fix_university_media
+        from university_validation import validate_university
+
+        try:
+            for record in records:
+                if self.stop.is_set():
+                    break
+                if not existing_keys.add(record['name'], record.get('country')):
+                    self.results['skipped'] += 1
+                    continue
+
+                with profile_stage('fix'):
+                    fix_university_media(record)
+                    fix_university_fields(record)
+                with profile_stage('validate'):
+                    errors = validate_university(record)
+                if errors:
+                    with profile_stage('repair'):
+                        _, remaining = repair_record(record, parse_validation_errors({'errors': errors}))
+                    errors = [] if not remaining else errors
+                if errors:
+                    logger.warning(f"⚠️ Skipping invalid {record['name']}: {', '.join(e['msg'] for e in errors)}")
+                    with self.lock:
+                        self.results['invalid'] += 1
+                        self.results['invalid_records'].append({'name': record['name'], 'errors': errors})
+                    continue
+
+                self.put(record)
+        except Exception as e:
+            logger.error(f"❌ Producer failed: {e}")
+            self.stop.set()
+            raise
+        finally:
+            for _ in self.uploaders:
+                self.put(_DONE, final=True)
+
+    def put(self, item, final: bool = False):
+        # Wake up now and then so a stop request is noticed while blocked;
+        # once stopped, records are dropped but the end markers still go in
+        while True:
+            try:
+                self.queue.put(item, timeout=0.5)
+                break
+            except queue.Full:
+                if self.stop.is_set() and not final:
+                    return
+        with self.lock:
+            self.results['max_queue_depth'] = max(self.results['max_queue_depth'], self.queue.qsize())
+
+    def upload_worker(self, uploader):
+        from auto_repair import repair_record
+
+        while True:
+            record = self.queue.get()
+            if record is _DONE:
+                return
+            if self.stop.is_set():
+                continue
+
+            success = False
+            repaired = False
+            for attempt in range(self.max_retries):
+                if attempt:
+                    time.sleep(1)  # Wait before retry
+                success = uploader.upload_university(record)
+                if success or self.stop.is_set():
+                    break
+                if uploader.last_errors:
+                    # Rejected by the server's validation: repair once, otherwise give up
+                    if repaired or repair_record(record, uploader.last_errors)[1]:
+                        break
+                    repaired = True
+
+            with self.lock:
+                if success:
+                    self.results['successful'] += 1
+                    if self.results['first_upload_seconds'] is None:
+                        self.results['first_upload_seconds'] = round(time.perf_counter() - self.start_time, 4)
+                else:
+                    self.results['failed'] += 1
+                    self.results['errors'].append(record['name'])
+
+    def run(self, records: Iterable[Dict]) -> Dict:
+        """Stream records to the API and return counts and timings"""
+        self.start_time = time.perf_counter()
+        from dedup_universities import UploadKeys
+
+        existing_keys = self.uploaders[0].get_existing_universities() if self.skip_existing else UploadKeys()
+
+        workers = [threading.Thread(target=self.upload_worker, args=(uploader,), daemon=True)
+                   for uploader in self.uploaders]
+        for worker in workers:
+            worker.start()
+        try:
+            self.produce(records, existing_keys)
+            existing_keys.log_near_duplicates()
+        finally:
+            for worker in workers:
+                worker.join()
+
+        self.results['seconds'] = round(time.perf_counter() - self.start_time, 4)
+        return self.results
+
+def stream_workbook(excel_file: str, api_base_url: str = API_BASE_URL, **options) -> Dict:
+    pipeline = StreamPipeline(api_base_url=api_base_url, **options)
+    if not pipeline.uploaders[0].test_api_connection():
+        return {}
+    return pipeline.run(read_workbook(excel_file))
+
+def report(results: Dict):
+    logger.info("=" * 60)
+    logger.info("📊 STREAM SUMMARY")
+    logger.info("=" * 60)
+    logger.info(f"Uploaded: {results['successful']}, failed: {results['failed']}, "
+                f"skipped (already exist): {results['skipped']}, invalid: {results['invalid']}")
+    logger.info(f"Time to first upload: {results['first_upload_seconds']}s, total: {results['seconds']}s, "
+                f"max queue depth: {results['max_queue_depth']}")
+    if results['errors']:
+        logger.info(f"❌ Failed universities: {', '.join(results['errors'][:10])}")
+
+def add_stream_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--excel', default=EXCEL_FILE)
+    parser.add_argument('--api-base-url', default=API_BASE_URL)
+    parser.add_argument('--workers', type=int, default=4, help="concurrent upload workers")
+    parser.add_argument('--queue-size', type=int, default=32, help="records buffered ahead of the uploaders")
+    parser.add_argument('--no-skip-existing', action='store_true', help="upload without checking the database first")
+
+def run_from_args(args: argparse.Namespace) -> int:
+    results = stream_workbook(args.excel, api_base_url=args.api_base_url, workers=args.workers,
+                              queue_size=args.queue_size, skip_existing=not args.no_skip_existing)
+    if not results:
+        return 1
+    report(results)
+    return 1 if results['failed'] else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Stream the QS ranking workbook to the API record by record")
+    add_stream_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+    try:
+        return run_from_args(args)
+    finally:
+        profiler.finish()
+
+if __name__ == "__main__":
+    sys.exit(main())
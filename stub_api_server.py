@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+"""
+Local Stub API Server
+In-memory stand-in for /api/universities so uploaders and load tests can be
+run without a live API or Supabase. Supports configurable latency
+distributions, error injection and rate limiting. The scholarship, blog,
+course and case study collections and /api/featured are served too, for
+the bulk loader. Creates honour the Idempotency-Key header like the API.
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from entity_validation import validate_entity
+from university_query import search_paging, search_relevance
+from university_validation import validate_university
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Filter facets served by GET /api/universities/facets
+FACETS = ('country', 'type', 'campus_type', 'region')
+
+# getAllUniversities buckets for studentPopulation and acceptanceRate
+STUDENT_POPULATION_RANGES = {'small': (None, 15000), 'medium': (15001, 40000), 'large': (40001, None)}
+ACCEPTANCE_RATE_RANGES = {'low': (None, 10), 'medium': (11, 50), 'high': (51, None)}
+
+class LatencyModel:
+    """Samples artificial service latency from a named distribution.
+
+    Specs are ``kind:arg[:arg]`` with arguments in milliseconds:
+    ``none``, ``fixed:20``, ``uniform:10:50``, ``normal:30:5``,
+    ``lognormal:20:0.5`` (median, sigma) and ``exponential:25`` (mean).
+    """
+
+    KINDS = {'none': 0, 'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2, 'exponential': 1}
+
+    def __init__(self, spec: str = "none", seed: Optional[int] = None):
+        parts = spec.split(':')
+        kind = parts[0].lower()
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        if len(parts) - 1 != self.KINDS[kind]:
+            raise ValueError(f"Latency spec '{spec}' needs {self.KINDS[kind]} argument(s)")
+        self.spec = spec
+        self.kind = kind
+        self.args = [float(arg) for arg in parts[1:]]
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def sample(self) -> float:
+        """Return a latency in seconds"""
+        with self.lock:
+            if self.kind == 'none':
+                ms = 0.0
+            elif self.kind == 'fixed':
+                ms = self.args[0]
+            elif self.kind == 'uniform':
+                ms = self.rng.uniform(self.args[0], self.args[1])
+            elif self.kind == 'normal':
+                ms = self.rng.gauss(self.args[0], self.args[1])
+            elif self.kind == 'lognormal':
+                ms = self.rng.lognormvariate(math.log(max(self.args[0], 1e-6)), self.args[1])
+            else:
+                ms = self.rng.expovariate(1.0 / self.args[0]) if self.args[0] > 0 else 0.0
+        return max(ms, 0.0) / 1000.0
+
+class RateLimiter:
+    """Token bucket shared by all handler threads"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst if burst else max(1, int(rate)))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+@dataclass
+class StubConfig:
+    latency: str = "none"
+    error_rate: float = 0.0
+    error_status: int = 500
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 35.0
+    rate_limit: float = 0.0
+    burst: int = 0
+    validate: bool = True
+    seed: Optional[int] = None
+
+    def describe(self) -> str:
+        """Stable description used to compare benchmark runs like-for-like"""
+        return (f"latency={self.latency},errors={self.error_rate},timeouts={self.timeout_rate},"
+                f"rate_limit={self.rate_limit},burst={self.burst}")
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    by_status: Dict[int, int] = field(default_factory=dict)
+    injected_errors: int = 0
+    injected_timeouts: int = 0
+    rate_limited: int = 0
+    idempotent_replays: int = 0
+
+class UniversityStore:
+    """Thread-safe in-memory universities table"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.records: Dict[str, Dict] = {}
+            self.ids_by_name: Dict[str, str] = {}
+
+    def load(self, universities: List[Dict]):
+        """Pre-populate the store, e.g. to exercise SmartUploader's resume path"""
+        for university in universities:
+            self.create(university)
+
+    def create(self, data: Dict) -> Tuple[int, Dict]:
+        with self.lock:
+            name = data.get('name')
+            if name in self.ids_by_name:
+                return 409, {'error': 'University already exists'}
+            record = dict(data)
+            record['id'] = str(uuid.uuid4())
+            record['created_at'] = record['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            self.records[record['id']] = record
+            self.ids_by_name[name] = record['id']
+        return 201, {'message': 'University created successfully', 'university': record}
+
+    def update(self, university_id: str, data: Dict) -> Tuple[int, Dict]:
+        with self.lock:
+            existing = self.records.get(university_id)
+            if existing is None:
+                return 404, {'error': 'University not found'}
+            if data.get('name') and data['name'] != existing['name']:
+                self.ids_by_name.pop(existing['name'], None)
+                self.ids_by_name[data['name']] = university_id
+            existing.update({k: v for k, v in data.items() if k != 'id'})
+            existing['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        return 200, {'message': 'University updated successfully', 'university': existing}
+
+    def get(self, university_id: str) -> Tuple[int, Dict]:
+        with self.lock:
+            record = self.records.get(university_id)
+        if record is None:
+            return 404, {'error': 'University not found'}
+        return 200, {'university': record}
+
+    def snapshot(self) -> List[Dict]:
+        with self.lock:
+            return list(self.records.values())
+
+    def list(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        page = max(1, int(params.get('page', 1)))
+        limit = max(1, int(params.get('limit', 1000)))
+        records = self.snapshot()
+        for param, column in (('country', 'country'), ('state', 'state'), ('type', 'type'), ('region', 'region'),
+                              ('rankingType', 'ranking_type'), ('campusType', 'campus_type')):
+            if params.get(param):
+                records = [r for r in records if r.get(column) == params[param]]
+        if params.get('major'):
+            records = [r for r in records if params['major'] in (r.get('programs_offered') or [])]
+        if params.get('rankingYear'):
+            records = [r for r in records if r.get('ranking_year') == int(params['rankingYear'])]
+        if params.get('qsRankingRange', '').lstrip('-').isdigit():
+            records = _in_range(records, 'ranking', None, int(params['qsRankingRange']))
+        if params.get('studentPopulation') in STUDENT_POPULATION_RANGES:
+            records = _in_range(records, 'student_population', *STUDENT_POPULATION_RANGES[params['studentPopulation']])
+        if params.get('acceptanceRate') in ACCEPTANCE_RATE_RANGES:
+            records = _in_range(records, 'acceptance_rate', *ACCEPTANCE_RATE_RANGES[params['acceptanceRate']])
+        if params.get('search'):
+            term = params['search'].lower()
+            records = [r for r in records
+                       if _matches_text(r, term) or params['search'] in (r.get('programs_offered') or [])]
+        if 'cursor' in params:
+            return self._keyset_page(records, params, limit)
+        records.sort(key=_ranking_key)
+        offset = (page - 1) * limit
+        return 200, {
+            'universities': _project(records[offset:offset + limit], params.get('fields')),
+            'pagination': {
+                'totalItems': len(records),
+                'totalPages': math.ceil(len(records) / limit),
+                'currentPage': page,
+                'itemsPerPage': limit
+            }
+        }
+
+    def _keyset_page(self, records: List[Dict], params: Dict[str, str], limit: int) -> Tuple[int, Dict]:
+        """Mirror keyset mode: order by (ranking nulls last, id), resume after the cursor"""
+        records.sort(key=_keyset_key)
+        if params['cursor']:
+            try:
+                after = json.loads(base64.urlsafe_b64decode(params['cursor'] + '=' * (-len(params['cursor']) % 4)))
+                after_key = _keyset_key(after)
+            except (ValueError, TypeError, KeyError):
+                return 400, {'error': 'Invalid cursor'}
+            records = [r for r in records if _keyset_key(r) > after_key]
+        page = records[:limit]
+        next_cursor = None
+        if len(records) > limit:
+            last = page[-1]
+            cursor = json.dumps({'ranking': last.get('ranking'), 'id': last['id']}, separators=(',', ':'))
+            next_cursor = base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii').rstrip('=')
+        pagination = {'nextCursor': next_cursor, 'itemsPerPage': limit}
+        if params.get('count') in ('exact', 'planned', 'estimated'):
+            pagination['totalItems'] = len(records)
+        return 200, {'universities': _project(page, params.get('fields')), 'pagination': pagination}
+
+    def search(self, query: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """Mirror searchUniversities: ilike on name/description/city plus filters"""
+        term = query.lower()
+        records = [r for r in self.snapshot() if _matches_text(r, term)]
+        if params.get('country'):
+            records = [r for r in records if r.get('country') == params['country']]
+        if params.get('minRanking'):
+            max_ranking = float(params['minRanking'])
+            records = [r for r in records if r.get('ranking') is not None and r['ranking'] <= max_ranking]
+        if params.get('maxTuition'):
+            max_tuition = float(params['maxTuition'])
+            records = [r for r in records if r.get('tuition_fee') is not None and r['tuition_fee'] <= max_tuition]
+        records.sort(key=lambda r: (-search_relevance(r, query), _ranking_key(r)))
+        page, limit = search_paging(params)
+        offset = (page - 1) * limit
+        return 200, {'universities': records[offset:offset + limit],
+                     'pagination': {'currentPage': page, 'itemsPerPage': limit,
+                                    'hasMore': len(records) > offset + limit}}
+
+    def by_country(self, country: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        records = [r for r in self.snapshot() if r.get('country') == country]
+        records.sort(key=lambda r: r.get('name') or '')
+        return 200, {'universities': records[:int(params.get('limit', 1000))]}
+
+    def countries(self) -> Tuple[int, Dict]:
+        return 200, {'countries': sorted({r.get('country') for r in self.snapshot() if r.get('country')})}
+
+    def facets(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """Mirror getUniversityFacets: counts per value, most common first"""
+        requested = [f.strip() for f in params['facet'].split(',')] if params.get('facet') else list(FACETS)
+        requested = [f for f in requested if f in FACETS]
+        if not requested:
+            return 400, {'error': f"facet must be one of: {', '.join(FACETS)}"}
+        records = self.snapshot()
+        facets = {}
+        for facet in requested:
+            counts = Counter(r.get(facet) for r in records if r.get(facet))
+            facets[facet] = [{'value': value, 'count': count}
+                             for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))]
+        return 200, {'facets': facets}
+
+# collection path segment -> (list key, created record key, default status or None)
+CONTENT_COLLECTIONS = {
+    'scholarships': ('scholarships', 'scholarship', None),
+    'blogs': ('blogs', 'blog', None),
+    'courses': ('courses', 'course', 'draft'),
+    'case-studies': ('caseStudies', 'caseStudy', 'published'),
+}
+
+class ContentStore:
+    """Thread-safe in-memory collection for one of the content endpoints"""
+
+    def __init__(self, collection: str):
+        self.list_key, self.item_key, self.default_status = CONTENT_COLLECTIONS[collection]
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.records: Dict[str, Dict] = {}
+
+    def create(self, data: Dict) -> Tuple[int, Dict]:
+        # The content controllers have no uniqueness checks, so repeats are stored twice
+        record = {k: v for k, v in data.items() if k != 'uid'}
+        record['id'] = str(uuid.uuid4())
+        record['featured'] = bool(data.get('featured', False))
+        record['created_by'] = data.get('uid')
+        if self.default_status:
+            record['status'] = data.get('status') or self.default_status
+        record['created_at'] = record['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        with self.lock:
+            self.records[record['id']] = record
+        return 201, {'message': 'Created successfully', self.item_key: record}
+
+    def get(self, item_id: str) -> Tuple[int, Dict]:
+        with self.lock:
+            record = self.records.get(item_id)
+        if record is None:
+            return 404, {'error': 'Not found'}
+        return 200, {self.item_key: record}
+
+    def visible(self) -> List[Dict]:
+        """Records the listing returns; courses and case studies only list published ones"""
+        with self.lock:
+            records = list(self.records.values())
+        if self.default_status:
+            records = [r for r in records if r.get('status') == 'published']
+        return records
+
+    def list(self, params: Dict[str, str]) -> Tuple[int, Dict]:
+        page = max(1, int(params.get('page', 1)))
+        limit = max(1, int(params.get('limit', 10)))
+        records = self.visible()
+        if 'featured' in params:
+            records = [r for r in records if r['featured'] == (params['featured'] == 'true')]
+        records.sort(key=lambda r: r['created_at'], reverse=True)
+        offset = (page - 1) * limit
+        return 200, {self.list_key: records[offset:offset + limit], 'pagination': {
+            'totalItems': len(records), 'totalPages': math.ceil(len(records) / limit),
+            'currentPage': page, 'itemsPerPage': limit}}
+
+def _ranking_key(record: Dict):
+    # order('ranking', { nullsLast: true })
+    return (record.get('ranking') is None, record.get('ranking') or 0)
+
+def _keyset_key(record: Dict):
+    # order('ranking', { nullsFirst: false }).order('id')
+    return (record.get('ranking') is None, record.get('ranking') or 0, record['id'])
+
+def _project(records: List[Dict], fields: Optional[str]) -> List[Dict]:
+    """Mirror ?fields=: the listed columns plus id and ranking"""
+    if not fields:
+        return records
+    columns = {'id', 'ranking'} | {f.strip() for f in fields.split(',')}
+    return [{k: v for k, v in r.items() if k in columns} for r in records]
+
+def _in_range(records: List[Dict], column: str, low: Optional[float], high: Optional[float]) -> List[Dict]:
+    # gte/lte never match NULL
+    return [r for r in records if r.get(column) is not None
+            and (low is None or r[column] >= low) and (high is None or r[column] <= high)]
+
+def _matches_text(record: Dict, term: str) -> bool:
+    return any(term in (record.get(column) or '').lower() for column in ('name', 'description', 'city'))
+
+class IdempotencyStore:
+    """Idempotency-Key handling of the create routes, as in src/middlewares/idempotency.js"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            # (scope, key) -> (body hash, status, body)
+            self.responses: Dict[Tuple, Tuple[str, int, Dict]] = {}
+            # (scope, key) -> (body hash, set when the first request finishes)
+            self.running: Dict[Tuple, Tuple[str, threading.Event]] = {}
+
+    def claim(self, scope: Tuple, key: str, body_hash: str) -> Tuple[str, Optional[Tuple[int, Dict]]]:
+        """('run', None) for the first request, ('replay', (status, body)) or ('reused', None)"""
+        while True:
+            with self.lock:
+                stored = self.responses.get((scope, key))
+                if stored:
+                    return ('replay', stored[1:]) if stored[0] == body_hash else ('reused', None)
+                running = self.running.get((scope, key))
+                if running is None:
+                    self.running[(scope, key)] = (body_hash, threading.Event())
+                    return 'run', None
+            if running[0] != body_hash:
+                return 'reused', None
+            # A concurrent repeat waits for the original, then replays it (or runs if it failed)
+            running[1].wait()
+
+    def finish(self, scope: Tuple, key: str, status: int, body: Dict):
+        with self.lock:
+            body_hash, done = self.running.pop((scope, key))
+            # Server errors are not stored, so the key can be retried
+            if status < 500:
+                self.responses[(scope, key)] = (body_hash, status, body)
+        done.set()
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real server behind requests.Session
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def send_json(self, status: int, body: Dict, headers: Optional[Dict[str, str]] = None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.record_status(status)
+
+    def read_json(self) -> Optional[Dict]:
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        try:
+            return json.loads(raw or b'{}')
+        except ValueError:
+            return None
+
+    def inject_faults(self) -> bool:
+        """Apply rate limiting, latency and injected failures; True if a response was sent"""
+        server = self.server
+        config = server.config
+        if server.rate_limiter and not server.rate_limiter.allow():
+            server.bump('rate_limited')
+            self.send_json(429, {'error': 'Too many requests'}, {'Retry-After': '1'})
+            return True
+
+        time.sleep(server.latency.sample())
+
+        roll = server.fault_rng()
+        if roll < config.timeout_rate:
+            server.bump('injected_timeouts')
+            time.sleep(config.timeout_seconds)
+            self.close_connection = True
+            return True
+        if roll < config.timeout_rate + config.error_rate:
+            server.bump('injected_errors')
+            self.send_json(config.error_status, {'error': 'Injected failure'})
+            return True
+        return False
+
+    def route(self) -> Tuple[str, List[str], Dict[str, str]]:
+        parsed = urlparse(self.path)
+        segments = [unquote(s) for s in parsed.path.strip('/').split('/') if s]
+        params = {k: v[-1] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+        return parsed.path, segments, params
+
+    def do_GET(self):
+        path, segments, params = self.route()
+        if path == '/':
+            self.send_json(200, {'message': 'EduSmart stub API is running'})
+            return
+        if len(segments) in (2, 3) and segments[0] == 'api' and segments[1] in CONTENT_COLLECTIONS:
+            if self.inject_faults():
+                return
+            content = self.server.content[segments[1]]
+            try:
+                status, body = content.list(params) if len(segments) == 2 else content.get(segments[2])
+            except ValueError:
+                status, body = 400, {'error': 'Invalid query parameters'}
+            self.send_json(status, body)
+            return
+        if segments == ['api', 'featured']:
+            if self.inject_faults():
+                return
+            self.send_json(200, self.server.featured(params))
+            return
+        if segments[:2] != ['api', 'universities']:
+            self.send_json(404, {'error': 'Route not found'})
+            return
+        if self.inject_faults():
+            return
+        store = self.server.store
+        try:
+            if len(segments) == 2:
+                status, body = store.list(params)
+            elif segments[2:] == ['countries']:
+                status, body = store.countries()
+            elif segments[2:] == ['facets']:
+                status, body = store.facets(params)
+            elif len(segments) == 4 and segments[2] == 'country':
+                status, body = store.by_country(segments[3], params)
+            elif len(segments) == 4 and segments[2] == 'search':
+                status, body = store.search(segments[3], params)
+            elif len(segments) == 3:
+                status, body = store.get(segments[2])
+            else:
+                status, body = 404, {'error': 'Route not found'}
+        except ValueError:
+            status, body = 400, {'error': 'Invalid query parameters'}
+        self.send_json(status, body)
+
+    def do_POST(self):
+        path, segments, params = self.route()
+        data = self.read_json()
+        content = len(segments) == 2 and segments[0] == 'api' and segments[1] in CONTENT_COLLECTIONS
+        if segments != ['api', 'universities'] and not content:
+            self.send_json(404, {'error': 'Route not found'})
+            return
+        if self.inject_faults():
+            return
+        if data is None:
+            self.send_json(400, {'error': 'Invalid JSON body'})
+            return
+
+        key = self.headers.get('Idempotency-Key')
+        if key:
+            scope = (path, data.get('uid'))
+            body_hash = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+            outcome, stored = self.server.idempotency.claim(scope, key, body_hash)
+            if outcome == 'replay':
+                self.server.bump('idempotent_replays')
+                self.send_json(stored[0], stored[1], {'Idempotent-Replayed': 'true'})
+                return
+            if outcome == 'reused':
+                self.send_json(422, {'error': 'Idempotency-Key was already used with a different request body'})
+                return
+
+        status, body = self.create(segments[1], data, content)
+        if key:
+            self.server.idempotency.finish(scope, key, status, body)
+        self.send_json(status, body)
+
+    def create(self, collection: str, data: Dict, content: bool) -> Tuple[int, Dict]:
+        if self.server.config.validate:
+            errors = validate_entity(collection, data) if content else validate_university(data)
+            if errors:
+                return 400, {'errors': errors}
+        store = self.server.content[collection] if content else self.server.store
+        return store.create(data)
+
+    def do_PUT(self):
+        path, segments, params = self.route()
+        data = self.read_json()
+        if len(segments) != 3 or segments[:2] != ['api', 'universities']:
+            self.send_json(404, {'error': 'Route not found'})
+            return
+        if self.inject_faults():
+            return
+        if data is None:
+            self.send_json(400, {'error': 'Invalid JSON body'})
+            return
+        status, body = self.server.store.update(segments[2], data)
+        self.send_json(status, body)
+
+class StubApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], config: StubConfig):
+        super().__init__(address, StubRequestHandler)
+        self.config = config
+        self.store = UniversityStore()
+        self.content = {collection: ContentStore(collection) for collection in CONTENT_COLLECTIONS}
+        self.idempotency = IdempotencyStore()
+        self.latency = LatencyModel(config.latency, config.seed)
+        self.rate_limiter = RateLimiter(config.rate_limit, config.burst) if config.rate_limit > 0 else None
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self.stats = StubStats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fault_rng(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def bump(self, counter: str):
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
+
+    def record_status(self, status: int):
+        with self._lock:
+            self.stats.requests += 1
+            self.stats.by_status[status] = self.stats.by_status.get(status, 0) + 1
+
+    def featured(self, params: Dict[str, str]) -> Dict:
+        """getAllFeaturedItems: featured records of every collection"""
+        limit = min(int(params.get('limit', 10)), 50)
+        body = {collection.replace('-', '_'): [r for r in store.visible() if r['featured']][:limit]
+                for collection, store in self.content.items()}
+        body['universities'] = [r for r in self.store.snapshot() if r.get('featured')][:limit]
+        body['resources'] = []
+        return body
+
+    def reset(self):
+        """Clear stored records and counters between benchmark runs"""
+        self.store.reset()
+        for store in self.content.values():
+            store.reset()
+        self.idempotency.reset()
+        with self._lock:
+            self.stats = StubStats()
+
+def start_stub_server(config: Optional[StubConfig] = None, host: str = "127.0.0.1",
+                      port: int = 0) -> StubApiServer:
+    """Start the stub on a background thread; port 0 picks a free port"""
+    server = StubApiServer((host, port), config or StubConfig())
+    thread = threading.Thread(target=server.serve_forever, name="stub-api-server", daemon=True)
+    thread.start()
+    logger.info(f"Stub API listening on {server.base_url} ({server.config.describe()})")
+    return server
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--latency', default='none',
+                        help="latency distribution, e.g. fixed:20, uniform:10:50, lognormal:20:0.5")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with an error")
+    parser.add_argument('--error-status', type=int, default=500, help="status code for injected errors")
+    parser.add_argument('--timeout-rate', type=float, default=0.0, help="fraction of requests that hang")
+    parser.add_argument('--timeout-seconds', type=float, default=35.0, help="how long a hanging request stalls")
+    parser.add_argument('--rate-limit', type=float, default=0.0, help="requests per second before 429s (0 = off)")
+    parser.add_argument('--burst', type=int, default=0, help="token bucket size for the rate limit")
+    parser.add_argument('--no-validate', action='store_true', help="accept payloads without validation")
+    parser.add_argument('--seed', type=int, default=None, help="seed for latency and fault injection")
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        rate_limit=args.rate_limit,
+        burst=args.burst,
+        validate=not args.no_validate,
+        seed=args.seed
+    )
+
+def main():
+    """Run the stub API in the foreground"""
+    parser = argparse.ArgumentParser(description="Local stub of the EduSmart universities API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--preload', help="JSON file of universities to load before serving")
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubApiServer((args.host, args.port), config_from_args(args))
+    if args.preload:
+        with open(args.preload, 'r', encoding='utf-8') as f:
+            server.store.load(json.load(f))
+        logger.info(f"📚 Preloaded {len(server.store.snapshot())} universities from {args.preload}")
+
+    logger.info(f"🚀 Stub API listening on {server.base_url} ({server.config.describe()})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stub API stopped")
+    finally:
+        server.server_close()
+        logger.info(f"Requests served: {server.stats.requests} {server.stats.by_status}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedup_universities import UploadKeys, dedup_key, identity_key
+
+class IdentityKeyTest(unittest.TestCase):
+    def test_country_spellings_share_a_key(self):
+        for stored, converted in [('China (Mainland)', 'China'), ('United States of America', 'United States'),
+                                  ('Russian Federation', 'Russia'), ('Hong Kong SAR', 'Hong Kong')]:
+            self.assertEqual(identity_key('Sample University', stored),
+                             identity_key('Sample University', converted))
+            self.assertEqual(dedup_key('Sample University', stored), dedup_key('Sample University', converted))
+
+    def test_word_order_is_kept(self):
+        self.assertNotEqual(identity_key('Miami University', 'United States'),
+                            identity_key('University of Miami', 'United States'))
+
+    def test_upload_keys_skip_respelled_country(self):
+        keys = UploadKeys()
+        self.assertTrue(keys.add('Peking University', 'China (Mainland)', report=False))
+        self.assertFalse(keys.add('Peking University', 'China'))
+        self.assertTrue(keys.add('Peking University', 'Japan'))
+        self.assertEqual(keys.near_duplicates, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Indexed Query Engine for the University Dataset
+Loads universities_fixed.json once into hash, sorted and trigram indexes and
+answers filtered, sorted, paginated queries with the semantics of the
+getAllUniversities and searchUniversities endpoints. Also used as an oracle:
+the check command replays generated requests against an API and compares.
+"""
+
+import argparse
+import json
+import logging
+import re
+import time
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlparse
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Equality filters served by hash indexes; array columns match by containment
+HASH_FIELDS = ('country', 'type', 'region', 'state', 'campus_type', 'ranking_type', 'ranking_year', 'programs_offered')
+MULTI_VALUED_FIELDS = {'programs_offered'}
+
+# Range filters and sort keys served by sorted indexes
+SORTED_FIELDS = ('ranking', 'tuition_fee', 'acceptance_rate', 'min_gpa_required', 'student_population')
+
+# Columns matched by the ilike search of both endpoints
+TEXT_FIELDS = ('name', 'description', 'city')
+
+# Below this many candidates, verifying rows beats intersecting trigram postings
+TEXT_DRIVER_THRESHOLD = 64
+
+# Default and largest page of searchUniversities (SEARCH_MAX_LIMIT in universityController.js)
+SEARCH_MAX_LIMIT = 1000
+
+# ts_rank_cd weights of the name (A), city (B) and description (C) parts of the search vector
+SEARCH_WEIGHTS = (('name', 1.0), ('city', 0.4), ('description', 0.2))
+
+# getAllUniversities buckets for studentPopulation and acceptanceRate
+STUDENT_POPULATION_RANGES = {'small': (None, 15000), 'medium': (15001, 40000), 'large': (40001, None)}
+ACCEPTANCE_RATE_RANGES = {'low': (None, 10), 'medium': (11, 50), 'high': (51, None)}
+
+Range = Tuple[Optional[float], Optional[float]]
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def parse_int(value, fallback: int, low: int, high: int) -> int:
+    """parseBoundedInt of the API: JavaScript parseInt clamped to [low, high], fallback when not a number"""
+    match = re.match(r'\s*([+-]?\d+)', str(value)) if value is not None else None
+    return fallback if match is None else min(high, max(low, int(match.group(1))))
+
+def search_paging(params: Dict[str, str]) -> Tuple[int, int]:
+    """(page, limit) of a searchUniversities request"""
+    return (parse_int(params.get('page'), 1, 1, 2 ** 53 - 1),
+            parse_int(params.get('limit'), SEARCH_MAX_LIMIT, 1, SEARCH_MAX_LIMIT))
+
+def _words(text: str) -> List[str]:
+    return re.findall(r'\w+', (text or '').lower())
+
+def _pg_trigrams(text: str) -> set:
+    # pg_trgm pads every word with two spaces in front and one behind
+    return {gram for word in _words(text) for gram in _trigrams(f"  {word} ")}
+
+def search_relevance(record: Dict, query: str) -> float:
+    """Approximates the ORDER BY of search_universities: ts_rank_cd of the weighted
+    document plus pg_trgm similarity of the name. Query words found as whole words
+    in a part count with that part's weight; the SQL cover density is not modelled."""
+    words = set(_words(query))
+    rank = 0.0
+    if words:
+        for column, weight in SEARCH_WEIGHTS:
+            rank += weight * sum(word in words for word in _words(record.get(column))) / len(words)
+    name, wanted = _pg_trigrams(record.get('name')), _pg_trigrams(query)
+    union = name | wanted
+    return rank + (len(name & wanted) / len(union) if union else 0.0)
+
+def _sort_key(field: str, descending: bool) -> Callable[[Dict], tuple]:
+    # PostgreSQL puts NULLs last when ascending and first when descending
+    if descending:
+        return lambda r: (r.get(field) is not None, r.get(field) or 0)
+    return lambda r: (r.get(field) is None, r.get(field) or 0)
+
+class QueryResult:
+    def __init__(self, records: List[Dict], total: int, page: int, limit: int):
+        self.records = records
+        self.total = total
+        self.page = page
+        self.limit = limit
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+class UniversityIndex:
+    """In-memory indexes over a list of university records"""
+
+    def __init__(self, universities: List[Dict]):
+        # Positions follow the default API order (ranking, NULLs last), so
+        # sorting a candidate set of positions yields that order for free
+        self.records = sorted(universities, key=_sort_key('ranking', False))
+
+        self.hash: Dict[str, Dict[object, List[int]]] = {field: {} for field in HASH_FIELDS}
+        for pos, record in enumerate(self.records):
+            for field in HASH_FIELDS:
+                values = record.get(field)
+                if field not in MULTI_VALUED_FIELDS:
+                    values = [values]
+                for value in values or ():
+                    if value is not None:
+                        self.hash[field].setdefault(value, []).append(pos)
+
+        # Per field: values in ascending order with the matching positions
+        self.sorted: Dict[str, Tuple[List[float], List[int]]] = {}
+        for field in SORTED_FIELDS:
+            pairs = sorted((r[field], pos) for pos, r in enumerate(self.records) if r.get(field) is not None)
+            self.sorted[field] = ([value for value, _ in pairs], [pos for _, pos in pairs])
+
+        self.lowered = [tuple((r.get(field) or '').lower() for field in TEXT_FIELDS) for r in self.records]
+        self.trigrams: Dict[str, set] = {}
+        for pos, texts in enumerate(self.lowered):
+            for text in texts:
+                for gram in _trigrams(text):
+                    self.trigrams.setdefault(gram, set()).add(pos)
+
+    @classmethod
+    def from_file(cls, dataset_file: str) -> 'UniversityIndex':
+        with open(dataset_file, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def _range_positions(self, field: str, bounds: Range) -> List[int]:
+        values, positions = self.sorted[field]
+        low, high = bounds
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return positions[start:end]
+
+    def _range_size(self, field: str, bounds: Range) -> int:
+        values, _ = self.sorted[field]
+        low, high = bounds
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return max(0, end - start)
+
+    def _text_positions(self, term: str, program: Optional[str]) -> Iterable[int]:
+        grams = sorted((self.trigrams.get(g, set()) for g in _trigrams(term)), key=len)
+        if not grams:
+            return None  # shorter than a trigram; rows are verified instead
+        candidates = set.intersection(*grams) if len(grams) > 1 else set(grams[0])
+        if program is not None:
+            # programs_offered.cs is an exact, case-sensitive element match
+            candidates.update(self.hash['programs_offered'].get(program, ()))
+        return candidates
+
+    def _matches_text(self, pos: int, term: str, program: Optional[str]) -> bool:
+        if any(term in text for text in self.lowered[pos]):
+            return True
+        return program is not None and program in (self.records[pos].get('programs_offered') or [])
+
+    def _verify(self, candidates: Iterable[int], filters: Dict[str, object], ranges: Dict[str, Range],
+                term: Optional[str], program: Optional[str]) -> List[int]:
+        matched = []
+        for pos in candidates:
+            record = self.records[pos]
+            if any((v not in (record.get(f) or ())) if f in MULTI_VALUED_FIELDS else record.get(f) != v
+                   for f, v in filters.items()):
+                continue
+            if any(record.get(f) is None or (b[0] is not None and record[f] < b[0])
+                   or (b[1] is not None and record[f] > b[1]) for f, b in ranges.items()):
+                continue
+            if term and not self._matches_text(pos, term, program):
+                continue
+            matched.append(pos)
+        return matched
+
+    def query(self, filters: Optional[Dict[str, object]] = None, ranges: Optional[Dict[str, Range]] = None,
+              text: Optional[str] = None, text_programs: bool = False, sort: str = 'ranking',
+              descending: bool = False, page: int = 1, limit: int = 1000) -> QueryResult:
+        """Answer a conjunctive query.
+
+        ``filters`` are equality matches (containment for array columns),
+        ``ranges`` inclusive (low, high) bounds where None is open, and
+        ``text`` a case-insensitive substring of name, description or city;
+        with ``text_programs`` an exact programs_offered element also matches,
+        as in the search filter of getAllUniversities.
+        """
+        filters = {f: v for f, v in (filters or {}).items() if v is not None}
+        ranges = {f: b for f, b in (ranges or {}).items() if b != (None, None)}
+        term = text.lower() if text else None
+
+        # Drive the scan from the most selective index, verify the rest per row
+        sources = [(len(self.hash[f].get(v, ())), 'hash', f) for f, v in filters.items() if f in self.hash]
+        sources += [(self._range_size(f, b), 'range', f) for f, b in ranges.items() if f in self.sorted]
+        driver = min(sources, default=None)
+
+        if driver is None:
+            candidates: Iterable[int] = range(len(self.records))
+        elif driver[1] == 'hash':
+            candidates = self.hash[driver[2]].get(filters[driver[2]], ())
+        else:
+            candidates = self._range_positions(driver[2], ranges[driver[2]])
+
+        program = text if text_programs else None
+        if term and (driver is None or driver[0] > TEXT_DRIVER_THRESHOLD):
+            text_candidates = self._text_positions(term, program)
+            if text_candidates is not None and (driver is None or len(text_candidates) < driver[0]):
+                candidates = text_candidates
+
+        if len(filters) + len(ranges) + bool(term) <= 1 and (driver is not None or not term):
+            # The driving index alone answers the query
+            matched = list(candidates)
+        else:
+            matched = self._verify(candidates, filters, ranges, term, program)
+
+        offset = (page - 1) * limit
+        if sort == 'ranking' and not descending:
+            matched.sort()
+            page_records = [self.records[pos] for pos in matched[offset:offset + limit]]
+        else:
+            ordered = sorted((self.records[pos] for pos in matched), key=_sort_key(sort, descending),
+                             reverse=descending)
+            page_records = ordered[offset:offset + limit]
+        return QueryResult(page_records, len(matched), page, limit)
+
+    # Endpoint mirrors
+
+    def list_universities(self, params: Dict[str, str]) -> QueryResult:
+        """Mirror GET /api/universities query parameters (offset mode)"""
+        filters = {
+            'country': params.get('country') or None,
+            'state': params.get('state') or None,
+            'type': params.get('type') or None,
+            'region': params.get('region') or None,
+            'programs_offered': params.get('major') or None,
+            'ranking_type': params.get('rankingType') or None,
+            'campus_type': params.get('campusType') or None,
+        }
+        if params.get('rankingYear'):
+            filters['ranking_year'] = int(params['rankingYear'])
+        ranges = {}
+        if params.get('qsRankingRange', '').lstrip('-').isdigit():
+            ranges['ranking'] = (None, int(params['qsRankingRange']))
+        if params.get('studentPopulation') in STUDENT_POPULATION_RANGES:
+            ranges['student_population'] = STUDENT_POPULATION_RANGES[params['studentPopulation']]
+        if params.get('acceptanceRate') in ACCEPTANCE_RATE_RANGES:
+            ranges['acceptance_rate'] = ACCEPTANCE_RATE_RANGES[params['acceptanceRate']]
+        return self.query(filters, ranges, text=params.get('search') or None, text_programs=True,
+                          page=int(params.get('page', 1)), limit=int(params.get('limit', 1000)))
+
+    def search_universities(self, query: str, params: Dict[str, str]) -> QueryResult:
+        """Mirror GET /api/universities/search/:query (note: minRanking is an upper bound).
+
+        Matches are ordered by search_relevance, then ranking.
+        """
+        ranges = {}
+        if params.get('minRanking'):
+            ranges['ranking'] = (None, int(params['minRanking']))
+        if params.get('maxTuition'):
+            ranges['tuition_fee'] = (None, float(params['maxTuition']))
+        page, limit = search_paging(params)
+        matched = self.query({'country': params.get('country') or None}, ranges, text=query,
+                             limit=len(self.records) or 1).records
+        ranking = _sort_key('ranking', False)
+        matched.sort(key=lambda r: (-search_relevance(r, query), ranking(r)))
+        offset = (page - 1) * limit
+        return QueryResult(matched[offset:offset + limit], len(matched), page, limit)
+
+    def universities_by_country(self, country: str) -> List[Dict]:
+        return sorted((self.records[pos] for pos in self.hash['country'].get(country, ())),
+                      key=lambda r: r.get('name') or '')
+
+    def countries(self) -> List[str]:
+        return sorted(self.hash['country'])
+
+    def answer(self, path: str):
+        """Evaluate an API path against the indexes: returns (endpoint, expected result)"""
+        parsed = urlparse(path)
+        segments = [unquote(s) for s in parsed.path.strip('/').split('/')][2:]
+        params = dict(parse_qsl(parsed.query))
+        if not segments:
+            return 'list', self.list_universities(params)
+        if segments == ['countries']:
+            return 'countries', self.countries()
+        if segments[0] == 'country':
+            return 'country', self.universities_by_country(segments[1])
+        if segments[0] == 'search':
+            return 'search', self.search_universities(segments[1], params)
+        raise ValueError(f"Unsupported path: {path}")
+
+def _parse_bounds(specs: List[str], index: int, ranges: Dict[str, List]) -> None:
+    for spec in specs or []:
+        field, _, value = spec.partition('=')
+        if field not in SORTED_FIELDS:
+            raise ValueError(f"'{field}' has no sorted index (expected one of {', '.join(SORTED_FIELDS)})")
+        ranges.setdefault(field, [None, None])[index] = float(value)
+
+def _ranked_groups(records: List[Dict]) -> Dict[object, set]:
+    groups: Dict[object, set] = {}
+    for record in records:
+        groups.setdefault(record.get('ranking'), set()).add(record['name'])
+    return groups
+
+def compare(endpoint: str, expected, actual: Dict) -> Optional[str]:
+    """Return a description of the difference between oracle and API, or None"""
+    if endpoint == 'countries':
+        return None if actual.get('countries') == expected else "country lists differ"
+
+    got = actual.get('universities', [])
+    if endpoint == 'country':
+        want = [r['name'] for r in expected]
+        return None if [r['name'] for r in got] == want else f"expected {len(want)} names in order, got {len(got)}"
+
+    records = expected.records
+    if endpoint == 'list':
+        total = actual.get('pagination', {}).get('totalItems')
+        if total is not None and total != expected.total:
+            return f"totalItems {total} != {expected.total}"
+        if [r.get('ranking') for r in got] != [r.get('ranking') for r in records]:
+            return "ranking order differs"
+        # Rows tied on ranking may come back in any order, so a tie group cut
+        # by the page boundary can legitimately hold different names
+        want_groups, got_groups = _ranked_groups(records), _ranked_groups(got)
+        edges = {records[0].get('ranking'), records[-1].get('ranking')} if records else set()
+        for ranking, names in want_groups.items():
+            if ranking not in edges and got_groups.get(ranking) != names:
+                return f"names differ at ranking {ranking}"
+        return None
+
+    # search: the live API also matches whole words through full-text search
+    # and its relevance order is only approximated here, so the check is that a
+    # first page holding every API match also holds every ilike match
+    want = {r['name'] for r in records}
+    have = {r['name'] for r in got}
+    complete = not actual.get('pagination', {}).get('hasMore', len(got) >= expected.limit)
+    if expected.page == 1 and complete and not want <= have:
+        return f"missing {len(want - have)} expected results"
+    return None
+
+def run_check(index: UniversityIndex, base_url: str, queries: int, seed: int) -> int:
+    """Replay generated read requests against an API; returns the mismatch count"""
+    import requests
+    from load_generator import DEFAULT_MIX, QueryMix
+
+    mix = QueryMix(index.records, DEFAULT_MIX, seed=seed)
+    session = requests.Session()
+    mismatches = 0
+    for _ in range(queries):
+        _, path = mix.next_request()
+        endpoint, expected = index.answer(path)
+        response = session.get(f"{base_url}{path}")
+        if response.status_code != 200:
+            logger.error(f"❌ {path}: HTTP {response.status_code}")
+            mismatches += 1
+            continue
+        problem = compare(endpoint, expected, response.json())
+        if problem:
+            logger.error(f"❌ {path}: {problem}")
+            mismatches += 1
+    return mismatches
+
+def run_bench(index: UniversityIndex, queries: int, seed: int) -> Dict[str, float]:
+    """Mean microseconds per generated query, per endpoint"""
+    from load_generator import DEFAULT_MIX, QueryMix
+
+    mix = QueryMix(index.records, DEFAULT_MIX, seed=seed)
+    requests_by_endpoint: Dict[str, List[str]] = {}
+    for _ in range(queries):
+        endpoint, path = mix.next_request()
+        requests_by_endpoint.setdefault(endpoint, []).append(path)
+
+    timings = {}
+    for endpoint, paths in requests_by_endpoint.items():
+        start = time.perf_counter()
+        for path in paths:
+            index.answer(path)
+        timings[endpoint] = (time.perf_counter() - start) / len(paths) * 1e6
+    return timings
+
+def main():
+    """Query the dataset, benchmark the indexes or check an API against them"""
+    parser = argparse.ArgumentParser(description="Indexed queries over the university dataset")
+    parser.add_argument('--dataset', default='universities_fixed.json')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    query_parser = subparsers.add_parser('query', help="run one query and print the matches")
+    query_parser.add_argument('--eq', action='append', metavar='FIELD=VALUE',
+                              help=f"equality filter on {', '.join(HASH_FIELDS)}")
+    query_parser.add_argument('--min', action='append', metavar='FIELD=VALUE', help="inclusive lower bound")
+    query_parser.add_argument('--max', action='append', metavar='FIELD=VALUE', help="inclusive upper bound")
+    query_parser.add_argument('--search', help="substring of name, description or city")
+    query_parser.add_argument('--sort', default='ranking', help="sort field, suffix :desc for descending")
+    query_parser.add_argument('--page', type=int, default=1)
+    query_parser.add_argument('--limit', type=int, default=20)
+    query_parser.add_argument('--json', action='store_true', help="print full records as JSON")
+
+    bench_parser = subparsers.add_parser('bench', help="time generated queries against the indexes")
+    bench_parser.add_argument('--queries', type=int, default=10000)
+    bench_parser.add_argument('--seed', type=int, default=1)
+
+    check_parser = subparsers.add_parser('check', help="compare an API's answers with the indexes")
+    check_parser.add_argument('--base-url', default='http://localhost:8000')
+    check_parser.add_argument('--stub', action='store_true', help="check a local stub API loaded with the dataset")
+    check_parser.add_argument('--queries', type=int, default=500)
+    check_parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = UniversityIndex.from_file(args.dataset)
+    logger.info(f"📚 Indexed {len(index.records)} universities in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if args.command == 'query':
+        filters = {}
+        for spec in args.eq or []:
+            field, _, value = spec.partition('=')
+            if field not in HASH_FIELDS:
+                parser.error(f"'{field}' has no hash index (expected one of {', '.join(HASH_FIELDS)})")
+            filters[field] = int(value) if field == 'ranking_year' else value
+        ranges: Dict[str, List] = {}
+        try:
+            _parse_bounds(args.min, 0, ranges)
+            _parse_bounds(args.max, 1, ranges)
+        except ValueError as e:
+            parser.error(str(e))
+        sort, _, direction = args.sort.partition(':')
+
+        start = time.perf_counter()
+        result = index.query(filters, {f: tuple(b) for f, b in ranges.items()}, text=args.search,
+                             sort=sort, descending=direction == 'desc', page=args.page, limit=args.limit)
+        elapsed_us = (time.perf_counter() - start) * 1e6
+
+        if args.json:
+            print(json.dumps(result.records, indent=2, ensure_ascii=False))
+        else:
+            for record in result:
+                print(f"{str(record.get('ranking')):>6}  {record['name'][:60]:<60}  {record.get('country') or '':<20}"
+                      f"{record.get('tuition_fee')}")
+        logger.info(f"🔎 {result.total} matches, showing {len(result)} (page {result.page}) in {elapsed_us:.0f} µs")
+
+    elif args.command == 'bench':
+        for endpoint, micros in run_bench(index, args.queries, args.seed).items():
+            logger.info(f"⏱️  {endpoint:<10} {micros:>10.1f} µs/query")
+
+    else:
+        server = None
+        base_url = args.base_url
+        if args.stub:
+            from stub_api_server import StubConfig, start_stub_server
+            server = start_stub_server(StubConfig())
+            server.store.load(index.records)
+            # The stub rejects duplicate names and invalid records, so index what it holds
+            index = UniversityIndex(server.store.snapshot())
+            base_url = server.base_url
+        try:
+            mismatches = run_check(index, base_url, args.queries, args.seed)
+        finally:
+            if server:
+                server.shutdown()
+                server.server_close()
+        if mismatches:
+            logger.error(f"❌ {mismatches} of {args.queries} responses differ from the oracle")
+            raise SystemExit(1)
+        logger.info(f"✅ All {args.queries} responses match the oracle")
+
+if __name__ == "__main__":
+    main()
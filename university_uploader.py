@@ -5,14 +5,19 @@ Converts Excel file to JSON and uploads university data to EduSmart API
 """
 
 import pandas as pd
+import argparse
 import requests
 import json
 import time
 import random
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from gazetteer import infer_location
+from fast_logging import RECORD_LOG, add_logging_arguments, configure_logging, track
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -55,150 +60,130 @@ class UniversityUploader:
         image_id = random.choice(image_ids)
         return f"https://picsum.photos/800/600?random={image_id}"
     
-    def extract_country_from_name(self, university_name: str) -> str:
-        """Extract country from university name patterns"""
-        country_patterns = {
-            'University of California': 'United States',
-            'MIT': 'United States',
-            'Harvard': 'United States',
-            'Stanford': 'United States',
-            'University of Oxford': 'United Kingdom',
-            'University of Cambridge': 'United Kingdom',
-            'Imperial College': 'United Kingdom',
-            'ETH Zurich': 'Switzerland',
-            'NTU': 'Singapore',
-            'NUS': 'Singapore',
-            'University of Tokyo': 'Japan',
-            'Tsinghua': 'China',
-            'Peking University': 'China',
-            'University of Toronto': 'Canada',
-            'McGill': 'Canada',
-            'University of Melbourne': 'Australia',
-            'University of Sydney': 'Australia',
-        }
+    def extract_location_from_name(self, university_name: str) -> Tuple[str, str]:
+        """Country and city inferred from the university name by the gazetteer"""
+        location = infer_location(university_name)
+        if location is None:
+            return 'United States', "Main Campus"  # Default
+        return location.country, location.city or "Main Campus"
+    
+    def build_university_record(self, row, index: int) -> Optional[Dict]:
+        """Build a comprehensive university record for one workbook row"""
+        # The first column should be the university name
+        university_name = self.clean_text(row.iloc[0])
+        if not university_name:
+            return None
         
-        for pattern, country in country_patterns.items():
-            if pattern.lower() in university_name.lower():
-                return country
+        # Extract description from second column if available
+        description = ""
+        if len(row) > 1 and not pd.isna(row.iloc[1]):
+            description = self.clean_text(row.iloc[1])
         
-        # Default countries based on common patterns
-        if any(word in university_name.lower() for word in ['university of', 'college of']):
-            return 'United States'
-        elif 'université' in university_name.lower():
-            return 'France'
-        elif 'universität' in university_name.lower():
-            return 'Germany'
-        elif 'università' in university_name.lower():
-            return 'Italy'
+        country, city = self.extract_location_from_name(university_name)
+        
+        # Generate a comprehensive university record
+        university_data = {
+            "uid": self.admin_uid,
+            "name": university_name,
+            "description": description or f"{university_name} is a prestigious institution of higher education known for its academic excellence and research contributions.",
+            "country": country,
+            "city": city,
+            "state": "",
+            "address": f"{university_name} Campus, Main Street",
+            "website": f"https://{university_name.lower().replace(' ', '').replace('university', 'uni').replace('college', 'col')}edu.edu",
+            "contact_email": f"admissions@{university_name.lower().replace(' ', '').replace('university', 'uni')}edu.edu",
+            "contact_phone": f"+1-{random.randint(100, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
+            "established_year": random.randint(1850, 2000),
+            "type": random.choice(["Public", "Private", "Public Research", "Private Research"]),
+            "ranking": index + 1,  # Use the row index as ranking
+            "tuition_fee": random.randint(20000, 80000),
+            "application_fee": random.randint(50, 200),
+            "acceptance_rate": round(random.uniform(10.0, 70.0), 1),
+            "student_population": random.randint(5000, 50000),
+            "faculty_count": random.randint(200, 2000),
+            "programs_offered": [
+                "Computer Science", "Engineering", "Business Administration", 
+                "Medicine", "Law", "Arts and Sciences", "Social Sciences"
+            ],
+            "facilities": [
+                "Library", "Sports Complex", "Research Centers", "Student Housing",
+                "Dining Halls", "Medical Center", "Career Services"
+            ],
+            "image": self.generate_image_url(),
+            "logo": self.generate_logo_url(university_name),
+            "gallery": [
+                self.generate_image_url(),
+                self.generate_image_url(),
+                self.generate_image_url()
+            ],
+            "campus_size": f"{random.randint(100, 1000)} acres",
+            "campus_type": random.choice(["Urban", "Suburban", "Rural"]),
+            "accreditation": "Fully Accredited",
+            "notable_alumni": [],
+            "keywords": [university_name.lower(), "university", "education", "research"],
+            "region": "North America",  # Default region
+            "ranking_type": "QS World University Rankings",
+            "ranking_year": 2026,
+            
+            # Admission requirements
+            "min_gpa_required": round(random.uniform(2.5, 4.0), 1),
+            "sat_score_required": f"{random.randint(1200, 1600)}",
+            "act_score_required": f"{random.randint(25, 36)}",
+            "ielts_score_required": f"{random.uniform(6.0, 8.0):.1f}",
+            "toefl_score_required": f"{random.randint(80, 120)}",
+            "gre_score_required": f"{random.randint(300, 340)}",
+            "gmat_score_required": f"{random.randint(500, 800)}",
+            
+            # Application deadlines
+            "application_deadline_fall": "August 1st",
+            "application_deadline_spring": "December 1st",
+            "application_deadline_summer": "April 1st",
+            
+            # Financial information
+            "tuition_fee_graduate": random.randint(25000, 90000),
+            "scholarship_available": True,
+            "financial_aid_available": True,
+            
+            # Additional admission requirements
+            "application_requirements": [
+                "Transcripts", "Letters of Recommendation", "Personal Statement",
+                "Application Form", "Application Fee"
+            ],
+            "admission_essay_required": True,
+            "letters_of_recommendation_required": random.randint(2, 3),
+            "interview_required": random.choice([True, False]),
+            "work_experience_required": False,
+            "portfolio_required": random.choice([True, False])
+        }
         
-        return 'United States'  # Default
+        return university_data
     
     def convert_excel_to_json(self, excel_file: str, output_file: str = 'universities.json') -> List[Dict]:
         """Convert Excel file to JSON format suitable for API upload"""
         logger.info(f"Reading Excel file: {excel_file}")
         
         # Read the Excel file
-        df = pd.read_excel(excel_file)
+        with profile_stage('read_excel'):
+            df = pd.read_excel(excel_file)
         logger.info(f"Loaded {len(df)} universities from Excel")
         
         universities = []
         
-        for index, row in df.iterrows():
-            try:
-                # The first column should be the university name
-                university_name = self.clean_text(row.iloc[0])
-                if not university_name:
-                    continue
-                
-                # Extract description from second column if available
-                description = ""
-                if len(row) > 1 and not pd.isna(row.iloc[1]):
-                    description = self.clean_text(row.iloc[1])
-                
-                # Generate a comprehensive university record
-                university_data = {
-                    "uid": self.admin_uid,
-                    "name": university_name,
-                    "description": description or f"{university_name} is a prestigious institution of higher education known for its academic excellence and research contributions.",
-                    "country": self.extract_country_from_name(university_name),
-                    "city": "Main Campus",  # Default city
-                    "state": "",
-                    "address": f"{university_name} Campus, Main Street",
-                    "website": f"https://{university_name.lower().replace(' ', '').replace('university', 'uni').replace('college', 'col')}edu.edu",
-                    "contact_email": f"admissions@{university_name.lower().replace(' ', '').replace('university', 'uni')}edu.edu",
-                    "contact_phone": f"+1-{random.randint(100, 999)}-{random.randint(100, 999)}-{random.randint(1000, 9999)}",
-                    "established_year": random.randint(1850, 2000),
-                    "type": random.choice(["Public", "Private", "Public Research", "Private Research"]),
-                    "ranking": index + 1,  # Use the row index as ranking
-                    "tuition_fee": random.randint(20000, 80000),
-                    "application_fee": random.randint(50, 200),
-                    "acceptance_rate": round(random.uniform(10.0, 70.0), 1),
-                    "student_population": random.randint(5000, 50000),
-                    "faculty_count": random.randint(200, 2000),
-                    "programs_offered": [
-                        "Computer Science", "Engineering", "Business Administration", 
-                        "Medicine", "Law", "Arts and Sciences", "Social Sciences"
-                    ],
-                    "facilities": [
-                        "Library", "Sports Complex", "Research Centers", "Student Housing",
-                        "Dining Halls", "Medical Center", "Career Services"
-                    ],
-                    "image": self.generate_image_url(),
-                    "logo": self.generate_logo_url(university_name),
-                    "gallery": [
-                        self.generate_image_url(),
-                        self.generate_image_url(),
-                        self.generate_image_url()
-                    ],
-                    "campus_size": f"{random.randint(100, 1000)} acres",
-                    "campus_type": random.choice(["Urban", "Suburban", "Rural"]),
-                    "accreditation": "Fully Accredited",
-                    "notable_alumni": [],
-                    "keywords": [university_name.lower(), "university", "education", "research"],
-                    "region": "North America",  # Default region
-                    "ranking_type": "QS World University Rankings",
-                    "ranking_year": 2026,
-                    
-                    # Admission requirements
-                    "min_gpa_required": round(random.uniform(2.5, 4.0), 1),
-                    "sat_score_required": f"{random.randint(1200, 1600)}",
-                    "act_score_required": f"{random.randint(25, 36)}",
-                    "ielts_score_required": f"{random.uniform(6.0, 8.0):.1f}",
-                    "toefl_score_required": f"{random.randint(80, 120)}",
-                    "gre_score_required": f"{random.randint(300, 340)}",
-                    "gmat_score_required": f"{random.randint(500, 800)}",
-                    
-                    # Application deadlines
-                    "application_deadline_fall": "August 1st",
-                    "application_deadline_spring": "December 1st",
-                    "application_deadline_summer": "April 1st",
+        with profile_stage('convert_rows'):
+            for index, row in df.iterrows():
+                try:
+                    university_data = self.build_university_record(row, index)
+                    if university_data:
+                        universities.append(university_data)
                     
-                    # Financial information
-                    "tuition_fee_graduate": random.randint(25000, 90000),
-                    "scholarship_available": True,
-                    "financial_aid_available": True,
-                    
-                    # Additional admission requirements
-                    "application_requirements": [
-                        "Transcripts", "Letters of Recommendation", "Personal Statement",
-                        "Application Form", "Application Fee"
-                    ],
-                    "admission_essay_required": True,
-                    "letters_of_recommendation_required": random.randint(2, 3),
-                    "interview_required": random.choice([True, False]),
-                    "work_experience_required": False,
-                    "portfolio_required": random.choice([True, False])
-                }
-                
-                universities.append(university_data)
-                
-            except Exception as e:
-                logger.error(f"Error processing row {index}: {e}")
-                continue
+                except Exception as e:
+                    RECORD_LOG.error("Error processing row %s: %s", index, e)
+                    continue
         
         # Save to JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(universities, f, indent=2, ensure_ascii=False)
+        with profile_stage('write_json'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(universities, f, indent=2, ensure_ascii=False)
         
         logger.info(f"Converted {len(universities)} universities to JSON format")
         logger.info(f"Saved to: {output_file}")
@@ -210,20 +195,21 @@ class UniversityUploader:
         try:
             url = f"{self.api_base_url}/api/universities"
             
-            logger.info(f"Uploading: {university_data['name']}")
+            RECORD_LOG.info("Uploading: %s", university_data['name'])
             
-            response = self.session.post(url, json=university_data)
+            with profile_stage('network'):
+                response = self.session.post(url, json=university_data)
             
             if response.status_code == 201:
-                logger.info(f"✅ Successfully uploaded: {university_data['name']}")
+                RECORD_LOG.info("✅ Successfully uploaded: %s", university_data['name'])
                 return True
             else:
-                logger.error(f"❌ Failed to upload {university_data['name']}: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                RECORD_LOG.error("❌ Failed to upload %s: %s", university_data['name'], response.status_code)
+                RECORD_LOG.error("Response: %s", response.text)
                 return False
                 
         except Exception as e:
-            logger.error(f"❌ Error uploading {university_data['name']}: {e}")
+            RECORD_LOG.error("❌ Error uploading %s: %s", university_data['name'], e)
             return False
     
     def upload_all_universities(self, universities: List[Dict], delay: float = 1.0) -> Dict:
@@ -236,8 +222,9 @@ class UniversityUploader:
             'errors': []
         }
         
+        progress = track(len(universities), 'universities')
         for i, university in enumerate(universities, 1):
-            logger.info(f"Processing {i}/{len(universities)}: {university['name']}")
+            RECORD_LOG.info("Processing %d/%d: %s", i, len(universities), university['name'])
             
             success = self.upload_university(university)
             
@@ -246,11 +233,14 @@ class UniversityUploader:
             else:
                 results['failed'] += 1
                 results['errors'].append(university['name'])
+            progress.advance('successful' if success else 'failed')
             
             # Rate limiting - wait between requests
             if delay > 0:
-                time.sleep(delay)
+                with profile_stage('delay'):
+                    time.sleep(delay)
         
+        progress.finish()
         logger.info(f"Upload complete! Successful: {results['successful']}, Failed: {results['failed']}")
         
         if results['errors']:
@@ -260,6 +250,12 @@ class UniversityUploader:
 
 def main():
     """Main function to run the university uploader"""
+    parser = argparse.ArgumentParser(description="Convert the QS ranking workbook to JSON and upload it")
+    add_profile_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+    configure_logging(args)
     
     # Configuration
     EXCEL_FILE = "2026 QS Ranking 1000.xlsx"
@@ -275,7 +271,8 @@ def main():
     try:
         # Step 1: Convert Excel to JSON
         logger.info("Step 1: Converting Excel to JSON...")
-        universities = uploader.convert_excel_to_json(EXCEL_FILE, JSON_OUTPUT)
+        with profile_stage('convert'):
+            universities = uploader.convert_excel_to_json(EXCEL_FILE, JSON_OUTPUT)
         
         if not universities:
             logger.error("No universities found in Excel file!")
@@ -318,6 +315,8 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         raise
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
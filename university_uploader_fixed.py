@@ -6,6 +6,7 @@ Properly handles transposed Excel structure where universities are columns
 """
 
 import pandas as pd
+import argparse
 import requests
 import json
 import time
@@ -14,14 +15,20 @@ import re
 from typing import Dict, List, Optional
 import logging
 
+from fast_logging import RECORD_LOG, add_logging_arguments, configure_logging, track
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class UniversityUploaderFixed:
-    def __init__(self, api_base_url: str = "http://localhost:8000", admin_uid: str = "admin_uid_here"):
+    def __init__(self, api_base_url: str = "http://localhost:8000", admin_uid: str = "admin_uid_here",
+                 ranking_year: int = 2026):
         self.api_base_url = api_base_url
         self.admin_uid = admin_uid
+        # Year of the ranking edition, for workbooks without a ranking_year row
+        self.ranking_year = ranking_year
         self.session = requests.Session()
         self.session.headers.update({
             'Content-Type': 'application/json',
@@ -103,12 +110,87 @@ class UniversityUploaderFixed:
         else:
             return [value_str] if value_str else default_list
     
-    def convert_excel_to_json(self, excel_file: str, output_file: str = 'universities_fixed.json') -> List[Dict]:
-        """Convert Excel file to JSON format suitable for API upload"""
+    def build_university_record(self, university_data_raw: Dict, col_idx: int) -> Optional[Dict]:
+        """Build the standardized university record for one workbook column"""
+        # Extract the university name (should be in the 'name' field)
+        university_name = self.clean_text(university_data_raw.get('name', ''))
+        if not university_name:
+            RECORD_LOG.warning("No name found for column %d, skipping", col_idx)
+            return None
+        
+        RECORD_LOG.info("Processing university: %s", university_name)
+        
+        # Build the standardized university record
+        university_data = {
+            "uid": self.admin_uid,
+            "name": university_name,
+            "description": self.clean_text(university_data_raw.get('description', f"{university_name} is a prestigious institution of higher education.")),
+            "country": self.clean_text(university_data_raw.get('country', 'United States')),
+            "city": self.clean_text(university_data_raw.get('city', 'Main Campus')),
+            "state": self.clean_text(university_data_raw.get('state', '')),
+            "address": self.clean_text(university_data_raw.get('address', f"{university_name} Campus")),
+            "website": self.clean_text(university_data_raw.get('website', f"https://www.{university_name.lower().replace(' ', '').replace('university', 'uni')[:20]}.edu")),
+            "contact_email": self.clean_text(university_data_raw.get('contact_email', f"info@{university_name.lower().replace(' ', '')[:10]}.edu")),
+            "contact_phone": self.clean_text(university_data_raw.get('contact_phone', f"+1-{random.randint(100,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}")),
+            "established_year": self.safe_convert_to_int(university_data_raw.get('established_year'), random.randint(1850, 2000)),
+            "type": self.clean_text(university_data_raw.get('type', random.choice(["Public", "Private", "Public Research", "Private Research"]))),
+            "ranking": self.safe_convert_to_int(university_data_raw.get('ranking'), col_idx),
+            "tuition_fee": self.safe_convert_to_int(university_data_raw.get('tuition_fee'), random.randint(20000, 80000)),
+            "application_fee": self.safe_convert_to_int(university_data_raw.get('application_fee'), random.randint(50, 200)),
+            "acceptance_rate": self.safe_convert_to_float(university_data_raw.get('acceptance_rate'), round(random.uniform(10.0, 70.0), 1)),
+            "student_population": self.safe_convert_to_int(university_data_raw.get('student_population'), random.randint(5000, 50000)),
+            "faculty_count": self.safe_convert_to_int(university_data_raw.get('faculty_count'), random.randint(200, 2000)),
+            "programs_offered": self.parse_list_field(university_data_raw.get('programs_offered'), ["Computer Science", "Engineering", "Business", "Medicine", "Law"]),
+            "facilities": self.parse_list_field(university_data_raw.get('facilities'), ["Library", "Sports Complex", "Research Centers", "Student Housing"]),
+            "image": self.clean_text(university_data_raw.get('image', self.generate_image_url())),
+            "logo": self.clean_text(university_data_raw.get('logo', self.generate_logo_url(university_name))),
+            "gallery": self.parse_list_field(university_data_raw.get('gallery'), [self.generate_image_url(), self.generate_image_url(), self.generate_image_url()]),
+            "campus_size": self.clean_text(university_data_raw.get('campus_size', f"{random.randint(100, 1000)} acres")),
+            "campus_type": self.clean_text(university_data_raw.get('campus_type', random.choice(["Urban", "Suburban", "Rural"]))),
+            "accreditation": self.clean_text(university_data_raw.get('accreditation', 'Fully Accredited')),
+            "notable_alumni": self.parse_list_field(university_data_raw.get('notable_alumni'), []),
+            "keywords": self.parse_list_field(university_data_raw.get('keywords'), [university_name.lower(), "university", "education"]),
+            "region": self.clean_text(university_data_raw.get('region', 'Global')),
+            "ranking_type": self.clean_text(university_data_raw.get('ranking_type', 'QS World University Rankings')),
+            "ranking_year": self.safe_convert_to_int(university_data_raw.get('ranking_year'), self.ranking_year),
+            
+            # Admission requirements
+            "min_gpa_required": self.safe_convert_to_float(university_data_raw.get('min_gpa_required'), round(random.uniform(2.5, 4.0), 1)),
+            "sat_score_required": str(self.safe_convert_to_int(university_data_raw.get('sat_score_required'), random.randint(1200, 1600))),
+            "act_score_required": str(self.safe_convert_to_int(university_data_raw.get('act_score_required'), random.randint(25, 36))),
+            "ielts_score_required": str(self.safe_convert_to_float(university_data_raw.get('ielts_score_required'), round(random.uniform(6.0, 8.0), 1))),
+            "toefl_score_required": str(self.safe_convert_to_int(university_data_raw.get('toefl_score_required'), random.randint(80, 120))),
+            "gre_score_required": str(self.safe_convert_to_int(university_data_raw.get('gre_score_required'), random.randint(300, 340))),
+            "gmat_score_required": str(self.safe_convert_to_int(university_data_raw.get('gmat_score_required'), random.randint(500, 800))),
+            
+            # Application deadlines
+            "application_deadline_fall": self.clean_text(university_data_raw.get('application_deadline_fall', 'August 1st')),
+            "application_deadline_spring": self.clean_text(university_data_raw.get('application_deadline_spring', 'December 1st')),
+            "application_deadline_summer": self.clean_text(university_data_raw.get('application_deadline_summer', 'April 1st')),
+            
+            # Financial information
+            "tuition_fee_graduate": self.safe_convert_to_int(university_data_raw.get('tuition_fee_graduate'), random.randint(25000, 90000)),
+            "scholarship_available": self.safe_convert_to_bool(university_data_raw.get('scholarship_available'), True),
+            "financial_aid_available": self.safe_convert_to_bool(university_data_raw.get('financial_aid_available'), True),
+            
+            # Additional admission requirements
+            "application_requirements": self.parse_list_field(university_data_raw.get('application_requirements'), ["Transcripts", "Letters of Recommendation", "Personal Statement"]),
+            "admission_essay_required": self.safe_convert_to_bool(university_data_raw.get('admission_essay_required'), True),
+            "letters_of_recommendation_required": self.safe_convert_to_int(university_data_raw.get('letters_of_recommendation_required'), random.randint(2, 3)),
+            "interview_required": self.safe_convert_to_bool(university_data_raw.get('interview_required'), random.choice([True, False])),
+            "work_experience_required": self.safe_convert_to_bool(university_data_raw.get('work_experience_required'), False),
+            "portfolio_required": self.safe_convert_to_bool(university_data_raw.get('portfolio_required'), random.choice([True, False]))
+        }
+        
+        return university_data
+    
+    def convert_excel(self, excel_file: str) -> List[Dict]:
+        """Convert every university column of the workbook to an API record"""
         logger.info(f"Reading Excel file: {excel_file}")
         
         # Read the Excel file
-        df = pd.read_excel(excel_file)
+        with profile_stage('read_excel'):
+            df = pd.read_excel(excel_file)
         logger.info(f"Excel shape: {df.shape}")
         logger.info(f"Columns (first 5): {list(df.columns[:5])}")
         
@@ -120,95 +202,35 @@ class UniversityUploaderFixed:
         universities = []
         
         # Skip the first column (Field names) and process each university column
-        for col_idx in range(1, len(df.columns)):
-            try:
-                university_column = df.iloc[:, col_idx]
-                
-                # Create a mapping of field name to value
-                university_data_raw = {}
-                for row_idx, field_name in enumerate(field_names):
-                    if row_idx < len(university_column):
-                        university_data_raw[field_name] = university_column.iloc[row_idx]
-                
-                # Extract the university name (should be in the 'name' field)
-                university_name = self.clean_text(university_data_raw.get('name', ''))
-                if not university_name:
-                    logger.warning(f"No name found for column {col_idx}, skipping")
-                    continue
-                
-                logger.info(f"Processing university: {university_name}")
-                
-                # Build the standardized university record
-                university_data = {
-                    "uid": self.admin_uid,
-                    "name": university_name,
-                    "description": self.clean_text(university_data_raw.get('description', f"{university_name} is a prestigious institution of higher education.")),
-                    "country": self.clean_text(university_data_raw.get('country', 'United States')),
-                    "city": self.clean_text(university_data_raw.get('city', 'Main Campus')),
-                    "state": self.clean_text(university_data_raw.get('state', '')),
-                    "address": self.clean_text(university_data_raw.get('address', f"{university_name} Campus")),
-                    "website": self.clean_text(university_data_raw.get('website', f"https://www.{university_name.lower().replace(' ', '').replace('university', 'uni')[:20]}.edu")),
-                    "contact_email": self.clean_text(university_data_raw.get('contact_email', f"info@{university_name.lower().replace(' ', '')[:10]}.edu")),
-                    "contact_phone": self.clean_text(university_data_raw.get('contact_phone', f"+1-{random.randint(100,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}")),
-                    "established_year": self.safe_convert_to_int(university_data_raw.get('established_year'), random.randint(1850, 2000)),
-                    "type": self.clean_text(university_data_raw.get('type', random.choice(["Public", "Private", "Public Research", "Private Research"]))),
-                    "ranking": self.safe_convert_to_int(university_data_raw.get('ranking'), col_idx),
-                    "tuition_fee": self.safe_convert_to_int(university_data_raw.get('tuition_fee'), random.randint(20000, 80000)),
-                    "application_fee": self.safe_convert_to_int(university_data_raw.get('application_fee'), random.randint(50, 200)),
-                    "acceptance_rate": self.safe_convert_to_float(university_data_raw.get('acceptance_rate'), round(random.uniform(10.0, 70.0), 1)),
-                    "student_population": self.safe_convert_to_int(university_data_raw.get('student_population'), random.randint(5000, 50000)),
-                    "faculty_count": self.safe_convert_to_int(university_data_raw.get('faculty_count'), random.randint(200, 2000)),
-                    "programs_offered": self.parse_list_field(university_data_raw.get('programs_offered'), ["Computer Science", "Engineering", "Business", "Medicine", "Law"]),
-                    "facilities": self.parse_list_field(university_data_raw.get('facilities'), ["Library", "Sports Complex", "Research Centers", "Student Housing"]),
-                    "image": self.clean_text(university_data_raw.get('image', self.generate_image_url())),
-                    "logo": self.clean_text(university_data_raw.get('logo', self.generate_logo_url(university_name))),
-                    "gallery": self.parse_list_field(university_data_raw.get('gallery'), [self.generate_image_url(), self.generate_image_url(), self.generate_image_url()]),
-                    "campus_size": self.clean_text(university_data_raw.get('campus_size', f"{random.randint(100, 1000)} acres")),
-                    "campus_type": self.clean_text(university_data_raw.get('campus_type', random.choice(["Urban", "Suburban", "Rural"]))),
-                    "accreditation": self.clean_text(university_data_raw.get('accreditation', 'Fully Accredited')),
-                    "notable_alumni": self.parse_list_field(university_data_raw.get('notable_alumni'), []),
-                    "keywords": self.parse_list_field(university_data_raw.get('keywords'), [university_name.lower(), "university", "education"]),
-                    "region": self.clean_text(university_data_raw.get('region', 'Global')),
-                    "ranking_type": self.clean_text(university_data_raw.get('ranking_type', 'QS World University Rankings')),
-                    "ranking_year": self.safe_convert_to_int(university_data_raw.get('ranking_year'), 2026),
+        with profile_stage('convert_columns'):
+            for col_idx in range(1, len(df.columns)):
+                try:
+                    university_column = df.iloc[:, col_idx]
                     
-                    # Admission requirements
-                    "min_gpa_required": self.safe_convert_to_float(university_data_raw.get('min_gpa_required'), round(random.uniform(2.5, 4.0), 1)),
-                    "sat_score_required": str(self.safe_convert_to_int(university_data_raw.get('sat_score_required'), random.randint(1200, 1600))),
-                    "act_score_required": str(self.safe_convert_to_int(university_data_raw.get('act_score_required'), random.randint(25, 36))),
-                    "ielts_score_required": str(self.safe_convert_to_float(university_data_raw.get('ielts_score_required'), round(random.uniform(6.0, 8.0), 1))),
-                    "toefl_score_required": str(self.safe_convert_to_int(university_data_raw.get('toefl_score_required'), random.randint(80, 120))),
-                    "gre_score_required": str(self.safe_convert_to_int(university_data_raw.get('gre_score_required'), random.randint(300, 340))),
-                    "gmat_score_required": str(self.safe_convert_to_int(university_data_raw.get('gmat_score_required'), random.randint(500, 800))),
+                    # Create a mapping of field name to value
+                    university_data_raw = {}
+                    for row_idx, field_name in enumerate(field_names):
+                        if row_idx < len(university_column):
+                            university_data_raw[field_name] = university_column.iloc[row_idx]
                     
-                    # Application deadlines
-                    "application_deadline_fall": self.clean_text(university_data_raw.get('application_deadline_fall', 'August 1st')),
-                    "application_deadline_spring": self.clean_text(university_data_raw.get('application_deadline_spring', 'December 1st')),
-                    "application_deadline_summer": self.clean_text(university_data_raw.get('application_deadline_summer', 'April 1st')),
+                    university_data = self.build_university_record(university_data_raw, col_idx)
+                    if university_data:
+                        universities.append(university_data)
                     
-                    # Financial information
-                    "tuition_fee_graduate": self.safe_convert_to_int(university_data_raw.get('tuition_fee_graduate'), random.randint(25000, 90000)),
-                    "scholarship_available": self.safe_convert_to_bool(university_data_raw.get('scholarship_available'), True),
-                    "financial_aid_available": self.safe_convert_to_bool(university_data_raw.get('financial_aid_available'), True),
-                    
-                    # Additional admission requirements
-                    "application_requirements": self.parse_list_field(university_data_raw.get('application_requirements'), ["Transcripts", "Letters of Recommendation", "Personal Statement"]),
-                    "admission_essay_required": self.safe_convert_to_bool(university_data_raw.get('admission_essay_required'), True),
-                    "letters_of_recommendation_required": self.safe_convert_to_int(university_data_raw.get('letters_of_recommendation_required'), random.randint(2, 3)),
-                    "interview_required": self.safe_convert_to_bool(university_data_raw.get('interview_required'), random.choice([True, False])),
-                    "work_experience_required": self.safe_convert_to_bool(university_data_raw.get('work_experience_required'), False),
-                    "portfolio_required": self.safe_convert_to_bool(university_data_raw.get('portfolio_required'), random.choice([True, False]))
-                }
-                
-                universities.append(university_data)
-                
-            except Exception as e:
-                logger.error(f"Error processing column {col_idx}: {e}")
-                continue
+                except Exception as e:
+                    RECORD_LOG.error("Error processing column %d: %s", col_idx, e)
+                    continue
+        
+        return universities
+    
+    def convert_excel_to_json(self, excel_file: str, output_file: str = 'universities_fixed.json') -> List[Dict]:
+        """Convert Excel file to JSON format suitable for API upload"""
+        universities = self.convert_excel(excel_file)
         
         # Save to JSON file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(universities, f, indent=2, ensure_ascii=False)
+        with profile_stage('write_json'):
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(universities, f, indent=2, ensure_ascii=False)
         
         logger.info(f"Converted {len(universities)} universities to JSON format")
         logger.info(f"Saved to: {output_file}")
@@ -220,20 +242,21 @@ class UniversityUploaderFixed:
         try:
             url = f"{self.api_base_url}/api/universities"
             
-            logger.info(f"Uploading: {university_data['name']}")
+            RECORD_LOG.info("Uploading: %s", university_data['name'])
             
-            response = self.session.post(url, json=university_data)
+            with profile_stage('network'):
+                response = self.session.post(url, json=university_data)
             
             if response.status_code == 201:
-                logger.info(f"✅ Successfully uploaded: {university_data['name']}")
+                RECORD_LOG.info("✅ Successfully uploaded: %s", university_data['name'])
                 return True
             else:
-                logger.error(f"❌ Failed to upload {university_data['name']}: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                RECORD_LOG.error("❌ Failed to upload %s: %s", university_data['name'], response.status_code)
+                RECORD_LOG.error("Response: %s", response.text)
                 return False
                 
         except Exception as e:
-            logger.error(f"❌ Error uploading {university_data['name']}: {e}")
+            RECORD_LOG.error("❌ Error uploading %s: %s", university_data['name'], e)
             return False
     
     def upload_all_universities(self, universities: List[Dict], delay: float = 1.0) -> Dict:
@@ -246,8 +269,9 @@ class UniversityUploaderFixed:
             'errors': []
         }
         
+        progress = track(len(universities), 'universities')
         for i, university in enumerate(universities, 1):
-            logger.info(f"Processing {i}/{len(universities)}: {university['name']}")
+            RECORD_LOG.info("Processing %d/%d: %s", i, len(universities), university['name'])
             
             success = self.upload_university(university)
             
@@ -256,11 +280,14 @@ class UniversityUploaderFixed:
             else:
                 results['failed'] += 1
                 results['errors'].append(university['name'])
+            progress.advance('successful' if success else 'failed')
             
             # Rate limiting - wait between requests
             if delay > 0:
-                time.sleep(delay)
+                with profile_stage('delay'):
+                    time.sleep(delay)
         
+        progress.finish()
         logger.info(f"Upload complete! Successful: {results['successful']}, Failed: {results['failed']}")
         
         if results['errors']:
@@ -270,6 +297,12 @@ class UniversityUploaderFixed:
 
 def main():
     """Main function to run the university uploader"""
+    parser = argparse.ArgumentParser(description="Convert the QS ranking workbook to JSON and upload it")
+    add_profile_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+    configure_logging(args)
     
     # Configuration
     EXCEL_FILE = "2026 QS Ranking 1000.xlsx"
@@ -285,7 +318,8 @@ def main():
     try:
         # Step 1: Convert Excel to JSON
         logger.info("Step 1: Converting Excel to JSON...")
-        universities = uploader.convert_excel_to_json(EXCEL_FILE, JSON_OUTPUT)
+        with profile_stage('convert'):
+            universities = uploader.convert_excel_to_json(EXCEL_FILE, JSON_OUTPUT)
         
         if not universities:
             logger.error("No universities found in Excel file!")
@@ -315,7 +349,8 @@ def main():
                 return
             
             # Upload universities
-            results = uploader.upload_all_universities(universities, delay=0.5)
+            with profile_stage('upload'):
+                results = uploader.upload_all_universities(universities, delay=0.5)
             
             # Summary
             logger.info("="*50)
@@ -338,6 +373,8 @@ def main():
     except Exception as e:
         logger.error(f"Fatal error: {e}")
         raise
+    finally:
+        profiler.finish()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
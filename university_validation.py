@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+University Payload Validation
+Python mirror of universityValidationRules in src/middlewares/validators.js.
+Errors use the same shape express-validator returns in a 400 response.
+"""
+
+import re
+from typing import Dict, List
+
+URL_PATTERN = re.compile(
+    r'^(?:https?://)?'  # optional protocol, like isURL()
+    r'(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+[A-Z]{2,63}\.?|'  # domain...
+    r'localhost|'  # localhost...
+    r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})'  # ...or ip
+    r'(?::\d+)?'  # optional port
+    r'(?:[/?#]\S*)?$', re.IGNORECASE)
+
+NUMERIC_PATTERN = re.compile(r'^[+-]?(?:\d+\.?\d*|\.\d+)$')
+
+BOOLEAN_VALUES = {'true', 'false', '0', '1'}
+
+STRING_FIELDS = [
+    ('sat_score_required', 'SAT score must be a string'),
+    ('act_score_required', 'ACT score must be a string'),
+    ('ielts_score_required', 'IELTS score must be a string'),
+    ('toefl_score_required', 'TOEFL score must be a string'),
+    ('gre_score_required', 'GRE score must be a string'),
+    ('gmat_score_required', 'GMAT score must be a string'),
+    ('application_deadline_fall', 'Fall application deadline must be a string'),
+    ('application_deadline_spring', 'Spring application deadline must be a string'),
+    ('application_deadline_summer', 'Summer application deadline must be a string'),
+]
+
+NUMERIC_FIELDS = [
+    ('ranking', 'Ranking must be a number'),
+    ('tuition_fee', 'Tuition fee must be a number'),
+    ('student_population', 'Student population must be a number'),
+    ('established_year', 'Established year must be a number'),
+    ('tuition_fee_graduate', 'Graduate tuition fee must be a number'),
+    ('letters_of_recommendation_required', 'Letters of recommendation required must be a number'),
+]
+
+BOOLEAN_FIELDS = [
+    ('scholarship_available', 'Scholarship availability must be a boolean'),
+    ('financial_aid_available', 'Financial aid availability must be a boolean'),
+    ('admission_essay_required', 'Admission essay requirement must be a boolean'),
+    ('interview_required', 'Interview requirement must be a boolean'),
+    ('work_experience_required', 'Work experience requirement must be a boolean'),
+    ('portfolio_required', 'Portfolio requirement must be a boolean'),
+]
+
+ARRAY_FIELDS = [
+    ('programs_offered', 'Programs offered must be an array'),
+    ('application_requirements', 'Application requirements must be an array'),
+]
+
+URL_FIELDS = [
+    ('website', 'Website must be a valid URL'),
+    ('image', 'Image must be a valid URL'),
+]
+
+def _as_string(value) -> str:
+    """Stringify a value the way express-validator does before checking it"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def is_numeric(value) -> bool:
+    """Equivalent of validator.isNumeric()"""
+    if isinstance(value, (list, dict)):
+        return False
+    return NUMERIC_PATTERN.match(_as_string(value)) is not None
+
+def is_float_between(value, minimum: float, maximum: float) -> bool:
+    """Equivalent of validator.isFloat({ min, max })"""
+    if not is_numeric(value):
+        return False
+    number = float(_as_string(value))
+    return minimum <= number <= maximum
+
+def is_url(value) -> bool:
+    """Approximation of validator.isURL() with its default options"""
+    if not isinstance(value, str):
+        return False
+    return URL_PATTERN.match(value.strip()) is not None
+
+def _error(field: str, value, msg: str) -> Dict:
+    return {'type': 'field', 'value': value, 'msg': msg, 'path': field, 'location': 'body'}
+
+def validate_university(data: Dict) -> List[Dict]:
+    """Validate a university payload and return express-validator style errors.
+
+    Optional fields are skipped only when absent, matching optional() in
+    express-validator 7, so an explicit null still fails its check.
+    """
+    errors = []
+
+    uid = data.get('uid')
+    if not isinstance(uid, str):
+        errors.append(_error('uid', uid, 'User ID must be a string'))
+    elif not uid:
+        errors.append(_error('uid', uid, 'User ID is required'))
+
+    name = data.get('name')
+    if not isinstance(name, str) or not name.strip():
+        errors.append(_error('name', name, 'University name is required'))
+    elif not 2 <= len(name.strip()) <= 200:
+        errors.append(_error('name', name, 'University name must be between 2 and 200 characters'))
+
+    description = data.get('description')
+    if 'description' in data and (not isinstance(description, str) or len(description.strip()) < 10):
+        errors.append(_error('description', description, 'Description must be at least 10 characters'))
+
+    country = data.get('country')
+    if not isinstance(country, str) or not country.strip():
+        errors.append(_error('country', country, 'Country is required'))
+
+    city = data.get('city')
+    if 'city' in data and not isinstance(city, str):
+        errors.append(_error('city', city, 'City must be a string'))
+
+    for field, msg in URL_FIELDS:
+        if field in data and not is_url(data[field]):
+            errors.append(_error(field, data[field], msg))
+
+    for field, msg in NUMERIC_FIELDS:
+        if field in data and not is_numeric(data[field]):
+            errors.append(_error(field, data[field], msg))
+
+    acceptance_rate = data.get('acceptance_rate')
+    if 'acceptance_rate' in data and not is_float_between(acceptance_rate, 0, 100):
+        errors.append(_error('acceptance_rate', acceptance_rate, 'Acceptance rate must be between 0 and 100'))
+
+    min_gpa = data.get('min_gpa_required')
+    if 'min_gpa_required' in data and not is_float_between(min_gpa, 0, 4.0):
+        errors.append(_error('min_gpa_required', min_gpa, 'Minimum GPA must be between 0 and 4.0'))
+
+    for field, msg in STRING_FIELDS:
+        if field in data and not isinstance(data[field], str):
+            errors.append(_error(field, data[field], msg))
+
+    for field, msg in BOOLEAN_FIELDS:
+        if field in data and _as_string(data[field]).lower() not in BOOLEAN_VALUES:
+            errors.append(_error(field, data[field], msg))
+
+    for field, msg in ARRAY_FIELDS:
+        if field in data and not isinstance(data[field], list):
+            errors.append(_error(field, data[field], msg))
+
+    return errors
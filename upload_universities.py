@@ -4,11 +4,15 @@ Simple University Uploader
 Uploads already converted university JSON data to EduSmart API
 """
 
+import argparse
 import json
 import requests
 import time
 import logging
 
+from fast_logging import RECORD_LOG, add_logging_arguments, configure_logging, track
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -18,27 +22,34 @@ def upload_university(api_base_url, university_data):
     try:
         url = f"{api_base_url}/api/universities"
         
-        logger.info(f"Uploading: {university_data['name']}")
+        RECORD_LOG.info("Uploading: %s", university_data['name'])
         
-        response = requests.post(url, json=university_data, headers={
-            'Content-Type': 'application/json',
-            'Accept': 'application/json'
-        })
+        with profile_stage('network'):
+            response = requests.post(url, json=university_data, headers={
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
+            })
         
         if response.status_code == 201:
-            logger.info(f"✅ Successfully uploaded: {university_data['name']}")
+            RECORD_LOG.info("✅ Successfully uploaded: %s", university_data['name'])
             return True
         else:
-            logger.error(f"❌ Failed to upload {university_data['name']}: {response.status_code}")
-            logger.error(f"Response: {response.text}")
+            RECORD_LOG.error("❌ Failed to upload %s: %s", university_data['name'], response.status_code)
+            RECORD_LOG.error("Response: %s", response.text)
             return False
             
     except Exception as e:
-        logger.error(f"❌ Error uploading {university_data['name']}: {e}")
+        RECORD_LOG.error("❌ Error uploading %s: %s", university_data['name'], e)
         return False
 
 def main():
     """Main function to upload universities"""
+    parser = argparse.ArgumentParser(description="Upload universities_fixed.json to the EduSmart API")
+    add_profile_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+    configure_logging(args)
     
     # Configuration
     JSON_FILE = "universities_fixed.json"
@@ -49,8 +60,9 @@ def main():
     
     # Load universities from JSON
     try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            universities = json.load(f)
+        with profile_stage('read_json'):
+            with open(JSON_FILE, 'r', encoding='utf-8') as f:
+                universities = json.load(f)
         logger.info(f"Loaded {len(universities)} universities from {JSON_FILE}")
     except FileNotFoundError:
         logger.error(f"File {JSON_FILE} not found! Please run the converter first.")
@@ -80,20 +92,26 @@ def main():
     
     logger.info(f"Starting upload of {len(universities)} universities...")
     
-    for i, university in enumerate(universities, 1):
-        logger.info(f"Processing {i}/{len(universities)}: {university['name']}")
-        
-        success = upload_university(API_BASE_URL, university)
-        
-        if success:
-            results['successful'] += 1
-        else:
-            results['failed'] += 1
-            results['errors'].append(university['name'])
-        
-        # Rate limiting - wait between requests
-        if DELAY_BETWEEN_UPLOADS > 0 and i < len(universities):
-            time.sleep(DELAY_BETWEEN_UPLOADS)
+    progress = track(len(universities), 'universities')
+    with profile_stage('upload'):
+        for i, university in enumerate(universities, 1):
+            RECORD_LOG.info("Processing %d/%d: %s", i, len(universities), university['name'])
+            
+            success = upload_university(API_BASE_URL, university)
+            
+            if success:
+                results['successful'] += 1
+            else:
+                results['failed'] += 1
+                results['errors'].append(university['name'])
+            progress.advance('successful' if success else 'failed')
+            
+            # Rate limiting - wait between requests
+            if DELAY_BETWEEN_UPLOADS > 0 and i < len(universities):
+                with profile_stage('delay'):
+                    time.sleep(DELAY_BETWEEN_UPLOADS)
+    
+    progress.finish()
     
     # Summary
     logger.info("="*50)
@@ -110,6 +128,8 @@ def main():
             logger.info(f"... and {len(results['errors'])-10} more")
     
     logger.info("Upload completed!")
+    
+    profiler.finish()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
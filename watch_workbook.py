@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Workbook Watcher
+Watches the QS ranking workbook and pushes edits to the API within seconds
+of a save. Changes are picked up with inotify (polling where it is not
+available) and debounced, so an editor saving in several writes triggers
+one sync. Each sync hashes every workbook cell, compares the hashes with the
+state file of the previous sync, and only the universities whose column
+changed are converted, fixed and validated: new ones are created, and for
+existing ones only the edited fields are written over the stored record.
+Columns are tracked by the workbook's id row and linked to their database
+record, so renaming a university or changing its country is an update.
+
+The first run records the current workbook as the baseline and creates the
+universities the database does not have yet.
+
+    ./watch_workbook.py                 # watch until interrupted
+    ./watch_workbook.py --once          # one sync, e.g. from cron
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import hashlib
+import json
+import logging
+import math
+import os
+import select
+import struct
+import sys
+import time
+from typing import Callable, Dict, Optional, Set
+
+from pipeline_profiler import add_profile_arguments, configure_profiler, profile_stage
+
+# Setup logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+EXCEL_FILE = "2026 QS Ranking 1000.xlsx"
+API_BASE_URL = "http://localhost:8000"
+STATE_FILE = ".watch_workbook_state.json"
+# Bumped when the state file layout changes; older state files start a new baseline
+STATE_VERSION = 2
+
+# Columns the API sets itself; everything else of a stored record is sent back on update
+SERVER_FIELDS = {'id', 'slug', 'status', 'featured', 'verified', 'created_by', 'created_at', 'updated_at'}
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+EVENT_HEADER = struct.Struct('iIII')
+
+class InotifyWatcher:
+    """Change events for one file through inotify on its directory.
+
+    The directory is watched rather than the file because editors usually
+    save by writing a temporary file and renaming it over the original.
+    """
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.name = os.fsencode(os.path.basename(path))
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = os.fsencode(os.path.dirname(os.path.abspath(path)))
+        if libc.inotify_add_watch(self.fd, directory, IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory.decode()}")
+
+    def wait(self, timeout: float) -> bool:
+        """True when the file changed within timeout seconds"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return False
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        changed = False
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b'\0')
+            offset += EVENT_HEADER.size + length
+            if name == self.name or mask & IN_Q_OVERFLOW:
+                changed = True
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Change detection by comparing the file's mtime and size"""
+
+    def __init__(self, path: str, interval: float = 1.0):
+        self.path = path
+        self.interval = interval
+        self.signature = self.stat()
+
+    def stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def wait(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            signature = self.stat()
+            if signature != self.signature:
+                self.signature = signature
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        pass
+
+def make_watcher(path: str, poll_interval: float = 1.0, polling: bool = False):
+    if not polling:
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError) as e:
+            # AttributeError: no inotify in this libc (macOS, Windows)
+            logger.warning(f"⚠️ inotify unavailable ({e}), polling every {poll_interval}s instead")
+    return PollingWatcher(path, poll_interval)
+
+def wait_for_edit(watcher, debounce: float, should_stop: Callable[[], bool]) -> bool:
+    """Block until the file changes and then stays quiet for debounce seconds"""
+    while not watcher.wait(1.0):
+        if should_stop():
+            return False
+    while watcher.wait(debounce):
+        pass
+    return not should_stop()
+
+def _cell_hash(value) -> str:
+    if isinstance(value, float) and math.isnan(value):
+        value = None
+    return hashlib.sha1(repr(value).encode('utf-8')).hexdigest()[:16]
+
+def _column_key(raw: Dict, identity: str) -> str:
+    # The id row numbers the columns; a column without one falls back to its identity key
+    workbook_id = raw.get('id')
+    if isinstance(workbook_id, float) and not math.isnan(workbook_id) and workbook_id.is_integer():
+        workbook_id = int(workbook_id)
+    if isinstance(workbook_id, int) or (isinstance(workbook_id, str) and workbook_id.strip()):
+        return f"id:{str(workbook_id).strip()}"
+    return f"name:{identity}"
+
+def read_columns(excel_file: str) -> Dict[str, Dict]:
+    """Raw values and cell hashes of every university column, keyed by workbook id"""
+    import pandas as pd
+    from dedup_universities import identity_key
+
+    with profile_stage('read_excel'):
+        df = pd.read_excel(excel_file)
+    field_names = df.iloc[:, 0].tolist()
+    columns = {}
+    with profile_stage('hash'):
+        for col_idx in range(1, len(df.columns)):
+            raw = dict(zip(field_names, df.iloc[:, col_idx].tolist()))
+            name = raw.get('name')
+            if not isinstance(name, str) or not name.strip():
+                continue
+            country = raw.get('country') if isinstance(raw.get('country'), str) else None
+            fields = {str(field): _cell_hash(value) for field, value in raw.items()}
+            identity = identity_key(name.strip(), country)
+            columns[_column_key(raw, identity)] = {
+                'col_idx': col_idx,
+                'raw': raw,
+                # Finds the database record of a column that is not linked to one yet
+                'identity': identity,
+                'fields': fields,
+                'hash': hashlib.sha1(json.dumps(fields, sort_keys=True).encode('utf-8')).hexdigest(),
+            }
+    return columns
+
+class WorkbookSync:
+    def __init__(self, excel_file: str = EXCEL_FILE, api_base_url: str = API_BASE_URL,
+                 state_file: str = STATE_FILE, admin_uid: Optional[str] = None):
+        from smart_upload import SmartUploader
+        from university_uploader_fixed import UniversityUploaderFixed
+
+        self.excel_file = excel_file
+        self.api_base_url = api_base_url
+        self.state_file = state_file
+        self.uploader = SmartUploader(api_base_url=api_base_url)
+        self.converter = (UniversityUploaderFixed(admin_uid=admin_uid) if admin_uid
+                          else UniversityUploaderFixed())
+        self.state = self.load_state()
+        self.ids: Dict[str, str] = {}
+
+    def load_state(self) -> Dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        if state.get('workbook') != os.path.abspath(self.excel_file):
+            logger.warning(f"⚠️ {self.state_file} belongs to {state.get('workbook')}, starting a new baseline")
+            return {}
+        if state.get('version') != STATE_VERSION:
+            logger.warning(f"⚠️ {self.state_file} has an older layout, starting a new baseline")
+            return {}
+        return state
+
+    def save_state(self, columns: Dict[str, Dict]):
+        state = {
+            'version': STATE_VERSION,
+            'workbook': os.path.abspath(self.excel_file),
+            'synced_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'columns': columns,
+        }
+        temp_file = f"{self.state_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_file, self.state_file)
+        self.state = state
+
+    def refresh_ids(self, page_size: int = 1000):
+        """Database ids of the stored universities, by identity key"""
+        from dedup_universities import identity_key
+
+        ids = {}
+        cursor = ''
+        while cursor is not None:
+            with profile_stage('fetch_existing'):
+                response = self.uploader.session.get(
+                    f"{self.api_base_url}/api/universities",
+                    params={'limit': page_size, 'fields': 'name,country', 'cursor': cursor, 'count': 'none'},
+                    timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            for uni in data['universities']:
+                ids[identity_key(uni['name'], uni.get('country'))] = uni['id']
+            cursor = data.get('pagination', {}).get('nextCursor')
+        self.ids = ids
+
+    def build_record(self, column: Dict) -> Optional[Dict]:
+        """Converted, fixed and validated record of one column, or None when invalid"""
+        from final_fix import fix_university_fields
+        from fix_images import fix_university_media
+        from university_validation import validate_university
+
+        with profile_stage('convert'):
+            record = self.converter.build_university_record(column['raw'], column['col_idx'])
+        if not record:
+            return None
+        with profile_stage('fix'):
+            fix_university_media(record)
+            fix_university_fields(record)
+        with profile_stage('validate'):
+            errors = validate_university(record)
+        if errors:
+            logger.warning(f"⚠️ Not pushing invalid {record['name']}: {', '.join(e['msg'] for e in errors)}")
+            return None
+        return record
+
+    def update(self, university_id: str, record: Dict, fields: Set[str]) -> bool:
+        """Write the changed fields over the stored record.
+
+        The update endpoint replaces every column, so the stored record is
+        sent back with only the edited fields taken from the workbook; fields
+        the converter fills with random defaults keep their stored values.
+        """
+        url = f"{self.api_base_url}/api/universities/{university_id}"
+        try:
+            with profile_stage('network'):
+                response = self.uploader.session.get(url, timeout=30)
+            if response.status_code != 200:
+                logger.error(f"❌ Could not fetch {record['name']} for update: {response.status_code}")
+                return False
+            stored = response.json()['university']
+            payload = {k: v for k, v in stored.items() if k not in SERVER_FIELDS}
+            payload.update({field: record[field] for field in fields})
+            payload['uid'] = record['uid']
+            with profile_stage('network'):
+                response = self.uploader.session.put(url, json=payload, timeout=30)
+        except Exception as e:
+            logger.error(f"❌ Error updating {record['name']}: {e}")
+            return False
+        if response.status_code != 200:
+            logger.error(f"❌ Failed to update {record['name']}: {response.status_code} {response.text}")
+            return False
+        logger.info(f"✏️ Updated {record['name']}: {', '.join(sorted(fields))}")
+        return True
+
+    def sync(self) -> Dict:
+        """Push the universities whose workbook column changed since the last sync"""
+        start = time.perf_counter()
+        columns = read_columns(self.excel_file)
+        previous = self.state.get('columns')
+        baseline = previous is None
+        previous = previous or {}
+        self.refresh_ids()
+
+        results = {'changed': 0, 'created': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0, 'failed': 0,
+                   'removed': sorted(previous.keys() - columns.keys())}
+        stored_ids = set(self.ids.values())
+        saved = {}
+        for key, column in columns.items():
+            if self.uploader.should_stop:
+                break
+            before = previous.get(key)
+            # The database record this column was pushed to, kept across renames
+            db_id = (before or {}).get('db_id')
+            if db_id not in stored_ids:
+                db_id = self.ids.get(column['identity'])
+            entry = {'hash': column['hash'], 'fields': column['fields'], 'db_id': db_id}
+            if before is not None and before['hash'] == column['hash']:
+                results['unchanged'] += 1
+                saved[key] = entry
+                continue
+            exists = db_id is not None
+            if baseline and exists:
+                # First run: the database copy is taken as up to date
+                saved[key] = entry
+                continue
+
+            results['changed'] += 1
+            record = self.build_record(column)
+            if record is None:
+                results['invalid'] += 1
+                # Not retried until the column is edited again; edits made while it
+                # was invalid stay in the diff against the last pushed version
+                saved[key] = dict(before, db_id=db_id) if before else entry
+            elif not exists:
+                if self.uploader.upload_university(record):
+                    results['created'] += 1
+                    created = self.uploader.last_created or {}
+                    # Without the created record (409), the next sync links the column by identity
+                    entry['db_id'] = created.get('id')
+                    saved[key] = entry
+                else:
+                    results['failed'] += 1
+            else:
+                if before is not None:
+                    edited = {f for f, h in column['fields'].items() if before['fields'].get(f) != h}
+                else:
+                    # A column for a university added by other means: only the filled-in cells
+                    edited = {f for f, value in column['raw'].items()
+                              if not (isinstance(value, float) and math.isnan(value))}
+                fields = (edited & record.keys()) - {'uid'}
+                if not fields or self.update(db_id, record, fields):
+                    results['updated'] += bool(fields)
+                    saved[key] = entry
+                else:
+                    results['failed'] += 1
+            if key not in saved and before is not None:
+                # Keep the old hashes so the next sync tries this university again
+                saved[key] = dict(before, db_id=db_id)
+
+        if not self.uploader.should_stop:
+            self.save_state(saved)
+        results['baseline'] = baseline
+        results['seconds'] = round(time.perf_counter() - start, 3)
+        return results
+
+def report(results: Dict, started: Optional[float] = None):
+    if results['baseline']:
+        logger.info(f"📌 Baseline recorded: {results['unchanged'] + results['changed']} universities, "
+                    f"{results['created']} created that were missing from the database")
+    else:
+        logger.info(f"📊 {results['changed']} changed: {results['created']} created, {results['updated']} updated, "
+                    f"{results['invalid']} invalid, {results['failed']} failed ({results['unchanged']} unchanged)")
+    if results['removed']:
+        logger.info(f"   {len(results['removed'])} universities no longer in the workbook were left in the database")
+    latency = f", {time.perf_counter() - started:.2f}s after the save" if started is not None else ""
+    logger.info(f"⏱️ Sync took {results['seconds']}s{latency}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Watch the QS ranking workbook and push edits to the API")
+    parser.add_argument('--excel', default=EXCEL_FILE)
+    parser.add_argument('--api-base-url', default=API_BASE_URL)
+    parser.add_argument('--state-file', default=STATE_FILE, help="cell hashes of the last sync")
+    parser.add_argument('--admin-uid', help="uid sent with created and updated records")
+    parser.add_argument('--debounce', type=float, default=2.0, help="seconds without writes before a sync")
+    parser.add_argument('--poll', action='store_true', help="poll instead of using inotify")
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--once', action='store_true', help="sync once and exit")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    profiler = configure_profiler(args)
+
+    sync = WorkbookSync(args.excel, api_base_url=args.api_base_url, state_file=args.state_file,
+                        admin_uid=args.admin_uid)
+    if not sync.uploader.test_api_connection():
+        return 1
+
+    try:
+        results = sync.sync()
+        report(results)
+        if args.once:
+            return 1 if results['failed'] else 0
+
+        watcher = make_watcher(args.excel, args.poll_interval, polling=args.poll)
+        logger.info(f"👀 Watching {args.excel} ({type(watcher).__name__}, {args.debounce}s debounce). Ctrl+C to stop.")
+        try:
+            while wait_for_edit(watcher, args.debounce, lambda: sync.uploader.should_stop):
+                saved_at = time.perf_counter() - args.debounce
+                try:
+                    results = sync.sync()
+                except Exception as e:
+                    # Usually a save still in progress; the next write triggers another sync
+                    logger.error(f"❌ Sync failed: {e}")
+                    continue
+                report(results, saved_at)
+        finally:
+            watcher.close()
+        return 0
+    finally:
+        profiler.finish()
+
+if __name__ == "__main__":
+    sys.exit(main())